@@ -1,32 +1,39 @@
-"""
-Main entry point for Plant Sample CRUD Application.
-
-Run this file to start the application.
-"""
-
-import tkinter as tk
-from tkinter import messagebox
-from database import DatabaseManager
-from ui import PlantSampleUI
-
-
-def main():
-    """
-    Initialize and run the application.
-    
-    Creates the main Tkinter window, initializes the database manager,
-    and starts the UI.
-    """
-    root = tk.Tk()
-    
-    try:
-        db_manager = DatabaseManager()
-        app = PlantSampleUI(root, db_manager)
-        root.mainloop()
-    except Exception as e:
-        messagebox.showerror("Database Error", f"Failed to start application:\n{str(e)}")
-        root.destroy()
-
-
-if __name__ == "__main__":
-    main()
+"""
+Main entry point for Plant Sample CRUD Application.
+
+Run this file to start the application.
+"""
+
+import tkinter as tk
+from tkinter import messagebox
+from config import METRICS_DUMP_PATH
+from database import DatabaseManager
+from ui import PlantSampleUI
+
+
+def main():
+    """
+    Initialize and run the application.
+    
+    Creates the main Tkinter window, initializes the database manager,
+    and starts the UI. The manager connects lazily, so the window paints
+    at once and the connection is opened by the first page load on a
+    worker thread.
+    """
+    root = tk.Tk()
+    
+    try:
+        db_manager = DatabaseManager(lazy=True)
+        app = PlantSampleUI(root, db_manager)
+        root.mainloop()
+        app.executor.shutdown()
+        db_manager.close()
+        if db_manager.instrumentation is not None and METRICS_DUMP_PATH:
+            db_manager.instrumentation.dump(METRICS_DUMP_PATH)
+    except Exception as e:
+        messagebox.showerror("Database Error", f"Failed to start application:\n{str(e)}")
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
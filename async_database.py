@@ -0,0 +1,443 @@
+"""
+Async database module for Plant Sample CRUD Application.
+
+Provides AsyncDatabaseManager, an asyncio counterpart of DatabaseManager
+backed by asyncpg and its connection pool. It exposes the same CRUD methods
+with the same (success, message, row) results, so one process can serve
+many concurrent lookups. It reuses the SQL built by the CRUD modules,
+converted to asyncpg's ``$n`` placeholders.
+"""
+
+import asyncpg
+from config import (DB_CONFIG, DB_POOL_KEYS, ID_SQL_TYPE, PAGE_SIZE, QUERY_CACHE_SIZE, QUERY_CACHE_TTL,
+                    TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID)
+from cache import LRUCache
+from prepared import to_positional
+from create import INSERT_SAMPLE
+from read import (SELECT_SAMPLE, SELECT_ALL_SAMPLES, SELECT_SAMPLE_DETAIL, FIRST_PAGE_SQL, PAGE_AFTER_SQL, PAGE_BEFORE_SQL,
+                  DETAIL_FIRST_PAGE_SQL, DETAIL_PAGE_AFTER_SQL)
+from update import UPDATE_SAMPLE
+from delete import DELETE_SAMPLE, DELETE_SAMPLES_SQL
+from sample_model import SampleColumns
+import json_codec
+
+ASYNC_FIRST_PAGE_SQL = to_positional(FIRST_PAGE_SQL)
+ASYNC_PAGE_AFTER_SQL = to_positional(PAGE_AFTER_SQL)
+ASYNC_PAGE_BEFORE_SQL = to_positional(PAGE_BEFORE_SQL)
+ASYNC_DETAIL_FIRST_PAGE_SQL = to_positional(DETAIL_FIRST_PAGE_SQL)
+ASYNC_DETAIL_PAGE_AFTER_SQL = to_positional(DETAIL_PAGE_AFTER_SQL)
+ASYNC_DELETE_SAMPLES_SQL = to_positional(DELETE_SAMPLES_SQL)
+
+UPDATE_SAMPLES_SQL = f'''
+    UPDATE "{TABLE_PLANT_SAMPLE}" AS s
+    SET "{COL_SAMPLE_ATTRIBUTES}" = v.sample_attr::jsonb, "{COL_RESEARCHER_ID}" = v.researcher_id, "{COL_LOCATION_ID}" = v.location_id
+    FROM unnest($1::{ID_SQL_TYPE}[], $2::{ID_SQL_TYPE}[], $3::{ID_SQL_TYPE}[], $4::text[])
+        AS v (sample_id, researcher_id, location_id, sample_attr)
+    WHERE s."{COL_SAMPLE_ID}" = v.sample_id
+    RETURNING s."{COL_SAMPLE_ID}", s."{COL_RESEARCHER_ID}", s."{COL_LOCATION_ID}", s."{COL_SAMPLE_ATTRIBUTES}"
+'''
+
+FIND_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ATTRIBUTES}" {{operator}} AND ($2::{ID_SQL_TYPE} IS NULL OR "{COL_SAMPLE_ID}" > $2)
+    ORDER BY "{COL_SAMPLE_ID}"
+    LIMIT $3
+'''
+
+FIND_BEFORE_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ATTRIBUTES}" {{operator}} AND "{COL_SAMPLE_ID}" < $2
+    ORDER BY "{COL_SAMPLE_ID}" DESC
+    LIMIT $3
+'''
+
+
+def _encode_json(value):
+    """Encode a JSON parameter, passing through strings that are already JSON."""
+    return value if isinstance(value, str) else json_codec.dumps(value)
+
+
+def _to_id(value):
+    """
+    Convert a UI-supplied ID to the Python type asyncpg expects.
+    
+    asyncpg does not coerce text to integer parameters the way psycopg2's
+    literal interpolation does, so IDs entered as strings are converted here.
+    """
+    if value in (None, ""):
+        return None
+    if ID_SQL_TYPE in ("integer", "bigint", "smallint"):
+        return int(value)
+    return value
+
+
+async def _init_connection(conn):
+    """Decode json/jsonb columns to Python objects, like psycopg2 does."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=_encode_json, decoder=json_codec.loads, schema="pg_catalog")
+
+
+class AsyncDatabaseManager:
+    """
+    Manages an asyncpg pool and runs CRUD operations as coroutines.
+    
+    Mirrors DatabaseManager's method surface and return values, including
+    the query_sample cache. Use as ``async with AsyncDatabaseManager() as db``
+    or call connect() and close() explicitly.
+    """
+    
+    def __init__(self, cache_size=QUERY_CACHE_SIZE, cache_ttl=QUERY_CACHE_TTL):
+        """
+        Initialize the manager without connecting.
+        
+        Args:
+            cache_size (int): query_sample cache capacity, 0 to disable caching
+            cache_ttl (float): query_sample cache entry lifetime in seconds, or None
+        """
+        self.pool = None
+        self.cache = LRUCache(cache_size, cache_ttl) if cache_size else None
+    
+    async def connect(self):
+        """
+        Create the connection pool, sized by DB_CONFIG['minconn'] and DB_CONFIG['maxconn'].
+        
+        Raises:
+            Exception: If database connection fails.
+        """
+        params = {key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS}
+        params['database'] = params.pop('dbname')
+        params['port'] = int(params['port'])
+        try:
+            self.pool = await asyncpg.create_pool(min_size=DB_CONFIG['minconn'], max_size=DB_CONFIG['maxconn'],
+                                                  init=_init_connection, **params)
+        except Exception as e:
+            raise Exception(f"Failed to connect to database:\n{str(e)}")
+    
+    async def __aenter__(self):
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+    
+    async def add_sample(self, sample_id, researcher_id, location_id, sample_attr):
+        """
+        Add a new plant sample to the database.
+        
+        Args:
+            sample_id (str): Unique identifier for the sample
+            researcher_id (str): ID of the researcher
+            location_id (str): ID of the sampling location
+            sample_attr (str): JSON string containing sample attributes
+            
+        Returns:
+            tuple: (success: bool, message: str, row: tuple or None)
+        """
+        try:
+            row = await self.pool.fetchrow(INSERT_SAMPLE.positional_sql, _to_id(sample_id), sample_attr,
+                                           _to_id(researcher_id), _to_id(location_id))
+            result = True, "Sample added successfully", tuple(row)
+        except asyncpg.UniqueViolationError:
+            result = False, "Sample ID already exists", None
+        except Exception as e:
+            result = False, str(e), None
+        self._refresh_cached(sample_id, result)
+        return result
+    
+    async def update_sample(self, sample_id, researcher_id, location_id, sample_attr):
+        """
+        Update an existing plant sample.
+        
+        Args:
+            sample_id (str): Unique identifier for the sample
+            researcher_id (str): ID of the researcher
+            location_id (str): ID of the sampling location
+            sample_attr (str): JSON string containing sample attributes
+            
+        Returns:
+            tuple: (success: bool, message: str, row: tuple or None)
+        """
+        try:
+            row = await self.pool.fetchrow(UPDATE_SAMPLE.positional_sql, sample_attr, _to_id(researcher_id),
+                                           _to_id(location_id), _to_id(sample_id))
+            if row is not None:
+                result = True, "Sample updated successfully", tuple(row)
+            else:
+                result = False, "Sample ID not found", None
+        except Exception as e:
+            result = False, str(e), None
+        self._refresh_cached(sample_id, result)
+        return result
+    
+    async def delete_sample(self, sample_id):
+        """
+        Delete a plant sample by its ID.
+        
+        Args:
+            sample_id (str): Unique identifier for the sample
+            
+        Returns:
+            tuple: (success: bool, message: str, row: tuple or None)
+        """
+        try:
+            row = await self.pool.fetchrow(DELETE_SAMPLE.positional_sql, _to_id(sample_id))
+            if row is not None:
+                result = True, "Sample deleted successfully", tuple(row)
+            else:
+                result = False, "Sample ID not found", None
+        except Exception as e:
+            result = False, str(e), None
+        self._invalidate_cached(sample_id)
+        return result
+    
+    async def update_samples(self, batch):
+        """
+        Update many plant samples in one statement.
+        
+        Args:
+            batch (list): Tuples of (sample_id, researcher_id, location_id, sample_attr)
+            
+        Returns:
+            list: One (success: bool, message: str, row: tuple or None) per batch entry
+        """
+        if not batch:
+            return []
+        
+        try:
+            columns = list(zip(*batch))
+            rows = await self.pool.fetch(UPDATE_SAMPLES_SQL,
+                                         [_to_id(value) for value in columns[0]],
+                                         [_to_id(value) for value in columns[1]],
+                                         [_to_id(value) for value in columns[2]],
+                                         [_encode_json(value) for value in columns[3]])
+        except Exception as e:
+            results = [(False, str(e), None)] * len(batch)
+        else:
+            updated = {str(row[0]): tuple(row) for row in rows}
+            results = []
+            for entry in batch:
+                row = updated.get(str(entry[0]))
+                if row is not None:
+                    results.append((True, "Sample updated successfully", row))
+                else:
+                    results.append((False, "Sample ID not found", None))
+        
+        for entry, result in zip(batch, results):
+            self._refresh_cached(entry[0], result)
+        return results
+    
+    async def delete_samples(self, sample_ids):
+        """
+        Delete many plant samples in one statement.
+        
+        Args:
+            sample_ids (list): Sample IDs to delete
+            
+        Returns:
+            list: One (success: bool, message: str, row: tuple or None) per sample ID
+        """
+        if not sample_ids:
+            return []
+        
+        try:
+            rows = await self.pool.fetch(ASYNC_DELETE_SAMPLES_SQL, [_to_id(value) for value in sample_ids])
+        except Exception as e:
+            results = [(False, str(e), None)] * len(sample_ids)
+        else:
+            deleted = {str(row[0]): tuple(row) for row in rows}
+            results = []
+            for sample_id in sample_ids:
+                row = deleted.pop(str(sample_id), None)
+                if row is not None:
+                    results.append((True, "Sample deleted successfully", row))
+                else:
+                    results.append((False, "Sample ID not found", None))
+        
+        for sample_id in sample_ids:
+            self._invalidate_cached(sample_id)
+        return results
+    
+    async def query_sample(self, sample_id):
+        """
+        Query a specific plant sample by ID.
+        
+        Args:
+            sample_id (str): Unique identifier for the sample
+            
+        Returns:
+            tuple: (sample_id, sample_attributes, researcher_id, location_id) or None
+            
+        Raises:
+            Exception: If database query fails
+        """
+        if self.cache is not None:
+            found, result = self.cache.get(str(sample_id))
+            if found:
+                return result
+            token = self.cache.write_token()
+        
+        try:
+            row = await self.pool.fetchrow(SELECT_SAMPLE.positional_sql, _to_id(sample_id))
+        except Exception as e:
+            raise Exception(f"Query failed: {str(e)}")
+        
+        result = tuple(row) if row is not None else None
+        if result is not None and self.cache is not None:
+            self.cache.put(str(sample_id), result, token)
+        return result
+    
+    async def query_sample_detail(self, sample_id):
+        """
+        Query a plant sample with its researcher, location and environmental conditions.
+        
+        Args:
+            sample_id (str): Unique identifier for the sample
+            
+        Returns:
+            dict: Nested sample document, or None if the sample does not exist
+            
+        Raises:
+            Exception: If database query fails
+        """
+        try:
+            return await self.pool.fetchval(SELECT_SAMPLE_DETAIL.positional_sql, _to_id(sample_id))
+        except Exception as e:
+            raise Exception(f"Query failed: {str(e)}")
+    
+    async def list_sample_details(self, after_id=None, limit=PAGE_SIZE):
+        """
+        Retrieve one page of nested sample documents ordered by Sample ID.
+        
+        Args:
+            after_id: Last Sample ID of the previous page, or None for the first page
+            limit (int): Maximum number of documents to return
+            
+        Returns:
+            list: Sample detail documents (dict)
+        """
+        if after_id is None:
+            rows = await self._fetch_rows(ASYNC_DETAIL_FIRST_PAGE_SQL, limit)
+        else:
+            rows = await self._fetch_rows(ASYNC_DETAIL_PAGE_AFTER_SQL, _to_id(after_id), limit)
+        return [row[0] for row in rows]
+    
+    async def get_all_samples(self):
+        """
+        Retrieve all plant samples from the database.
+        
+        Returns:
+            SampleColumns: Rows of (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        return SampleColumns(await self._fetch_rows(SELECT_ALL_SAMPLES.positional_sql))
+    
+    async def get_samples_page(self, after_id=None, limit=PAGE_SIZE):
+        """
+        Retrieve one page of plant samples ordered by Sample ID.
+        
+        Args:
+            after_id: Last Sample ID of the previous page, or None for the first page
+            limit (int): Maximum number of rows to return
+            
+        Returns:
+            list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        if after_id is None:
+            return await self._fetch_rows(ASYNC_FIRST_PAGE_SQL, limit)
+        return await self._fetch_rows(ASYNC_PAGE_AFTER_SQL, _to_id(after_id), limit)
+    
+    async def get_samples_page_before(self, before_id, limit=PAGE_SIZE):
+        """
+        Retrieve the page of plant samples immediately preceding a Sample ID.
+        
+        Args:
+            before_id: First Sample ID of the following page
+            limit (int): Maximum number of rows to return
+            
+        Returns:
+            list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        rows = await self._fetch_rows(ASYNC_PAGE_BEFORE_SQL, _to_id(before_id), limit)
+        rows.reverse()
+        return rows
+    
+    async def find_samples(self, attr_filter, after_id=None, limit=PAGE_SIZE):
+        """
+        Find one page of plant samples whose attributes match a filter.
+        
+        Args:
+            attr_filter (dict or str): Containment document (@>) or JSON path predicate (@@)
+            after_id: Last Sample ID of the previous page, or None for the first page
+            limit (int): Maximum number of rows to return
+            
+        Returns:
+            list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        sql = FIND_SQL.format(operator=self._filter_operator(attr_filter))
+        return await self._fetch_rows(sql, self._filter_value(attr_filter), _to_id(after_id), limit)
+    
+    async def find_samples_before(self, attr_filter, before_id, limit=PAGE_SIZE):
+        """
+        Find the page of matching plant samples immediately preceding a Sample ID.
+        
+        Args:
+            attr_filter (dict or str): Containment document (@>) or JSON path predicate (@@)
+            before_id: First Sample ID of the following page
+            limit (int): Maximum number of rows to return
+            
+        Returns:
+            list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        sql = FIND_BEFORE_SQL.format(operator=self._filter_operator(attr_filter))
+        rows = await self._fetch_rows(sql, self._filter_value(attr_filter), _to_id(before_id), limit)
+        rows.reverse()
+        return rows
+    
+    def cache_stats(self):
+        """
+        Return query cache counters.
+        
+        Returns:
+            dict: hits, misses, evictions, expirations, size and capacity, or None if caching is disabled
+        """
+        return self.cache.stats() if self.cache else None
+    
+    async def close(self):
+        """Close every pooled connection."""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+    
+    async def _fetch_rows(self, sql, *args):
+        """Run a listing query and return plain tuples."""
+        try:
+            return [tuple(row) for row in await self.pool.fetch(sql, *args)]
+        except Exception as e:
+            raise Exception(f"Failed to fetch samples:\n{str(e)}")
+    
+    @staticmethod
+    def _filter_operator(attr_filter):
+        """Return the JSONB operator and cast for an attribute filter."""
+        return "@> $1::jsonb" if isinstance(attr_filter, dict) else "@@ $1::jsonpath"
+    
+    @staticmethod
+    def _filter_value(attr_filter):
+        """Return the query parameter for an attribute filter."""
+        return json_codec.dumps(attr_filter) if isinstance(attr_filter, dict) else attr_filter
+    
+    def _refresh_cached(self, sample_id, result):
+        """Refresh the cached entry from a write's row, or drop it if the write failed."""
+        if self.cache is None:
+            return
+        
+        success, message, row = result
+        if success:
+            self.cache.put(str(row[0]), (row[0], row[3], row[1], row[2]))
+        else:
+            self.cache.invalidate(str(sample_id))
+    
+    def _invalidate_cached(self, sample_id):
+        """Drop one sample from the query cache, if caching is enabled."""
+        if self.cache is not None:
+            self.cache.invalidate(str(sample_id))
@@ -0,0 +1,11 @@
+"""
+Benchmarks for Plant Sample CRUD Application.
+
+Each module is runnable from the project root, e.g.:
+    python -m benchmarks.bench_import --rows 50000
+    
+Benchmarks write to the database configured in config.DB_CONFIG and remove
+the rows they create; point them at a throwaway database. The full suite
+(benchmarks.suite) starts its own throwaway server, loads a seeded data set
+with benchmarks.datagen and writes JSON results for benchmarks.compare.
+"""
@@ -0,0 +1,72 @@
+"""
+Concurrency benchmark: AsyncDatabaseManager vs. DatabaseManager.
+
+Fans out the same set of query_sample lookups with a fixed number in
+flight, once with asyncio on AsyncDatabaseManager and once with a thread
+pool on the pooled DatabaseManager, and reports lookups per second. The
+query caches are disabled so every lookup reaches PostgreSQL.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from database import DatabaseManager
+from async_database import AsyncDatabaseManager
+
+
+def bench_sync(sample_ids, concurrency):
+    """Run the lookups on worker threads; return lookups per second."""
+    db_manager = DatabaseManager(cache_size=0)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            started = time.perf_counter()
+            list(pool.map(db_manager.query_sample, sample_ids))
+            return len(sample_ids) / (time.perf_counter() - started)
+    finally:
+        db_manager.close()
+
+
+async def bench_async(sample_ids, concurrency):
+    """Run the lookups as coroutines; return lookups per second."""
+    async with AsyncDatabaseManager(cache_size=0) as db_manager:
+        slots = asyncio.Semaphore(concurrency)
+        
+        async def lookup(sample_id):
+            async with slots:
+                return await db_manager.query_sample(sample_id)
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(lookup(sample_id) for sample_id in sample_ids))
+        return len(sample_ids) / (time.perf_counter() - started)
+
+
+def main():
+    """Print lookups per second for both managers."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=200, help="Lookups in flight at once")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(pooled=False, cache_size=0)
+    known_ids = [row[0] for row in db_manager.get_samples_page(None, 10000)]
+    db_manager.close()
+    if not known_ids:
+        raise SystemExit("No samples found; load data first (see benchmarks.bench_import)")
+    
+    rng = random.Random(args.seed)
+    sample_ids = [rng.choice(known_ids) for _ in range(args.lookups)]
+    
+    sync_rate = bench_sync(sample_ids, args.concurrency)
+    async_rate = asyncio.run(bench_async(sample_ids, args.concurrency))
+    
+    print(f"{args.lookups} lookups, {args.concurrency} in flight")
+    print(f"DatabaseManager (threads):       {sync_rate:10.0f} lookups/s")
+    print(f"AsyncDatabaseManager (asyncio):  {async_rate:10.0f} lookups/s")
+    print(f"speedup:                         {async_rate / sync_rate:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
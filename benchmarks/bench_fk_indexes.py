@@ -0,0 +1,160 @@
+"""
+Foreign-key index benchmark: researcher deletes and per-researcher listings.
+
+Loads synthetic samples (10M by default) spread over a set of benchmark
+researchers and locations, then times deleting a researcher (which sets
+the Researcher ID of its samples to NULL) and listing one page of a
+researcher's samples. Both are measured with the indexes from
+migrations/002_foreign_key_indexes.py and again with them dropped inside
+a transaction that is rolled back. The indexes must exist under their
+config.py names; otherwise the drop fails rather than silently comparing
+two indexed runs. Deletes are rolled back too, so the
+loaded data is unchanged between runs; it is removed at the end unless
+--keep is given.
+
+Dropping the indexes takes an exclusive lock on the sample table: run this
+against a test database.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import psycopg2
+from config import (DB_CONFIG, DB_POOL_KEYS, PAGE_SIZE, TABLE_PLANT_SAMPLE, TABLE_RESEARCHER, TABLE_SAMPLING_LOCATION,
+                    COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, COL_RESEARCHER_NAME,
+                    COL_LOCATION_ATTRIBUTES, INDEX_SAMPLE_RESEARCHER, INDEX_SAMPLE_LOCATION)
+
+FK_INDEXES = (INDEX_SAMPLE_RESEARCHER, INDEX_SAMPLE_LOCATION)
+LOAD_CHUNK = 1000000
+
+LISTING_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_RESEARCHER_ID}" = %s
+    ORDER BY "{COL_SAMPLE_ID}"
+    LIMIT %s
+'''
+
+DELETE_RESEARCHER_SQL = f'DELETE FROM "{TABLE_RESEARCHER}" WHERE "{COL_RESEARCHER_ID}" = %s'
+
+
+def load(cursor, conn, rows, researchers, locations):
+    """
+    Insert benchmark researchers, locations and samples.
+    
+    Returns:
+        tuple: (researcher_ids, location_ids, first_sample_id)
+    """
+    cursor.execute(f'''
+        INSERT INTO "{TABLE_RESEARCHER}" ("{COL_RESEARCHER_NAME}")
+        SELECT 'bench-' || g FROM generate_series(1, %s) g
+        RETURNING "{COL_RESEARCHER_ID}"
+    ''', (researchers,))
+    researcher_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f'''
+        INSERT INTO "{TABLE_SAMPLING_LOCATION}" ("{COL_LOCATION_ATTRIBUTES}")
+        SELECT jsonb_build_object('bench', g) FROM generate_series(1, %s) g
+        RETURNING "{COL_LOCATION_ID}"
+    ''', (locations,))
+    location_ids = [row[0] for row in cursor.fetchall()]
+    cursor.execute(f'SELECT COALESCE(MAX("{COL_SAMPLE_ID}"), 0) + 1 FROM "{TABLE_PLANT_SAMPLE}"')
+    first_id = cursor.fetchone()[0]
+    conn.commit()
+    
+    for start in range(0, rows, LOAD_CHUNK):
+        count = min(LOAD_CHUNK, rows - start)
+        cursor.execute(f'''
+            INSERT INTO "{TABLE_PLANT_SAMPLE}"
+                ("{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}")
+            SELECT g, (%s::integer[])[1 + g %% %s], (%s::integer[])[1 + g %% %s],
+                   jsonb_build_object('height_cm', g %% 300)
+            FROM generate_series(%s, %s) g
+        ''', (researcher_ids, len(researcher_ids), location_ids, len(location_ids),
+              first_id + start, first_id + start + count - 1))
+        conn.commit()
+        print(f"\rloaded {start + count} samples", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    
+    cursor.execute(f'ANALYZE "{TABLE_PLANT_SAMPLE}"')
+    conn.commit()
+    return researcher_ids, location_ids, first_id
+
+
+def measure(cursor, researcher_ids, listings, deletes):
+    """
+    Time listings and rolled-back deletes inside the current transaction.
+    
+    Returns:
+        dict: {operation: (mean_ms, p95_ms)}
+    """
+    def summarize(samples):
+        p95 = statistics.quantiles(samples, n=20)[18] if len(samples) > 1 else samples[0]
+        return statistics.mean(samples), p95
+    
+    listing_ms = []
+    for researcher_id in random.sample(researcher_ids, min(listings, len(researcher_ids))):
+        started = time.perf_counter()
+        cursor.execute(LISTING_SQL, (researcher_id, PAGE_SIZE))
+        cursor.fetchall()
+        listing_ms.append((time.perf_counter() - started) * 1000)
+    
+    delete_ms = []
+    for researcher_id in random.sample(researcher_ids, min(deletes, len(researcher_ids))):
+        cursor.execute("SAVEPOINT bench_delete")
+        started = time.perf_counter()
+        cursor.execute(DELETE_RESEARCHER_SQL, (researcher_id,))
+        delete_ms.append((time.perf_counter() - started) * 1000)
+        cursor.execute("ROLLBACK TO SAVEPOINT bench_delete")
+    
+    return {"researcher listing": summarize(listing_ms), "researcher delete": summarize(delete_ms)}
+
+
+def cleanup(cursor, conn, researcher_ids, location_ids, first_id):
+    """Remove the benchmark samples, researchers and locations."""
+    conn.rollback()
+    cursor.execute(f'DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" >= %s', (first_id,))
+    cursor.execute(f'DELETE FROM "{TABLE_RESEARCHER}" WHERE "{COL_RESEARCHER_ID}" = ANY(%s)', (researcher_ids,))
+    cursor.execute(f'DELETE FROM "{TABLE_SAMPLING_LOCATION}" WHERE "{COL_LOCATION_ID}" = ANY(%s)', (location_ids,))
+    conn.commit()
+
+
+def main():
+    """Load data, measure with and without the foreign-key indexes and print both."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--researchers", type=int, default=1000)
+    parser.add_argument("--locations", type=int, default=100)
+    parser.add_argument("--listings", type=int, default=200)
+    parser.add_argument("--deletes", type=int, default=5, help="Unindexed deletes scan every sample; keep this small")
+    parser.add_argument("--keep", action="store_true", help="Leave the benchmark rows in place")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    cursor = conn.cursor()
+    researcher_ids, location_ids, first_id = load(cursor, conn, args.rows, args.researchers, args.locations)
+    try:
+        indexed = measure(cursor, researcher_ids, args.listings, args.deletes)
+        conn.rollback()
+        
+        for index_name in FK_INDEXES:
+            cursor.execute(f'DROP INDEX "{index_name}"')
+        unindexed = measure(cursor, researcher_ids, args.listings, args.deletes)
+        conn.rollback()
+    finally:
+        if not args.keep:
+            cleanup(cursor, conn, researcher_ids, location_ids, first_id)
+        conn.close()
+    
+    print(f"{args.rows} samples, {args.researchers} researchers")
+    print(f"{'operation':<20} {'indexed mean/p95 ms':>22} {'unindexed mean/p95 ms':>24}")
+    for operation in indexed:
+        with_index, without_index = indexed[operation], unindexed[operation]
+        print(f"{operation:<20} {with_index[0]:10.2f} /{with_index[1]:9.2f} {without_index[0]:12.2f} /{without_index[1]:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
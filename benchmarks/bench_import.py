@@ -0,0 +1,84 @@
+"""
+Bulk import benchmark: COPY pipeline vs. per-row add_sample.
+
+Generates a JSONL file of synthetic samples, loads part of it through
+DatabaseManager.add_sample (one INSERT and commit per row) and all of it
+through DatabaseManager.import_samples, and reports rows per second.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import psycopg2
+from config import DB_CONFIG, DB_POOL_KEYS, TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES
+from database import DatabaseManager
+
+
+def write_samples(path, start_id, rows, seed=0):
+    """Write ``rows`` synthetic samples as JSONL starting at ``start_id``."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as file:
+        for sample_id in range(start_id, start_id + rows):
+            record = {
+                COL_SAMPLE_ID: sample_id,
+                COL_SAMPLE_ATTRIBUTES: {
+                    "species": rng.choice(("Quercus robur", "Fagus sylvatica", "Pinus sylvestris")),
+                    "height_cm": round(rng.uniform(5, 3000), 1),
+                    "leaf_count": rng.randint(0, 5000),
+                },
+            }
+            file.write(json.dumps(record) + "\n")
+
+
+def delete_range(start_id, end_id):
+    """Remove benchmark rows in [start_id, end_id) over a connection of its own."""
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    try:
+        conn.cursor().execute(f'DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" >= %s AND "{COL_SAMPLE_ID}" < %s',
+                              (start_id, end_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def main():
+    """Run both load paths and print rows per second."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="Rows loaded with COPY")
+    parser.add_argument("--per-row", type=int, default=2000, help="Rows loaded with add_sample")
+    parser.add_argument("--start-id", type=int, default=1_000_000_000, help="First synthetic Sample ID")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(pooled=False)
+    end_id = args.start_id + args.rows + args.per_row
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        delete_range(args.start_id, end_id)
+        
+        per_row_start = args.start_id + args.rows
+        started = time.perf_counter()
+        for sample_id in range(per_row_start, per_row_start + args.per_row):
+            db_manager.add_sample(sample_id, None, None, '{"species": "Quercus robur", "height_cm": 120.5}')
+        per_row_rate = args.per_row / (time.perf_counter() - started)
+        
+        write_samples(path, args.start_id, args.rows)
+        started = time.perf_counter()
+        inserted, errors = db_manager.import_samples(path, "jsonl", args.chunk_size)
+        copy_rate = inserted / (time.perf_counter() - started)
+        
+        print(f"per-row add_sample: {per_row_rate:10.0f} rows/s ({args.per_row} rows)")
+        print(f"COPY import:        {copy_rate:10.0f} rows/s ({inserted} rows, {len(errors)} rejected)")
+        print(f"speedup:            {copy_rate / per_row_rate:10.1f}x")
+    finally:
+        delete_range(args.start_id, end_id)
+        db_manager.close()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
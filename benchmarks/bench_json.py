@@ -0,0 +1,116 @@
+"""
+JSON benchmark: table population time with large attribute documents.
+
+Builds rows whose attributes carry a large readings history, then times
+formatting every row for display the old way (full json.dumps) and with
+each available codec's truncated preview, plus decoding the documents as
+they arrive from the database. When Tk can start, it also times inserting
+the formatted rows into a Treeview. No database is needed.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import json_codec
+from config import TABLE_ATTR_DISPLAY_CHARS
+from table import SampleTable
+from benchmarks import datagen
+
+
+def large_attributes(rng, readings):
+    """Return sample attributes padded with ``readings`` measurement records."""
+    attributes = datagen.sample_attributes(rng)
+    attributes["readings"] = [
+        {"day": day, "height_cm": round(rng.uniform(5, 500), 1), "leaf_count": rng.randint(0, 400),
+         "notes": rng.choice(("dry", "wet", "shaded", "new growth", "pest damage"))}
+        for day in range(readings)
+    ]
+    return attributes
+
+
+def full_row(row):
+    """Format a row by serializing the whole document, as before the codec layer."""
+    display_row = list(row)
+    if display_row[3]:
+        display_row[3] = json.dumps(display_row[3])
+    return display_row
+
+
+def timed(func, rows):
+    """Return the time in milliseconds to apply func to every row."""
+    started = time.perf_counter()
+    for row in rows:
+        func(row)
+    return (time.perf_counter() - started) * 1000
+
+
+def codecs():
+    """Return the codecs available in this environment."""
+    available = [json_codec.STDLIB_CODEC]
+    try:
+        available.append(json_codec._select_codec("orjson"))
+    except Exception:
+        pass
+    return available
+
+
+def treeview_insert(rows, format_row):
+    """
+    Time inserting formatted rows into a Treeview.
+    
+    Returns:
+        float: Milliseconds, or None if Tk cannot start (no display)
+    """
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+    except Exception:
+        return None
+    root.withdraw()
+    try:
+        tree = ttk.Treeview(root, columns=("id", "researcher", "location", "attributes"), show="headings")
+        started = time.perf_counter()
+        for row in rows:
+            tree.insert('', tk.END, values=format_row(row))
+        root.update_idletasks()
+        return (time.perf_counter() - started) * 1000
+    finally:
+        root.destroy()
+
+
+def main():
+    """Print population timings for each codec."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per population")
+    parser.add_argument("--readings", type=int, default=500, help="Measurement records per attribute document")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    rows = [(index, 1, 1, large_attributes(rng, args.readings)) for index in range(args.rows)]
+    encoded = [json.dumps(row[3]) for row in rows]
+    print(f"{args.rows} rows, mean attribute document {statistics.mean(map(len, encoded)) / 1024:.1f} KiB, "
+          f"display limit {TABLE_ATTR_DISPLAY_CHARS} chars")
+    
+    print(f"{'codec':<8} {'decode ms':>10} {'full ms':>10} {'preview ms':>11} {'speedup':>8}")
+    for codec in codecs():
+        json_codec.set_codec(codec)
+        decode = min(timed(json_codec.loads, encoded) for _ in range(args.repeats))
+        full = min(timed(full_row, rows) for _ in range(args.repeats))
+        preview = min(timed(SampleTable._format_row, rows) for _ in range(args.repeats))
+        print(f"{codec.name:<8} {decode:10.1f} {full:10.1f} {preview:11.1f} {full / preview:7.1f}x")
+    
+    full = treeview_insert(rows, full_row)
+    if full is None:
+        print("skipped Treeview population: Tk could not start (run under xvfb-run)")
+        return
+    preview = treeview_insert(rows, SampleTable._format_row)
+    print(f"Treeview population: full {full:.1f} ms, preview {preview:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
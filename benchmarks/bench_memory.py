@@ -0,0 +1,111 @@
+"""
+Memory benchmark: bytes per loaded sample before and after SampleColumns.
+
+Builds synthetic rows (no database needed) and measures with tracemalloc
+what holding all of them costs: as the list of fetched tuples with
+decoded attribute dicts that get_all_samples used to return, plus the
+display row with a full json.dumps string per sample that refresh_table
+used to build from it; as the SampleColumns get_all_samples returns now,
+with the attributes kept as JSON text; and as the SampleModel that
+"Load All" builds from it, sort and search indexes included.
+
+Usage:
+    python -m benchmarks.bench_memory --rows 1000000
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from array import array
+import json_codec
+from sample_model import SampleColumns, SampleModel
+from benchmarks import datagen
+
+
+def measure(build, *args):
+    """Return (result, bytes still allocated by build, milliseconds)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        result = build(*args)
+        elapsed = (time.perf_counter() - started) * 1000
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size, elapsed
+
+
+def fetched(source):
+    """
+    Yield rows as the database driver delivers them.
+    
+    IDs are read from arrays, so each row gets its own int objects as it
+    would from a cursor; attributes are JSON text as stored.
+    """
+    sample_ids, researcher_ids, location_ids, texts = source
+    for sample_id, researcher_id, location_id, text in zip(sample_ids, researcher_ids, location_ids, texts):
+        yield sample_id, researcher_id or None, location_id or None, text
+
+
+def decoded_tuples(source):
+    """The old get_all_samples result: one tuple per row with its attributes decoded."""
+    return [(sample_id, researcher_id, location_id, json_codec.loads(text))
+            for sample_id, researcher_id, location_id, text in fetched(source)]
+
+
+def display_rows(source):
+    """The old get_all_samples result plus refresh_table's display rows."""
+    rows = decoded_tuples(source)
+    display = []
+    for row in rows:
+        display_row = list(row)
+        display_row[3] = json.dumps(display_row[3])
+        display.append(display_row)
+    return rows, display
+
+
+def loaded_model(columns):
+    """A SampleModel loaded from SampleColumns with its indexes built, as "Load All" does."""
+    model = SampleModel()
+    model.extend_columns(columns)
+    model.build_indexes()
+    return model
+
+
+def main():
+    """Print bytes per row for each representation."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    source = (array('q', range(1, args.rows + 1)),
+              array('q', (rng.choice((0, rng.randint(1, 500))) for _ in range(args.rows))),
+              array('q', (rng.randint(1, 2000) for _ in range(args.rows))),
+              [json.dumps(datagen.sample_attributes(rng), ensure_ascii=False) for _ in range(args.rows)])
+    text_bytes = sum(len(text.encode()) for text in source[3]) / args.rows
+    
+    results = []
+    for name, build, argument in (("tuples with decoded dicts (before)", decoded_tuples, source),
+                                  ("+ refresh_table display rows (before)", display_rows, source),
+                                  ("SampleColumns (after)", lambda source: SampleColumns(fetched(source)), source)):
+        result, size, elapsed = measure(build, argument)
+        results.append((name, size, elapsed))
+        del result
+    columns = SampleColumns(fetched(source))
+    _, size, elapsed = measure(loaded_model, columns)
+    results.append(("SampleModel from SampleColumns", size, elapsed))
+    
+    print(f"{args.rows} rows, attribute JSON {text_bytes:.0f} bytes per row")
+    print(f"{'held as':<40} {'bytes/row':>10} {'total MB':>10} {'build ms':>10}")
+    for name, size, elapsed in results:
+        print(f"{name:<40} {size / args.rows:10.0f} {size / 2 ** 20:10.1f} {elapsed:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Model benchmark: local sort and search over loaded samples.
+
+Fills a SampleModel with synthetic rows (no database needed) and times
+loading, building the sort indexes, re-sorting by every column, searching
+(selective words, broad prefixes cold and with their masks cached) and
+single-row changes, reading one table window from each view as the table
+does. The target is well under 100 ms per sort or search at 1m rows.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from sample_model import SampleModel
+from table import COLUMNS
+from config import TABLE_MAX_ROWS
+from benchmarks import datagen
+
+SEARCHES = ("quercus", "robur oak", "h", "he", "hea", "heal", "dormant riparian")
+
+
+def timed(func, *args):
+    """Return (result, milliseconds) for one call."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def show(model, column, descending=False, query=""):
+    """Compute a view and read its middle window, as the table does."""
+    view = model.view(column, descending, query)
+    middle = len(view) // 2
+    return len(view), [model.row(position) for position in view[middle:middle + TABLE_MAX_ROWS]]
+
+
+def main():
+    """Print model timings."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--changes", type=int, default=1000, help="Single-row upserts and removes to time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    rows = [(sample_id, rng.randint(1, 500), rng.randint(1, 2000), datagen.sample_attributes(rng))
+            for sample_id in range(1, args.rows + 1)]
+    
+    model, load = timed(SampleModel, rows)
+    _, build = timed(model.build_indexes)
+    print(f"{args.rows} rows: load {load:.0f} ms, build sort indexes {build:.0f} ms")
+    
+    print(f"{'sort':<20} {'asc ms':>8} {'desc ms':>8}")
+    for column, name in enumerate(COLUMNS):
+        _, ascending = timed(show, model, column)
+        _, descending = timed(show, model, column, True)
+        print(f"{name:<20} {ascending:8.1f} {descending:8.1f}")
+    
+    print(f"{'search':<20} {'matches':>8} {'ms':>8}")
+    for query in SEARCHES:
+        (matches, _), elapsed = timed(show, model, 1, False, query)
+        print(f"{query:<20} {matches:8} {elapsed:8.1f}")
+    
+    changes = []
+    for _ in range(args.changes):
+        sample_id = rng.randint(1, args.rows)
+        _, upsert = timed(model.upsert, (sample_id, rng.randint(1, 500), rng.randint(1, 2000), datagen.sample_attributes(rng)))
+        _, remove = timed(model.remove, rng.randint(1, args.rows))
+        changes.extend((upsert, remove))
+    _, rebuild = timed(show, model, 1, False, "heal")
+    print(f"single-row change median {statistics.median(changes):.2f} ms; "
+          f"first search after changes {rebuild:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
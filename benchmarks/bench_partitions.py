@@ -0,0 +1,136 @@
+"""
+Partition benchmark: hot-partition lookups before and after partitioning.
+
+Starts a throwaway PostgreSQL server (see benchmarks.throwaway), loads a
+seeded data set with benchmarks.datagen, and times lookups concentrated on
+the newest samples, as a workload where recent data is hot sees them:
+query_sample and query_sample_detail by Sample ID, and the last page of the
+table. Also times a VACUUM of the table, then converts it with
+partition.partition_table and repeats every measurement; the VACUUM then
+covers only the partition holding the newest samples. A scattered lookup
+over all samples is timed too for comparison. Finally the oldest partition
+is archived to a temporary directory to time the archive command.
+
+Usage:
+    python -m benchmarks.bench_partitions --rows 10000000 --partition-size 1000000
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import psycopg2
+from config import DB_CONFIG, DB_POOL_KEYS, PAGE_SIZE, TABLE_PLANT_SAMPLE, PARTITION_PREFIX
+from database import DatabaseManager
+from benchmarks import datagen
+from benchmarks.throwaway import throwaway_postgres
+
+
+def time_calls(func, argument_lists):
+    """Call func once per argument tuple; return (mean_ms, p95_ms)."""
+    durations = []
+    for args in argument_lists:
+        started = time.perf_counter()
+        func(*args)
+        durations.append((time.perf_counter() - started) * 1000)
+    p95 = statistics.quantiles(durations, n=20)[18] if len(durations) > 1 else durations[0]
+    return statistics.mean(durations), p95
+
+
+def vacuum(table):
+    """Return the milliseconds a VACUUM (ANALYZE) of one table takes."""
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    conn.autocommit = True
+    try:
+        started = time.perf_counter()
+        conn.cursor().execute(f'VACUUM (ANALYZE) "{table}"')
+        return (time.perf_counter() - started) * 1000
+    finally:
+        conn.close()
+
+
+def measure(db_manager, rng, rows, partition_size, lookups, vacuum_table):
+    """
+    Time the hot lookups, the scattered lookup and a VACUUM.
+    
+    Returns:
+        dict: {operation: (mean_ms, p95_ms)}
+    """
+    hot_first = max(1, rows - partition_size + 1)
+    hot_ids = [rng.randint(hot_first, rows) for _ in range(lookups)]
+    all_ids = [rng.randint(1, rows) for _ in range(lookups)]
+    
+    for sample_id in hot_ids[:100]:
+        db_manager.query_sample(sample_id)
+    vacuum_ms = vacuum(vacuum_table)
+    return {
+        "hot query_sample": time_calls(db_manager.query_sample, [(sample_id,) for sample_id in hot_ids]),
+        "hot query_sample_detail": time_calls(db_manager.query_sample_detail, [(sample_id,) for sample_id in hot_ids]),
+        "last page": time_calls(db_manager.get_samples_page_before, [(rows + 1, PAGE_SIZE)] * max(1, lookups // 10)),
+        "scattered query_sample": time_calls(db_manager.query_sample, [(sample_id,) for sample_id in all_ids]),
+        "vacuum": (vacuum_ms, vacuum_ms),
+    }
+
+
+def run(args):
+    """Load data, measure, partition, measure again and archive; print the results."""
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    try:
+        datagen.generate(conn.cursor(), conn, args.rows, args.seed,
+                         lambda table, rows: print(f"\rloading {table}: {rows} rows", end="", file=sys.stderr))
+    finally:
+        conn.close()
+    print(file=sys.stderr)
+    
+    db_manager = DatabaseManager(pooled=False, cache_size=0)
+    archive_dir = tempfile.mkdtemp(prefix="plant-archive-")
+    try:
+        before = measure(db_manager, random.Random(args.seed), args.rows, args.partition_size, args.lookups,
+                         TABLE_PLANT_SAMPLE)
+        
+        started = time.perf_counter()
+        created = db_manager.partition_table(args.partition_size, 1)
+        convert_ms = (time.perf_counter() - started) * 1000
+        hot_partition = f"{PARTITION_PREFIX}{args.rows // args.partition_size * args.partition_size}"
+        after = measure(db_manager, random.Random(args.seed), args.rows, args.partition_size, args.lookups,
+                        hot_partition)
+        
+        started = time.perf_counter()
+        archived = db_manager.archive_partitions(args.partition_size, archive_dir, drop=True)
+        archive_ms = (time.perf_counter() - started) * 1000
+    finally:
+        db_manager.close()
+        shutil.rmtree(archive_dir, ignore_errors=True)
+    
+    print(f"{args.rows} samples, {len(created)} partitions of {args.partition_size}")
+    print(f"{'operation':<26} {'single mean/p95 ms':>20} {'partitioned mean/p95 ms':>26}")
+    for operation in before:
+        plain, partitioned = before[operation], after[operation]
+        print(f"{operation:<26} {plain[0]:9.3f} /{plain[1]:9.3f} {partitioned[0]:14.3f} /{partitioned[1]:9.3f}")
+    print(f"conversion {convert_ms:.0f} ms; archiving {sum(rows for _, rows, _ in archived)} samples "
+          f"in {len(archived)} partition {archive_ms:.0f} ms")
+
+
+def main():
+    """Parse arguments and run the benchmark on a throwaway server unless told otherwise."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000000)
+    parser.add_argument("--partition-size", type=int, default=1000000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--use-configured-db", action="store_true",
+                        help="Use config.DB_CONFIG instead of a throwaway server; its tables are dropped and reloaded")
+    args = parser.parse_args()
+    
+    if args.use_configured_db:
+        run(args)
+    else:
+        with throwaway_postgres():
+            run(args)
+
+
+if __name__ == "__main__":
+    main()
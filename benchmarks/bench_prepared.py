@@ -0,0 +1,96 @@
+"""
+Prepared statement benchmark: per-operation latency with and without PREPARE.
+
+For each CRUD hot path, measures the first call on a fresh connection
+(single-call, including the PREPARE round trip) and the mean and p95 of a
+loop of calls, once on a plain psycopg2 connection and once on a
+PreparingConnection.
+"""
+
+import argparse
+import statistics
+import time
+import psycopg2
+from config import DB_CONFIG, DB_POOL_KEYS
+from prepared import PreparingConnection
+from create import add_sample
+from read import query_sample, get_all_samples
+from update import update_sample
+from delete import delete_sample
+
+ATTRIBUTES = '{"species": "Quercus robur", "height_cm": 120.5}'
+
+
+def connect(prepared):
+    """Open a plain or statement-preparing connection."""
+    params = {key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS}
+    if prepared:
+        params['connection_factory'] = PreparingConnection
+    return psycopg2.connect(**params)
+
+
+def timed(func, *args):
+    """Return the call duration in microseconds."""
+    started = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - started) * 1e6
+
+
+def measure(operation, undo, loops):
+    """
+    Time one first call and ``loops`` further calls of an operation.
+    
+    Returns:
+        tuple: (first_us, mean_us, p95_us)
+    """
+    samples = []
+    for _ in range(loops + 1):
+        samples.append(timed(operation))
+        if undo:
+            undo()
+    looped = samples[1:]
+    return samples[0], statistics.mean(looped), statistics.quantiles(looped, n=20)[18]
+
+
+def run(prepared, sample_id, loops):
+    """Measure every operation on a fresh connection; return {name: (first, mean, p95)}."""
+    conn = connect(prepared)
+    cursor = conn.cursor()
+    add = lambda: add_sample(cursor, conn, sample_id, None, None, ATTRIBUTES)
+    delete = lambda: delete_sample(cursor, conn, sample_id)
+    results = {}
+    try:
+        delete()
+        results["add_sample"] = measure(add, delete, loops)
+        add()
+        results["query_sample"] = measure(lambda: query_sample(cursor, conn, sample_id), None, loops)
+        results["update_sample"] = measure(
+            lambda: update_sample(cursor, conn, sample_id, None, None, ATTRIBUTES), None, loops)
+        results["delete_sample"] = measure(delete, add, loops)
+        results["get_all_samples"] = measure(lambda: get_all_samples(cursor, conn), None, min(loops, 20))
+    finally:
+        delete()
+        conn.close()
+    return results
+
+
+def main():
+    """Print a before/after latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--loops", type=int, default=2000, help="Calls per operation in the looped workload")
+    parser.add_argument("--sample-id", type=int, default=2_000_000_000, help="Scratch Sample ID")
+    args = parser.parse_args()
+    
+    plain = run(False, args.sample_id, args.loops)
+    prepared = run(True, args.sample_id, args.loops)
+    
+    print(f"{'operation':<16} {'mode':<9} {'first us':>10} {'mean us':>10} {'p95 us':>10}")
+    for name in plain:
+        for mode, results in (("plain", plain), ("prepared", prepared)):
+            first, mean, p95 = results[name]
+            print(f"{name:<16} {mode:<9} {first:10.1f} {mean:10.1f} {p95:10.1f}")
+        print(f"{'':<16} {'speedup':<9} {'':>10} {plain[name][1] / prepared[name][1]:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Load test for the HTTP service.
+
+Starts the service in-process on an ephemeral port (or targets --url) and
+drives GET /samples/<id> from client threads over keep-alive connections.
+Half of the requests send the ETag from an earlier response as
+If-None-Match, so both full and 304 responses are measured. Reports
+requests per second and latency percentiles; the target is several
+thousand requests per second on a local database.
+"""
+
+import argparse
+import http.client
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+from database import DatabaseManager
+from service import create_server
+
+
+def client(host, port, sample_ids, latencies, statuses):
+    """Issue one GET per sample ID on a single keep-alive connection."""
+    connection = http.client.HTTPConnection(host, port)
+    etags = {}
+    try:
+        for index, sample_id in enumerate(sample_ids):
+            headers = {"Accept-Encoding": "gzip"}
+            if index % 2 and sample_id in etags:
+                headers["If-None-Match"] = etags[sample_id]
+            started = time.perf_counter()
+            connection.request("GET", f"/samples/{sample_id}", headers=headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - started)
+            statuses.append(response.status)
+            if response.getheader("ETag"):
+                etags[sample_id] = response.getheader("ETag")
+    finally:
+        connection.close()
+
+
+def percentile(values, fraction):
+    """Return the value at ``fraction`` of the sorted list."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    """Run the load test and print throughput and latency."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive connections")
+    parser.add_argument("--url", help="Target a running service instead of starting one")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    db_manager = DatabaseManager(pooled=True)
+    known_ids = [row[0] for row in db_manager.get_samples_page(None, 10000)]
+    if not known_ids:
+        db_manager.close()
+        raise SystemExit("No samples found; load data first (see benchmarks.bench_import)")
+    
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        server = create_server("127.0.0.1", 0, db_manager=db_manager)
+        host, port = server.server_address
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    rng = random.Random(args.seed)
+    per_client = args.requests // args.clients
+    latencies = []
+    statuses = []
+    threads = [
+        threading.Thread(target=client, args=(host, port, [rng.choice(known_ids) for _ in range(per_client)], latencies, statuses))
+        for _ in range(args.clients)
+    ]
+    
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    db_manager.close()
+    
+    latencies.sort()
+    print(f"{len(latencies)} requests, {args.clients} clients, statuses {dict(sorted(Counter(statuses).items()))}")
+    print(f"throughput: {len(latencies) / elapsed:10.0f} requests/s")
+    print(f"latency p50: {percentile(latencies, 0.50) * 1000:8.2f} ms")
+    print(f"latency p95: {percentile(latencies, 0.95) * 1000:8.2f} ms")
+    print(f"latency p99: {percentile(latencies, 0.99) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Startup benchmark: time from launch to first paint and first data.
+
+Launches the GUI in a fresh interpreter (so no module is already imported)
+and records wall-clock milestones from process start: application modules
+imported, window created, first paint, database connection opened and the
+first page of samples shown. Also reports whether the database driver was
+already imported when the window painted. Each launch is repeated and the
+medians are printed. Needs a display (run under xvfb-run on a server) and
+the configured database for the last two milestones.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+MILESTONES = ("imports", "window", "paint", "connected", "first_data")
+
+
+def child(timeout):
+    """Start the application once and print its milestones as JSON."""
+    milestones = {}
+    
+    def mark(name):
+        milestones.setdefault(name, time.time())
+    
+    import app
+    from database import DatabaseManager
+    from table import SampleTable
+    mark("imports")
+    
+    connect = DatabaseManager.connect
+    show_first_page = SampleTable._show_first_page
+    
+    def timed_connect(self):
+        connect(self)
+        mark("connected")
+    
+    def timed_show_first_page(self, rows):
+        show_first_page(self, rows)
+        mark("first_data")
+    
+    DatabaseManager.connect = timed_connect
+    SampleTable._show_first_page = timed_show_first_page
+    
+    try:
+        root = app.tk.Tk()
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        return
+    mark("window")
+    
+    db_manager = DatabaseManager(lazy=True)
+    ui = app.PlantSampleUI(root, db_manager)
+    root.update()
+    mark("paint")
+    driver_loaded = "psycopg2" in sys.modules
+    
+    deadline = time.time() + timeout
+    while "first_data" not in milestones and time.time() < deadline:
+        root.update()
+        time.sleep(0.001)
+    
+    ui.executor.shutdown()
+    db_manager.close()
+    root.destroy()
+    print(json.dumps({"milestones": milestones, "driver_loaded_at_paint": driver_loaded}))
+
+
+def launch(timeout):
+    """
+    Run one child process.
+    
+    Returns:
+        dict: Milliseconds from launch per milestone reached, plus
+            driver_loaded_at_paint; or {"error": message}
+    """
+    started = time.time()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", "--timeout", str(timeout)],
+        capture_output=True, text=True, check=False,
+    )
+    lines = output.stdout.strip().splitlines()
+    if not lines:
+        return {"error": output.stderr.strip().splitlines()[-1] if output.stderr.strip() else "no output"}
+    result = json.loads(lines[-1])
+    if "error" in result:
+        return result
+    timings = {name: (stamp - started) * 1000 for name, stamp in result["milestones"].items()}
+    timings["driver_loaded_at_paint"] = result["driver_loaded_at_paint"]
+    return timings
+
+
+def main():
+    """Launch the application repeatedly and print median milestones."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the first page")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child(args.timeout)
+        return
+    
+    runs = []
+    for _ in range(args.repeats):
+        result = launch(args.timeout)
+        if "error" in result:
+            print(f"skipped: {result['error']} (Tk needs a display; run under xvfb-run)")
+            return
+        runs.append(result)
+    
+    print(f"{args.repeats} launches, median ms from process start")
+    for name in MILESTONES:
+        values = [run[name] for run in runs if name in run]
+        if values:
+            print(f"{name:<12} {statistics.median(values):10.1f}   ({len(values)}/{len(runs)} launches)")
+        else:
+            print(f"{name:<12} {'-':>10}   (not reached)")
+    loaded = sum(run["driver_loaded_at_paint"] for run in runs)
+    print(f"database driver imported before first paint: {loaded}/{len(runs)} launches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Statistics benchmark: dashboard figures computed in Python, in SQL and from materialized views.
+
+Starts a throwaway PostgreSQL server (see benchmarks.throwaway) and loads a
+seeded data set with benchmarks.datagen. Then computes the summary panel's
+figures three ways: by fetching every row with get_all_samples and
+counting in Python, as before stats.py existed; with
+DatabaseManager.sample_statistics grouping in SQL; and by reading the
+materialized statistics views. Creating and refreshing the views is timed
+too, since that is what the fast reads cost.
+
+Usage:
+    python -m benchmarks.bench_stats --rows 1000000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter, defaultdict
+import psycopg2
+from config import DB_CONFIG, DB_POOL_KEYS
+from database import DatabaseManager
+from benchmarks import datagen
+from benchmarks.throwaway import throwaway_postgres
+
+
+def timed(func, *args):
+    """Return (result, milliseconds) for one call."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def median_ms(func, *args, repeats=5):
+    """Return the median milliseconds of repeated calls."""
+    return statistics.median(timed(func, *args)[1] for _ in range(repeats))
+
+
+def client_side(db_manager):
+    """Compute the counts and attribute rollup from every row in Python."""
+    rows = list(db_manager.get_all_samples())
+    researchers = Counter(row[1] for row in rows if row[1] is not None)
+    locations = Counter(row[2] for row in rows if row[2] is not None)
+    values = defaultdict(set)
+    keys = Counter()
+    for row in rows:
+        if isinstance(row[3], dict):
+            for key, value in row[3].items():
+                keys[key] += 1
+                values[key].add(repr(value))
+    return researchers.most_common(20), locations.most_common(20), keys.most_common(20)
+
+
+def run(args):
+    """Load data and print the timings."""
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    try:
+        datagen.generate(conn.cursor(), conn, args.rows, args.seed,
+                         lambda table, rows: print(f"\rloading {table}: {rows} rows", end="", file=sys.stderr))
+    finally:
+        conn.close()
+    print(file=sys.stderr)
+    
+    db_manager = DatabaseManager(pooled=False, cache_size=0)
+    try:
+        _, python_ms = timed(client_side, db_manager)
+        live_ms = median_ms(db_manager.sample_statistics, 20, False, repeats=args.repeats)
+        _, create_ms = timed(db_manager.create_statistics_views)
+        _, refresh_ms = timed(db_manager.refresh_statistics_views)
+        view_ms = median_ms(db_manager.sample_statistics, 20, True, repeats=args.repeats)
+        values_ms = median_ms(db_manager.attribute_distribution, "species", repeats=args.repeats)
+    finally:
+        db_manager.close()
+    
+    print(f"{args.rows} samples")
+    print(f"{'dashboard from':<36} {'ms':>10}")
+    for name, elapsed in (("get_all_samples + Python counting", python_ms),
+                          ("SQL GROUP BY / jsonb_each (live)", live_ms),
+                          ("materialized views", view_ms),
+                          ("one key's value counts (live)", values_ms),
+                          ("create views", create_ms),
+                          ("refresh views (concurrently)", refresh_ms)):
+        print(f"{name:<36} {elapsed:10.1f}")
+
+
+def main():
+    """Parse arguments and run the benchmark on a throwaway server unless told otherwise."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--use-configured-db", action="store_true",
+                        help="Use config.DB_CONFIG instead of a throwaway server; its tables are dropped and reloaded")
+    args = parser.parse_args()
+    
+    if args.use_configured_db:
+        run(args)
+    else:
+        with throwaway_postgres():
+            run(args)
+
+
+if __name__ == "__main__":
+    main()
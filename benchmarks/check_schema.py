@@ -0,0 +1,268 @@
+"""
+Schema check: the migrations build what the application queries.
+
+Starts a throwaway PostgreSQL server (see benchmarks.throwaway), creates
+the tables under the config.py names as the original schema had them
+(JSON attributes, no indexes), loads a few thousand samples and applies
+migrations/ with migrate.apply_migrations. Then checks the result against
+the application's own queries: the attribute columns are JSONB and the
+GIN index serves read.find_samples, and the foreign-key indexes exist and
+back a per-researcher listing, and a sample added the way the GUI adds
+one reaches a change feed listener as an insert event, and a write queue
+batch sent twice (as after a commit the queue did not record) is applied
+once without conflicts of its own. Plans are taken with sequential scans
+disabled, so a check fails only if the index cannot serve the query at
+all. Exits with status 1 if any check fails.
+
+Usage:
+    python -m benchmarks.check_schema
+"""
+
+import argparse
+import queue
+import sys
+import time
+import psycopg2
+from config import (DB_CONFIG, DB_POOL_KEYS, PAGE_SIZE, TABLE_PLANT_SAMPLE, TABLE_RESEARCHER, TABLE_SAMPLING_LOCATION,
+                    TABLE_ENVIRONMENTAL_CONDITION, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID,
+                    COL_LOCATION_ID, COL_RESEARCHER_NAME, COL_LOCATION_ATTRIBUTES, COL_CONDITION_ATTRIBUTES,
+                    INDEX_SAMPLE_RESEARCHER, INDEX_SAMPLE_LOCATION, INDEX_SAMPLE_ATTRIBUTES, MIGRATIONS_TABLE)
+from migrate import apply_migrations
+from database import DatabaseManager
+from write_queue import QueuedWrite, apply_writes
+import read
+from benchmarks import datagen
+from benchmarks.throwaway import throwaway_postgres
+
+LISTING_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_RESEARCHER_ID}" = %s
+    ORDER BY "{COL_SAMPLE_ID}"
+    LIMIT %s
+'''
+
+
+def connect():
+    """Open a plain connection to the configured database."""
+    return psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+
+
+def load(cursor, conn, rows):
+    """
+    Recreate the tables as the original schema had them, without migration
+    records, then insert researchers, locations and samples.
+    """
+    datagen.create_schema(cursor, conn)
+    cursor.execute(f"DROP TABLE IF EXISTS {MIGRATIONS_TABLE}")
+    for table, column in ((TABLE_PLANT_SAMPLE, COL_SAMPLE_ATTRIBUTES),
+                          (TABLE_SAMPLING_LOCATION, COL_LOCATION_ATTRIBUTES),
+                          (TABLE_ENVIRONMENTAL_CONDITION, COL_CONDITION_ATTRIBUTES)):
+        cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN "{column}" TYPE JSON USING "{column}"::json')
+    cursor.execute(f'''
+        INSERT INTO "{TABLE_RESEARCHER}" ("{COL_RESEARCHER_NAME}") SELECT 'check-' || g FROM generate_series(1, 50) g;
+        INSERT INTO "{TABLE_SAMPLING_LOCATION}" ("{COL_LOCATION_ATTRIBUTES}")
+        SELECT json_build_object('name', 'site ' || g) FROM generate_series(1, 20) g;
+        INSERT INTO "{TABLE_PLANT_SAMPLE}" ("{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}")
+        SELECT g, 1 + g %% 50, 1 + g %% 20,
+               json_build_object('species', CASE WHEN g %% 100 = 0 THEN 'Quercus robur' ELSE 'Acer campestre' END,
+                                  'height_cm', g %% 300)
+        FROM generate_series(1, %s) g;
+    ''', (rows,))
+    conn.commit()
+
+
+def plan(cursor, sql, params=()):
+    """Return the EXPLAIN output of a query as one string."""
+    cursor.execute("EXPLAIN " + sql, params)
+    return "\n".join(row[0] for row in cursor.fetchall())
+
+
+class ExplainCursor:
+    """
+    Cursor wrapper that runs EXPLAIN on each query instead of the query.
+    
+    Lets the read functions be checked with the exact SQL they send;
+    fetchall returns the plan lines.
+    """
+    
+    def __init__(self, cursor):
+        self.cursor = cursor
+    
+    def execute(self, sql, params=None):
+        self.cursor.execute("EXPLAIN " + sql, params)
+    
+    def fetchall(self):
+        return [(row[0],) for row in self.cursor.fetchall()]
+
+
+def check_attribute_index(cursor, conn):
+    """The attribute columns are JSONB and read.find_samples' containment and path searches use the GIN index."""
+    cursor.execute("SELECT table_name, data_type FROM information_schema.columns WHERE column_name IN %s",
+                   ((COL_SAMPLE_ATTRIBUTES, COL_LOCATION_ATTRIBUTES, COL_CONDITION_ATTRIBUTES),))
+    not_jsonb = [table for table, data_type in cursor.fetchall() if data_type != "jsonb"]
+    # Only bitmap scans remain, so the Sample ID primary key cannot stand in
+    # for the attribute index by walking the table in order.
+    cursor.execute("SET LOCAL enable_indexscan = off")
+    explain = ExplainCursor(cursor)
+    results = [("attribute columns are JSONB", not not_jsonb, f"not JSONB: {not_jsonb}")]
+    for label, attr_filter in (("containment (@>)", {"species": "Quercus robur"}),
+                               ("JSON path (@@)", '$.species == "Quercus robur"')):
+        search = "\n".join(row[0] for row in read.find_samples(explain, conn, attr_filter))
+        results.append((f"find_samples {label} uses {INDEX_SAMPLE_ATTRIBUTES}",
+                        INDEX_SAMPLE_ATTRIBUTES in search, search))
+    return results
+
+
+def check_foreign_key_indexes(cursor, conn):
+    """The foreign-key indexes exist under their config names and serve a researcher's listing."""
+    cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", (TABLE_PLANT_SAMPLE,))
+    names = {row[0] for row in cursor.fetchall()}
+    missing = [name for name in (INDEX_SAMPLE_RESEARCHER, INDEX_SAMPLE_LOCATION) if name not in names]
+    listing = plan(cursor, LISTING_SQL, (1, PAGE_SIZE))
+    return [
+        ("foreign-key indexes exist", not missing, f"missing: {missing}"),
+        ("researcher listing uses its index", INDEX_SAMPLE_RESEARCHER in listing, listing),
+    ]
+
+
+def check_change_feed(cursor, conn, timeout=10):
+    """A sample added through DatabaseManager.add_sample, as the GUI does, arrives as a ChangeEvent."""
+    cursor.execute(f'SELECT coalesce(max("{COL_SAMPLE_ID}"), 0) + 1 FROM "{TABLE_PLANT_SAMPLE}"')
+    sample_id = cursor.fetchone()[0]
+    conn.rollback()
+    
+    events = queue.Queue()
+    db_manager = DatabaseManager(pooled=False, cache_size=0, write_queue=False)
+    try:
+        db_manager.listen(events.put)
+        deadline = time.monotonic() + timeout
+        while not db_manager.change_feed.connected and time.monotonic() < deadline:
+            time.sleep(0.05)
+        success, message, _ = db_manager.add_sample(str(sample_id), "1", "1", '{"species": "Quercus robur"}')
+        received = None
+        while success and received is None:
+            try:
+                event = events.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if event.sample_id == sample_id:
+                received = event
+        if success:
+            db_manager.delete_sample(str(sample_id))
+    finally:
+        db_manager.close()
+    return [
+        ("add_sample succeeds", success, message),
+        ("change feed delivers the insert", received is not None and received.operation == "insert",
+         f"received {received.operation if received else 'nothing'} within {timeout} s"),
+    ]
+
+
+def check_write_queue_replay(cursor, conn):
+    """
+    A write queue batch applies once, and its replay finds no conflicts of its own.
+    
+    The batch covers each replay rule of write_queue.apply_writes: an add
+    superseded by a later update, an add left as it was, and an update of
+    a row that a later write deletes. A genuine conflict (an add of an
+    existing Sample ID with other values) is reported both times. A second
+    batch holds a write with an unknown Researcher ID, so it is applied
+    through the savepoint fallback and only that write is rejected.
+    """
+    cursor.execute(f'SELECT coalesce(max("{COL_SAMPLE_ID}"), 0) + 1 FROM "{TABLE_PLANT_SAMPLE}"')
+    base = cursor.fetchone()[0]
+    cursor.execute(f'SELECT coalesce(max("{COL_RESEARCHER_ID}"), 0) + 1 FROM "{TABLE_RESEARCHER}"')
+    unknown_researcher = str(cursor.fetchone()[0])
+    conn.rollback()
+    
+    def write(seq, operation, offset, researcher_id="1", sample_attr=None):
+        return QueuedWrite(seq, operation, str(base + offset), researcher_id, "1", sample_attr, 0.0)
+    
+    apply_writes(cursor, conn, [write(1, "add", 2, sample_attr='{"v": 0}')])
+    conflict = QueuedWrite(7, "add", "1", "2", "2", '{"v": 1}', 0.0)
+    batch = [
+        write(2, "add", 0, sample_attr='{"v": 1}'),
+        write(3, "update", 0, sample_attr='{"v": 2}'),
+        write(4, "add", 1, sample_attr='{"v": 1}'),
+        write(5, "update", 2, sample_attr='{"v": 2}'),
+        write(6, "delete", 2),
+        conflict,
+    ]
+    expected = (len(batch) - 1, {conflict.seq: "Sample ID already exists"})
+    first = apply_writes(cursor, conn, batch)
+    replay = apply_writes(cursor, conn, batch)
+    
+    fallback = [
+        write(8, "add", 3, sample_attr='{"v": 1}'),
+        write(9, "add", 4, researcher_id=unknown_researcher, sample_attr='{"v": 1}'),
+        write(10, "update", 3, sample_attr='{"v": 2}'),
+    ]
+    applied, conflicts = apply_writes(cursor, conn, fallback)
+    
+    cursor.execute(f'''
+        SELECT "{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}" FROM "{TABLE_PLANT_SAMPLE}"
+        WHERE "{COL_SAMPLE_ID}" >= %s OR "{COL_SAMPLE_ID}" = 1
+    ''', (base,))
+    stored = {sample_id - base if sample_id >= base else "existing": attributes
+              for sample_id, attributes in cursor.fetchall()}
+    cursor.execute(f'DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" >= %s', (base,))
+    conn.commit()
+    
+    return [
+        ("queued batch applies with only the genuine conflict", first == expected, f"{first}, expected {expected}"),
+        ("replayed batch finds no conflicts of its own", replay == expected, f"{replay}, expected {expected}"),
+        ("replay leaves the batch's final state",
+         stored.get(0) == {"v": 2} and stored.get(1) == {"v": 1} and 2 not in stored
+         and stored.get("existing") != {"v": 1}, f"stored {stored}"),
+        ("savepoint fallback rejects only the failing write",
+         applied == 2 and list(conflicts) == [9] and stored.get(3) == {"v": 2} and 4 not in stored,
+         f"applied {applied}, conflicts {conflicts}"),
+    ]
+
+
+CHECKS = (check_attribute_index, check_foreign_key_indexes, check_change_feed, check_write_queue_replay)
+
+
+def run(args):
+    """Build the schema, apply the migrations and run every check; return the number of failures."""
+    conn = connect()
+    cursor = conn.cursor()
+    failures = 0
+    try:
+        load(cursor, conn, args.rows)
+        applied = apply_migrations(cursor, conn)
+        print(f"applied migrations {applied}")
+        cursor.execute(f'ANALYZE "{TABLE_PLANT_SAMPLE}"')
+        conn.commit()
+        for check in CHECKS:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            for name, passed, detail in check(cursor, conn):
+                print(f"{'ok  ' if passed else 'FAIL'} {name}")
+                if not passed:
+                    print(detail)
+                    failures += 1
+            conn.rollback()
+    finally:
+        conn.close()
+    return failures
+
+
+def main():
+    """Parse arguments and run the checks on a throwaway server unless told otherwise."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--use-configured-db", action="store_true",
+                        help="Use config.DB_CONFIG instead of a throwaway server; its tables are dropped and recreated")
+    args = parser.parse_args()
+    
+    if args.use_configured_db:
+        failures = run(args)
+    else:
+        with throwaway_postgres():
+            failures = run(args)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Write queue check: the rules apply_writes uses to recognize a replayed batch.
+
+Runs without a database. Checks write_queue.local_row, which builds the
+row a queued add should have left on the server, and
+write_queue._batch_outcome, which tells apply_writes how the rest of a
+batch leaves a Sample ID. The same rules are checked against PostgreSQL,
+including the savepoint fallback, by benchmarks.check_schema. Exits with
+status 1 if any check fails.
+
+Usage:
+    python -m benchmarks.check_write_queue
+"""
+
+import sys
+from config import ID_SQL_TYPE
+from write_queue import QueuedWrite, local_row, _batch_outcome
+
+
+def queued(seq, operation, sample_id, sample_attr=None):
+    """Build a QueuedWrite as the queue file stores it (IDs as text)."""
+    return QueuedWrite(seq, operation, sample_id, "1", "1", sample_attr, 0.0)
+
+
+def check_local_row():
+    """local_row converts IDs as the server stores them and rejects what the server would."""
+    integer_ids = ID_SQL_TYPE in ("integer", "bigint", "smallint")
+    cases = (
+        ("IDs stored as the server stores them", ("7", "2", "3", '{"species": "Acer"}'),
+         ((7, 2, 3, {"species": "Acer"}) if integer_ids else ("7", "2", "3", {"species": "Acer"}), None)),
+        ("blank researcher and location become NULL", ("7", "", None, None),
+         ((7 if integer_ids else "7", None, None, None), None)),
+        ("Sample ID 0 is kept", ("0", "1", "1", None),
+         ((0 if integer_ids else "0", 1 if integer_ids else "1", 1 if integer_ids else "1", None), None)),
+        ("missing Sample ID is rejected", ("", "1", "1", None), (None, "Sample ID is required")),
+        ("malformed attribute JSON is rejected", ("7", "1", "1", "{species"),
+         (None, "Invalid JSON format for Sample Attributes")),
+    )
+    if integer_ids:
+        cases += (("non-integer Researcher ID is rejected", ("7", "x", "1", None),
+                   (None, "Researcher ID must be an integer")),)
+    results = []
+    for name, args, expected in cases:
+        actual = local_row(*args)
+        results.append((name, actual == expected, f"local_row{args!r} returned {actual!r}, expected {expected!r}"))
+    return results
+
+
+def check_batch_outcome():
+    """_batch_outcome returns the last later write to the same Sample ID."""
+    add = queued(1, "add", "7", '{"v": 1}')
+    update = queued(2, "update", "7", '{"v": 2}')
+    other = queued(3, "update", "8", '{"v": 3}')
+    delete = queued(4, "delete", "7")
+    re_add = queued(5, "add", "7", '{"v": 5}')
+    last_update = queued(6, "update", "7", '{"v": 6}')
+    cases = (
+        ("no later write to the Sample ID", add, [other], None),
+        ("a later update is the outcome", add, [update, other], update),
+        ("a later delete is the outcome", update, [other, delete], "delete"),
+        ("an add after a delete is the outcome", add, [update, delete, re_add, other], re_add),
+        ("the last of several updates is the outcome", add, [update, last_update], last_update),
+    )
+    results = []
+    for name, write, later, expected in cases:
+        actual = _batch_outcome(write, later)
+        shown = f"seq {actual.seq}" if isinstance(actual, QueuedWrite) else repr(actual)
+        results.append((name, actual == expected, f"returned {shown}"))
+    return results
+
+
+CHECKS = (check_local_row, check_batch_outcome)
+
+
+def main():
+    """Run every check and exit with status 1 if any fails."""
+    failures = 0
+    for check in CHECKS:
+        for name, passed, detail in check():
+            print(f"{'ok  ' if passed else 'FAIL'} {name}")
+            if not passed:
+                print(detail)
+                failures += 1
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare two benchmark suite result files.
+
+Prints the change in p50 and p95 latency for every operation present in
+both files and exits with status 1 if any operation's p50 regressed by
+more than the threshold, so the comparison can gate a CI job.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path):
+    """Read a results document."""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def change(before, after):
+    """Return the relative change in percent, or None if the baseline is zero."""
+    return (after - before) / before * 100 if before else None
+
+
+def main(argv=None):
+    """
+    Print the comparison table.
+    
+    Returns:
+        int: Process exit code, 1 if a regression exceeds the threshold
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="p50 regression in percent that fails the run")
+    args = parser.parse_args(argv)
+    
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    for key in ("scale", "seed", "iterations"):
+        if baseline["meta"].get(key) != candidate["meta"].get(key):
+            print(f"warning: {key} differs ({baseline['meta'].get(key)} vs {candidate['meta'].get(key)})",
+                  file=sys.stderr)
+    
+    print(f"{'operation':<26} {'p50 ms (base/new)':>17} {'change':>8} {'p95 ms (base/new)':>17} {'change':>8}")
+    regressions = []
+    for name in sorted(set(baseline["results"]) & set(candidate["results"])):
+        before, after = baseline["results"][name], candidate["results"][name]
+        p50_change = change(before["p50_ms"], after["p50_ms"])
+        p95_change = change(before["p95_ms"], after["p95_ms"])
+        print(f"{name:<26} {before['p50_ms']:8.3f} {after['p50_ms']:8.3f} {_percent(p50_change):>8} "
+              f"{before['p95_ms']:8.3f} {after['p95_ms']:8.3f} {_percent(p95_change):>8}")
+        if p50_change is not None and p50_change > args.threshold:
+            regressions.append(name)
+    
+    for name in sorted(set(baseline["results"]) ^ set(candidate["results"])):
+        print(f"{name:<26} only in {'baseline' if name in baseline['results'] else 'candidate'}")
+    
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {args.threshold:g}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _percent(value):
+    """Format a relative change."""
+    return "n/a" if value is None else f"{value:+.1f}%"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Seeded synthetic data generator for the benchmark suite.
+
+Creates the schema under the table and column names in config.py and fills
+researchers, sampling locations, plant samples and environmental
+conditions with realistic JSON attribute payloads. The same scale and seed
+always produce the same rows, so results from different commits are
+comparable. Rows are streamed to the server with COPY in chunks, so memory
+use does not grow with the scale.
+
+Usage:
+    python -m benchmarks.datagen --scale 1m --seed 0
+"""
+
+import argparse
+import csv
+import datetime
+import io
+import json
+import random
+import sys
+import psycopg2
+from config import (DB_CONFIG, DB_POOL_KEYS, ID_SQL_TYPE, TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_RESEARCHER_ID,
+                    COL_LOCATION_ID, COL_SAMPLE_ATTRIBUTES, TABLE_RESEARCHER, COL_RESEARCHER_NAME,
+                    COL_RESEARCHER_EMAIL, COL_RESEARCHER_PHONE, COL_RESEARCHER_AFFILIATION, TABLE_SAMPLING_LOCATION,
+                    COL_LOCATION_ATTRIBUTES, TABLE_ENVIRONMENTAL_CONDITION, COL_CONDITION_ATTRIBUTES,
+                    INDEX_SAMPLE_RESEARCHER, INDEX_SAMPLE_LOCATION, INDEX_SAMPLE_ATTRIBUTES, INDEX_LOCATION_ATTRIBUTES,
+                    INDEX_CONDITION_ATTRIBUTES)
+
+SCALES = {"10k": 10000, "1m": 1000000, "10m": 10000000}
+COPY_CHUNK = 50000
+
+SPECIES = (
+    ("Quercus robur", "English oak"), ("Fagus sylvatica", "European beech"), ("Pinus sylvestris", "Scots pine"),
+    ("Betula pendula", "Silver birch"), ("Acer pseudoplatanus", "Sycamore"), ("Fraxinus excelsior", "Ash"),
+    ("Picea abies", "Norway spruce"), ("Sorbus aucuparia", "Rowan"), ("Alnus glutinosa", "Black alder"),
+    ("Ilex aquifolium", "Holly"), ("Taxus baccata", "Yew"), ("Corylus avellana", "Hazel"),
+    ("Crataegus monogyna", "Hawthorn"), ("Salix caprea", "Goat willow"), ("Tilia cordata", "Small-leaved lime"),
+    ("Digitalis purpurea", "Foxglove"), ("Urtica dioica", "Stinging nettle"), ("Pteridium aquilinum", "Bracken"),
+    ("Hedera helix", "Ivy"), ("Rubus fruticosus", "Bramble"),
+)
+HEALTH = ("healthy", "healthy", "healthy", "stressed", "diseased", "dormant")
+TAGS = ("canopy", "understory", "seedling", "mature", "flowering", "fruiting", "edge", "riparian", "grazed", "managed")
+HABITATS = ("woodland", "grassland", "heath", "wetland", "riverbank", "hedgerow", "upland")
+SOILS = ("loam", "clay", "sand", "peat", "chalk", "silt")
+FIRST_NAMES = ("Ada", "Ben", "Chen", "Dana", "Emeka", "Farah", "Goran", "Hana", "Ivan", "Jia", "Kofi", "Lena",
+               "Mateo", "Nia", "Oren", "Priya", "Quinn", "Rosa", "Sami", "Tomas")
+LAST_NAMES = ("Okafor", "Lindqvist", "Moreau", "Tanaka", "Novak", "Haddad", "Kowalski", "Silva", "Brennan",
+              "Ivanova", "Mensah", "Rossi", "Fischer", "Park", "Osei", "Larsen")
+AFFILIATIONS = ("Botany Institute", "Forest Research Station", "University of Uplands", "Wetland Trust",
+                "National Herbarium", "Soil and Plant Lab")
+
+EPOCH = datetime.date(2015, 1, 1)
+
+
+def scale_counts(samples):
+    """
+    Derive the number of researchers and locations from the number of samples.
+    
+    Returns:
+        dict: researchers, locations and samples
+    """
+    return {
+        "researchers": max(20, samples // 2000),
+        "locations": max(50, samples // 200),
+        "samples": samples,
+    }
+
+
+def create_schema(cursor, conn):
+    """
+    Drop and recreate the tables under the config.py names, with the same
+    columns and constraints as plants.sql. Indexes are added by
+    create_indexes once the data is loaded.
+    
+    Destroys any existing data in those tables; only run against a
+    throwaway database.
+    """
+    cursor.execute(f'''
+        DROP TABLE IF EXISTS "{TABLE_ENVIRONMENTAL_CONDITION}", "{TABLE_PLANT_SAMPLE}",
+                             "{TABLE_SAMPLING_LOCATION}", "{TABLE_RESEARCHER}" CASCADE;
+                             
+        CREATE TABLE "{TABLE_RESEARCHER}" (
+          "{COL_RESEARCHER_ID}" SERIAL PRIMARY KEY,
+          "{COL_RESEARCHER_NAME}" VARCHAR(50),
+          "{COL_RESEARCHER_EMAIL}" VARCHAR(50),
+          "{COL_RESEARCHER_PHONE}" VARCHAR(50),
+          "{COL_RESEARCHER_AFFILIATION}" VARCHAR(50)
+        );
+        
+        CREATE TABLE "{TABLE_SAMPLING_LOCATION}" (
+          "{COL_LOCATION_ID}" SERIAL PRIMARY KEY,
+          "{COL_LOCATION_ATTRIBUTES}" JSONB
+        );
+        
+        CREATE TABLE "{TABLE_PLANT_SAMPLE}" (
+          "{COL_SAMPLE_ID}" {ID_SQL_TYPE} PRIMARY KEY,
+          "{COL_SAMPLE_ATTRIBUTES}" JSONB,
+          "{COL_RESEARCHER_ID}" INTEGER REFERENCES "{TABLE_RESEARCHER}"("{COL_RESEARCHER_ID}") ON DELETE SET NULL,
+          "{COL_LOCATION_ID}" INTEGER REFERENCES "{TABLE_SAMPLING_LOCATION}"("{COL_LOCATION_ID}") ON DELETE SET NULL
+        );
+        
+        CREATE TABLE "{TABLE_ENVIRONMENTAL_CONDITION}" (
+          "{COL_SAMPLE_ID}" {ID_SQL_TYPE} PRIMARY KEY
+            REFERENCES "{TABLE_PLANT_SAMPLE}"("{COL_SAMPLE_ID}") ON DELETE CASCADE,
+          "{COL_CONDITION_ATTRIBUTES}" JSONB
+        );
+    ''')
+    conn.commit()
+
+
+def create_indexes(cursor, conn):
+    """
+    Build the secondary indexes after loading, which is faster than maintaining them row by row.
+    
+    They carry the config.py index names, as created by plants.sql and the
+    migrations, so later migrations and benchmarks find them.
+    """
+    cursor.execute(f'''
+        CREATE INDEX "{INDEX_SAMPLE_RESEARCHER}" ON "{TABLE_PLANT_SAMPLE}" ("{COL_RESEARCHER_ID}", "{COL_SAMPLE_ID}");
+        CREATE INDEX "{INDEX_SAMPLE_LOCATION}" ON "{TABLE_PLANT_SAMPLE}" ("{COL_LOCATION_ID}", "{COL_SAMPLE_ID}");
+        CREATE INDEX "{INDEX_SAMPLE_ATTRIBUTES}" ON "{TABLE_PLANT_SAMPLE}" USING GIN ("{COL_SAMPLE_ATTRIBUTES}" jsonb_path_ops);
+        CREATE INDEX "{INDEX_LOCATION_ATTRIBUTES}" ON "{TABLE_SAMPLING_LOCATION}" USING GIN ("{COL_LOCATION_ATTRIBUTES}" jsonb_path_ops);
+        CREATE INDEX "{INDEX_CONDITION_ATTRIBUTES}" ON "{TABLE_ENVIRONMENTAL_CONDITION}" USING GIN ("{COL_CONDITION_ATTRIBUTES}" jsonb_path_ops);
+    ''')
+    conn.commit()
+    cursor.execute("ANALYZE")
+    conn.commit()
+
+
+def researcher_row(rng, researcher_id):
+    """Return one researcher row."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return (researcher_id, f"{first} {last}", f"{first}.{last}{researcher_id}@example.org".lower(),
+            f"+44 {rng.randint(1000, 9999)} {rng.randint(100000, 999999)}", rng.choice(AFFILIATIONS))
+
+
+def location_attributes(rng, location_id):
+    """Return one sampling location's attribute document."""
+    return {
+        "name": f"Plot {location_id}",
+        "latitude": round(rng.uniform(49.9, 58.6), 5),
+        "longitude": round(rng.uniform(-7.5, 1.7), 5),
+        "elevation_m": rng.randint(0, 1300),
+        "habitat": rng.choice(HABITATS),
+        "soil": {"type": rng.choice(SOILS), "ph": round(rng.uniform(4.0, 8.5), 1)},
+    }
+
+
+def sample_attributes(rng):
+    """Return one plant sample's attribute document."""
+    species, common_name = rng.choice(SPECIES)
+    attributes = {
+        "species": species,
+        "common_name": common_name,
+        "collected_on": (EPOCH + datetime.timedelta(days=rng.randint(0, 3650))).isoformat(),
+        "height_cm": round(rng.lognormvariate(4.0, 1.2), 1),
+        "leaf_count": rng.randint(0, 5000),
+        "health": rng.choice(HEALTH),
+        "tags": rng.sample(TAGS, rng.randint(1, 4)),
+        "measurements": {
+            "stem_diameter_mm": round(rng.uniform(1, 900), 1),
+            "chlorophyll_spad": round(rng.gauss(40, 8), 1),
+        },
+    }
+    if rng.random() < 0.3:
+        attributes["notes"] = f"{rng.choice(HEALTH)} specimen near {rng.choice(HABITATS)} edge, photographed"
+    return attributes
+
+
+def condition_attributes(rng):
+    """Return one environmental condition document."""
+    return {
+        "temperature_c": round(rng.gauss(12, 7), 1),
+        "humidity_pct": rng.randint(25, 100),
+        "rainfall_mm": round(rng.expovariate(0.4), 1),
+        "light_lux": rng.randint(500, 100000),
+        "wind_kph": round(rng.expovariate(0.08), 1),
+        "recorded_at": f"{rng.randint(6, 19):02d}:{rng.randint(0, 59):02d}",
+    }
+
+
+def generate(cursor, conn, samples, seed=0, progress=None):
+    """
+    Recreate the schema and load a deterministic data set.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        samples (int): Number of plant samples; other tables are sized from it
+        seed (int): Random seed
+        progress: Optional callable receiving (table, rows_loaded)
+        
+    Returns:
+        dict: Rows loaded per table; about 80% of samples get an environmental condition
+    """
+    counts = scale_counts(samples)
+    rng = random.Random(seed)
+    create_schema(cursor, conn)
+    
+    _copy(cursor, conn, TABLE_RESEARCHER,
+          (COL_RESEARCHER_ID, COL_RESEARCHER_NAME, COL_RESEARCHER_EMAIL, COL_RESEARCHER_PHONE, COL_RESEARCHER_AFFILIATION),
+          (researcher_row(rng, researcher_id) for researcher_id in range(1, counts["researchers"] + 1)), progress)
+    _copy(cursor, conn, TABLE_SAMPLING_LOCATION, (COL_LOCATION_ID, COL_LOCATION_ATTRIBUTES),
+          ((location_id, json.dumps(location_attributes(rng, location_id)))
+           for location_id in range(1, counts["locations"] + 1)), progress)
+    _copy(cursor, conn, TABLE_PLANT_SAMPLE, (COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID),
+          ((sample_id, json.dumps(sample_attributes(rng)), rng.randint(1, counts["researchers"]),
+            rng.randint(1, counts["locations"]))
+           for sample_id in range(1, samples + 1)), progress)
+    
+    condition_rng = random.Random(seed + 1)
+    counts["conditions"] = _copy(cursor, conn, TABLE_ENVIRONMENTAL_CONDITION, (COL_SAMPLE_ID, COL_CONDITION_ATTRIBUTES),
+                                 ((sample_id, json.dumps(condition_attributes(condition_rng)))
+                                  for sample_id in range(1, samples + 1) if condition_rng.random() < 0.8), progress)
+    
+    for table, column in ((TABLE_RESEARCHER, COL_RESEARCHER_ID), (TABLE_SAMPLING_LOCATION, COL_LOCATION_ID)):
+        cursor.execute(f'SELECT setval(pg_get_serial_sequence(%s, %s), (SELECT MAX("{column}") FROM "{table}"))',
+                       (f'"{table}"', column))
+    conn.commit()
+    
+    create_indexes(cursor, conn)
+    return counts
+
+
+def _copy(cursor, conn, table, columns, rows, progress):
+    """Stream rows into a table with COPY, one chunk at a time; return the row count."""
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    sql = f'COPY "{table}" ({column_list}) FROM STDIN WITH (FORMAT csv)'
+    loaded = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        loaded += 1
+        if loaded % COPY_CHUNK == 0:
+            _flush(cursor, sql, buffer)
+            if progress:
+                progress(table, loaded)
+    _flush(cursor, sql, buffer)
+    conn.commit()
+    if progress:
+        progress(table, loaded)
+    return loaded
+
+
+def _flush(cursor, sql, buffer):
+    """Send the buffered CSV rows and reset the buffer."""
+    buffer.seek(0)
+    cursor.copy_expert(sql, buffer)
+    buffer.seek(0)
+    buffer.truncate()
+
+
+def main():
+    """Recreate the schema in the configured database and load one scale."""
+    parser = argparse.ArgumentParser(description="Load a seeded synthetic data set. Drops existing tables.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    try:
+        counts = generate(conn.cursor(), conn, SCALES[args.scale], args.seed,
+                          lambda table, rows: print(f"\r{table}: {rows} rows", end="", file=sys.stderr))
+    finally:
+        conn.close()
+    print(file=sys.stderr)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
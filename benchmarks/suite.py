@@ -0,0 +1,315 @@
+"""
+Benchmark suite: every DatabaseManager operation, JSON handling and table population.
+
+Starts a throwaway PostgreSQL server (see benchmarks.throwaway), loads a
+seeded synthetic data set at the chosen scale (see benchmarks.datagen),
+times each operation with seeded arguments, and writes the results as
+JSON. Two result files from different commits are compared with
+benchmarks.compare.
+
+The table population benchmark drives SampleTable with real Tk widgets,
+so it needs a display; run under ``xvfb-run`` on headless machines. It is
+skipped when Tk cannot start.
+
+Usage:
+    python -m benchmarks.suite --scale 1m --output results.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import psycopg2
+import json_codec
+from config import DB_CONFIG, DB_POOL_KEYS, PAGE_SIZE, BATCH_PAGE_SIZE
+from database import DatabaseManager
+from benchmarks import datagen
+from benchmarks.bench_import import write_samples, delete_range
+from benchmarks.throwaway import throwaway_postgres
+
+RESULTS_VERSION = 1
+
+
+class InlineExecutor:
+    """UIExecutor stand-in that runs each task immediately on the calling thread."""
+    
+    def submit(self, func, *args, on_done=None, on_error=None, key=None):
+        """Run func and deliver its result or error before returning."""
+        try:
+            result = func(*args)
+        except Exception as e:
+            if on_error:
+                on_error(e)
+            return
+        if on_done:
+            on_done(result)
+
+
+def summarize(durations):
+    """
+    Summarize call durations in seconds.
+    
+    Returns:
+        dict: count, total_s, ops_per_s and mean/min/p50/p95/p99 in milliseconds
+    """
+    ordered = sorted(durations)
+    
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+    
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "total_s": total,
+        "ops_per_s": len(ordered) / total if total else 0.0,
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def time_calls(func, argument_lists):
+    """Call func once per argument tuple; return the durations in seconds."""
+    durations = []
+    for args in argument_lists:
+        started = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def bench_reads(db_manager, cached_manager, rng, samples, iterations):
+    """Time the read operations against existing samples."""
+    ids = [rng.randint(1, samples) for _ in range(iterations)]
+    species = [species for species, common_name in datagen.SPECIES]
+    results = {
+        "query_sample": time_calls(db_manager.query_sample, [(sample_id,) for sample_id in ids]),
+        "query_sample_detail": time_calls(db_manager.query_sample_detail, [(sample_id,) for sample_id in ids]),
+        "get_samples_page": time_calls(db_manager.get_samples_page, [(sample_id, PAGE_SIZE) for sample_id in ids]),
+        "get_samples_page_before": time_calls(db_manager.get_samples_page_before,
+                                              [(sample_id, PAGE_SIZE) for sample_id in ids]),
+        "list_sample_details": time_calls(db_manager.list_sample_details,
+                                          [(sample_id, PAGE_SIZE) for sample_id in ids[:max(1, iterations // 10)]]),
+        "find_samples_containment": time_calls(db_manager.find_samples,
+                                               [({"species": rng.choice(species)}, sample_id, PAGE_SIZE)
+                                                for sample_id in ids[:max(1, iterations // 10)]]),
+        "find_samples_jsonpath": time_calls(db_manager.find_samples,
+                                            [(f"$.height_cm > {rng.randint(50, 400)}", sample_id, PAGE_SIZE)
+                                             for sample_id in ids[:max(1, iterations // 10)]]),
+        "find_samples_before": time_calls(db_manager.find_samples_before,
+                                          [({"health": "healthy"}, sample_id, PAGE_SIZE)
+                                           for sample_id in ids[:max(1, iterations // 10)]]),
+    }
+    
+    hot_ids = ids[:max(1, iterations // 20)]
+    results["query_sample_cached"] = time_calls(cached_manager.query_sample,
+                                                [(rng.choice(hot_ids),) for _ in range(iterations)])
+    if samples <= 1000000:
+        results["get_all_samples"] = time_calls(db_manager.get_all_samples, [()])
+    return results
+
+
+def bench_writes(db_manager, rng, samples, iterations):
+    """Time single and batch writes on Sample IDs above the generated range, then remove them."""
+    first_id = samples + 1
+    ids = list(range(first_id, first_id + iterations))
+    attributes = [json.dumps(datagen.sample_attributes(rng)) for _ in ids]
+    researchers = datagen.scale_counts(samples)["researchers"]
+    
+    results = {
+        "add_sample": time_calls(db_manager.add_sample,
+                                 [(sample_id, rng.randint(1, researchers), None, attr)
+                                  for sample_id, attr in zip(ids, attributes)]),
+        "update_sample": time_calls(db_manager.update_sample,
+                                    [(sample_id, rng.randint(1, researchers), None, attr)
+                                     for sample_id, attr in zip(ids, reversed(attributes))]),
+        "delete_sample": time_calls(db_manager.delete_sample, [(sample_id,) for sample_id in ids]),
+    }
+    
+    for sample_id, attr in zip(ids, attributes):
+        db_manager.add_sample(sample_id, None, None, attr)
+    batch = [(sample_id, None, None, attr) for sample_id, attr in zip(ids, attributes)]
+    results["update_samples"] = time_calls(db_manager.update_samples,
+                                           [(batch[start:start + BATCH_PAGE_SIZE],)
+                                            for start in range(0, len(batch), BATCH_PAGE_SIZE)])
+    results["delete_samples"] = time_calls(db_manager.delete_samples,
+                                           [(ids[start:start + BATCH_PAGE_SIZE],)
+                                            for start in range(0, len(ids), BATCH_PAGE_SIZE)])
+    return results
+
+
+def bench_bulk(db_manager, samples, import_rows, seed, export):
+    """Time one bulk import of new samples and, if requested, one full export."""
+    results = {}
+    first_id = samples + 1
+    fd, import_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    fd, export_path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    try:
+        write_samples(import_path, first_id, import_rows, seed)
+        results["import_samples"] = time_calls(db_manager.import_samples, [(import_path,)])
+        delete_range(first_id, first_id + import_rows)
+        if export:
+            results["export_samples"] = time_calls(db_manager.export_samples, [(export_path,)])
+    finally:
+        os.remove(import_path)
+        os.remove(export_path)
+    return results
+
+
+def bench_json(rng, iterations):
+    """Time encoding and decoding attribute payloads and formatting table rows."""
+    from table import SampleTable
+    
+    documents = [datagen.sample_attributes(rng) for _ in range(iterations)]
+    encoded = [json_codec.dumps(document) for document in documents]
+    rows = [(index, 1, 1, document) for index, document in enumerate(documents)]
+    return {
+        "json_encode_attributes": time_calls(json_codec.dumps, [(document,) for document in documents]),
+        "json_decode_attributes": time_calls(json_codec.loads, [(text,) for text in encoded]),
+        "table_format_row": time_calls(SampleTable._format_row, [(row,) for row in rows]),
+    }
+
+
+def bench_table(db_manager, pages, repeats):
+    """
+    Time SampleTable populating its first page and scrolling forward page by page.
+    
+    Returns:
+        dict: Durations per step, or None if Tk cannot start (no display)
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    
+    from table import SampleTable
+    root.withdraw()
+    errors = []
+    table = SampleTable(tk.Frame(root), db_manager, InlineExecutor(), errors.append)
+    
+    reload_durations = []
+    scroll_durations = []
+    try:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            table.reload()
+            root.update_idletasks()
+            reload_durations.append(time.perf_counter() - started)
+            
+            for _ in range(pages):
+                if not table._has_after:
+                    break
+                started = time.perf_counter()
+                table._fetch(False, table._keys[-1], table._show_next_page)
+                root.update_idletasks()
+                scroll_durations.append(time.perf_counter() - started)
+    finally:
+        root.destroy()
+    
+    if errors:
+        raise errors[0]
+    return {"table_reload": reload_durations, "table_next_page": scroll_durations}
+
+
+def environment(scale, seed, iterations):
+    """Describe the run so results can be matched to a commit and machine."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip()
+    except OSError:
+        commit = None
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    server_version = conn.server_version
+    conn.close()
+    return {
+        "results_version": RESULTS_VERSION,
+        "commit": commit or None,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "postgres_server_version": server_version,
+        "scale": scale,
+        "seed": seed,
+        "iterations": iterations,
+    }
+
+
+def run(args):
+    """Load data, run every benchmark and return the results document."""
+    samples = datagen.SCALES[args.scale]
+    conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+    try:
+        datagen.generate(conn.cursor(), conn, samples, args.seed,
+                         lambda table, rows: print(f"\rloading {table}: {rows} rows", end="", file=sys.stderr))
+    finally:
+        conn.close()
+    print(file=sys.stderr)
+    
+    rng = random.Random(args.seed)
+    db_manager = DatabaseManager(pooled=True, cache_size=0)
+    cached_manager = DatabaseManager(pooled=False)
+    durations = {}
+    try:
+        for name, step in (
+                ("reads", lambda: bench_reads(db_manager, cached_manager, rng, samples, args.iterations)),
+                ("writes", lambda: bench_writes(db_manager, rng, samples, args.iterations)),
+                ("bulk", lambda: bench_bulk(db_manager, samples, args.import_rows, args.seed, not args.skip_export)),
+                ("json", lambda: bench_json(rng, args.iterations)),
+                ("table", lambda: bench_table(db_manager, args.table_pages, args.table_repeats))):
+            print(f"running {name} benchmarks", file=sys.stderr)
+            results = step()
+            if results is None:
+                print(f"skipped {name} benchmarks: Tk could not start (run under xvfb-run)", file=sys.stderr)
+                continue
+            durations.update(results)
+        meta = environment(args.scale, args.seed, args.iterations)
+    finally:
+        db_manager.close()
+        cached_manager.close()
+    
+    return {"meta": meta, "results": {name: summarize(values) for name, values in sorted(durations.items()) if values}}
+
+
+def main():
+    """Parse arguments, run the suite and write the results."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(datagen.SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=1000, help="Calls per single-row operation")
+    parser.add_argument("--import-rows", type=int, default=50000)
+    parser.add_argument("--skip-export", action="store_true", help="Skip the full-table export")
+    parser.add_argument("--table-pages", type=int, default=20, help="Pages scrolled per table repeat")
+    parser.add_argument("--table-repeats", type=int, default=5)
+    parser.add_argument("--output", default="-", help="Results file (default: stdout)")
+    parser.add_argument("--use-configured-db", action="store_true",
+                        help="Use config.DB_CONFIG instead of a throwaway server; its tables are dropped and reloaded")
+    args = parser.parse_args()
+    
+    if args.use_configured_db:
+        document = run(args)
+    else:
+        with throwaway_postgres():
+            document = run(args)
+    
+    text = json.dumps(document, indent=2, sort_keys=True)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
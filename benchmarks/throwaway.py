@@ -0,0 +1,88 @@
+"""
+Throwaway PostgreSQL instance for the benchmark suite.
+
+Runs initdb into a temporary directory, starts a server on a free port
+listening only on a Unix socket in that directory, and points
+config.DB_CONFIG at it for the duration of a ``with`` block. Durability
+settings are relaxed because the data is discarded afterwards. Requires the
+PostgreSQL server binaries (initdb, pg_ctl) on PATH or in the usual
+/usr/lib/postgresql/<version>/bin location, and a non-root user, since initdb
+refuses to run as root.
+"""
+
+import glob
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from contextlib import contextmanager
+import psycopg2
+from config import DB_CONFIG, DB_POOL_KEYS
+
+DATABASE_NAME = "plant_bench"
+SERVER_SETTINGS = ("fsync=off", "synchronous_commit=off", "full_page_writes=off", "shared_buffers=256MB",
+                   "max_wal_size=4GB", "maintenance_work_mem=512MB")
+
+
+def find_binary(name):
+    """
+    Locate a PostgreSQL server binary.
+    
+    Raises:
+        Exception: If the binary cannot be found
+    """
+    path = shutil.which(name)
+    if path:
+        return path
+    candidates = sorted(glob.glob(f"/usr/lib/postgresql/*/bin/{name}"))
+    if candidates:
+        return candidates[-1]
+    raise Exception(f"{name} not found; install the PostgreSQL server or pass --use-configured-db")
+
+
+def free_port():
+    """Return a TCP port number that is currently unused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def throwaway_postgres():
+    """
+    Start a temporary PostgreSQL server and point DB_CONFIG at it.
+    
+    DB_CONFIG is updated in place, so modules that imported it see the
+    throwaway server; the original settings are restored on exit.
+    
+    Yields:
+        dict: The updated DB_CONFIG
+    """
+    directory = tempfile.mkdtemp(prefix="plant-bench-")
+    data = os.path.join(directory, "data")
+    port = free_port()
+    pg_ctl = find_binary("pg_ctl")
+    saved = dict(DB_CONFIG)
+    started = False
+    try:
+        subprocess.run([find_binary("initdb"), "-D", data, "-U", "postgres", "--auth=trust", "-E", "UTF8"],
+                       check=True, stdout=subprocess.DEVNULL)
+        options = f"-p {port} -k {directory} -c listen_addresses=''" + "".join(f" -c {setting}" for setting in SERVER_SETTINGS)
+        subprocess.run([pg_ctl, "-D", data, "-o", options, "-l", os.path.join(directory, "server.log"), "-w", "start"],
+                       check=True, stdout=subprocess.DEVNULL)
+        started = True
+        
+        DB_CONFIG.update({'dbname': 'postgres', 'user': 'postgres', 'password': '', 'host': directory, 'port': str(port)})
+        conn = psycopg2.connect(**{key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS})
+        conn.autocommit = True
+        conn.cursor().execute(f"CREATE DATABASE {DATABASE_NAME}")
+        conn.close()
+        DB_CONFIG['dbname'] = DATABASE_NAME
+        yield DB_CONFIG
+    finally:
+        DB_CONFIG.clear()
+        DB_CONFIG.update(saved)
+        if started:
+            subprocess.run([pg_ctl, "-D", data, "-m", "fast", "-w", "stop"], stdout=subprocess.DEVNULL)
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,302 @@
+"""
+Bulk import module for Plant Sample CRUD Application.
+
+Handles loading many plant samples at once from CSV or JSONL files. Rows are
+validated client-side, streamed to a temporary staging table with
+COPY ... FROM STDIN in bounded chunks, and moved into the sample table with
+a single INSERT ... ON CONFLICT DO NOTHING per chunk so that duplicate
+Sample IDs are reported per row instead of aborting the load. A chunk the
+server rejects (for example over an unknown Researcher ID) is inserted
+again row by row, so only the offending rows are reported.
+"""
+
+import csv
+import io
+from config import (TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, ID_SQL_TYPE,
+                    IMPORT_CHUNK_SIZE)
+import json_codec
+
+STAGING_TABLE = "plant_sample_import"
+IMPORT_COLUMNS = (COL_SAMPLE_ID, COL_RESEARCHER_ID, COL_LOCATION_ID, COL_SAMPLE_ATTRIBUTES)
+
+
+def read_csv_records(file):
+    """
+    Yield records from a CSV file with a header row.
+    
+    The header must use the sample column names from config
+    ("Sample ID", "Researcher ID", "Location ID", "Sample Attributes").
+    
+    Args:
+        file: Open text file
+        
+    Yields:
+        tuple: (line_number: int, record: dict)
+    """
+    reader = csv.DictReader(file)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def read_jsonl_records(file):
+    """
+    Yield records from a JSON Lines file, one JSON object per line.
+    
+    Objects use the same keys as the JSON query result shown by the UI.
+    
+    Args:
+        file: Open text file
+        
+    Yields:
+        tuple: (line_number: int, record: dict or None)
+        record is None when the line is not a valid JSON object.
+    """
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json_codec.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def validate_record(record):
+    """
+    Validate one input record and convert it to a staging row.
+    
+    With an integer ID_SQL_TYPE the Sample, Researcher and Location IDs are
+    converted to int, so " 7" and "007" both become 7; an empty Researcher
+    or Location ID becomes NULL.
+    
+    Args:
+        record (dict): Parsed input record
+        
+    Returns:
+        tuple: (row: tuple or None, error: str or None)
+        row is (sample_id, researcher_id, location_id, sample_attributes_json).
+    """
+    if record is None:
+        return None, "Invalid JSON record"
+    
+    ids = []
+    for name in (COL_SAMPLE_ID, COL_RESEARCHER_ID, COL_LOCATION_ID):
+        value, error = convert_id(name, record.get(name))
+        if error:
+            return None, error
+        ids.append(value)
+    sample_id, researcher_id, location_id = ids
+    if sample_id is None:
+        return None, "Sample ID is required"
+    
+    sample_attr = record.get(COL_SAMPLE_ATTRIBUTES)
+    if sample_attr in (None, ""):
+        sample_attr = "{}"
+    elif isinstance(sample_attr, str):
+        try:
+            json_codec.loads(sample_attr)
+        except ValueError:
+            return None, "Invalid JSON format for Sample Attributes"
+    else:
+        sample_attr = json_codec.dumps(sample_attr)
+    
+    return (sample_id, researcher_id, location_id, sample_attr), None
+
+
+def convert_id(name, value):
+    """
+    Convert a Sample, Researcher or Location ID to the database column type.
+    
+    Used for import records and for IDs in service requests.
+    
+    Args:
+        name (str): Column name, for the error message
+        value: ID as read from the input, or None
+        
+    Returns:
+        tuple: (value, error: str or None); value is None for a missing or empty ID
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None, None
+    if ID_SQL_TYPE not in ("integer", "bigint", "smallint"):
+        return value, None
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        return None, f"{name} must be an integer"
+    try:
+        return int(value), None
+    except (TypeError, ValueError):
+        return None, f"{name} must be an integer"
+
+
+def record_reader(path, file_format=None):
+    """
+    Return the record reader for an input file.
+    
+    Args:
+        path (str): Path of the input file
+        file_format (str): "csv" or "jsonl"; inferred from the file extension if None
+        
+    Returns:
+        read_csv_records or read_jsonl_records
+        
+    Raises:
+        Exception: If the file format is unknown
+    """
+    if file_format is None:
+        file_format = "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+    if file_format == "csv":
+        return read_csv_records
+    if file_format == "jsonl":
+        return read_jsonl_records
+    raise Exception(f"Unsupported import format: {file_format}")
+
+
+def import_samples(cursor, conn, path, file_format=None, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+    """
+    Bulk load plant samples from a CSV or JSONL file.
+    
+    Each chunk is committed on its own, so a failing chunk only rolls back
+    its own rows.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        path (str): Path of the input file
+        file_format (str): "csv" or "jsonl"; inferred from the file extension if None
+        chunk_size (int): Maximum number of rows sent per COPY
+        progress: Optional callable receiving (rows_read, rows_inserted) after each chunk
+        
+    Returns:
+        tuple: (inserted: int, errors: list)
+        errors holds (line_number, sample_id, message) for every rejected row.
+        
+    Raises:
+        Exception: If the file format is unknown
+    """
+    reader = record_reader(path, file_format)
+    _create_staging_table(cursor, conn)
+    
+    inserted = 0
+    rows_read = 0
+    errors = []
+    chunk = []
+    with open(path, newline='', encoding='utf-8') as file:
+        for line_number, record in reader(file):
+            rows_read += 1
+            row, error = validate_record(record)
+            if error:
+                errors.append((line_number, record.get(COL_SAMPLE_ID) if record else None, error))
+                continue
+            chunk.append((line_number, row))
+            
+            if len(chunk) >= chunk_size:
+                inserted += _load_chunk(cursor, conn, chunk, errors)
+                chunk = []
+                if progress:
+                    progress(rows_read, inserted)
+        
+        if chunk:
+            inserted += _load_chunk(cursor, conn, chunk, errors)
+        if progress:
+            progress(rows_read, inserted)
+    
+    return inserted, errors
+
+
+def _create_staging_table(cursor, conn):
+    """Create the session-local staging table used by COPY."""
+    cursor.execute(f'''
+        CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE}
+        (LIKE "{TABLE_PLANT_SAMPLE}" INCLUDING DEFAULTS)
+        ON COMMIT DELETE ROWS
+    ''')
+    conn.commit()
+
+
+def _load_chunk(cursor, conn, chunk, errors):
+    """
+    COPY one chunk into the staging table and insert the new samples.
+    
+    If the server rejects the chunk, it is rolled back and inserted again
+    by _load_rows, one row at a time.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        chunk (list): (line_number, row) pairs that passed validation
+        errors (list): Error list to append duplicate or failed rows to
+        
+    Returns:
+        int: Number of rows inserted
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for _, row in chunk:
+        writer.writerow(row)
+    buffer.seek(0)
+    
+    columns = ", ".join(f'"{column}"' for column in IMPORT_COLUMNS)
+    try:
+        cursor.copy_expert(f'COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+        cursor.execute(f'''
+            INSERT INTO "{TABLE_PLANT_SAMPLE}" ({columns})
+            SELECT {columns} FROM {STAGING_TABLE}
+            ON CONFLICT ("{COL_SAMPLE_ID}") DO NOTHING
+            RETURNING "{COL_SAMPLE_ID}"
+        ''')
+        new_ids = {row[0] for row in cursor.fetchall()}
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        return _load_rows(cursor, conn, chunk, errors)
+    
+    inserted = len(new_ids)
+    for line_number, row in chunk:
+        if row[0] in new_ids:
+            new_ids.discard(row[0])
+        else:
+            errors.append((line_number, row[0], "Sample ID already exists"))
+    return inserted
+
+
+def _load_rows(cursor, conn, chunk, errors):
+    """
+    Insert a chunk one row at a time, with a savepoint around each row.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        chunk (list): (line_number, row) pairs that passed validation
+        errors (list): Error list to append duplicate or failed rows to
+        
+    Returns:
+        int: Number of rows inserted
+    """
+    columns = ", ".join(f'"{column}"' for column in IMPORT_COLUMNS)
+    inserted = 0
+    first_error = len(errors)
+    try:
+        for line_number, row in chunk:
+            cursor.execute("SAVEPOINT import_row")
+            try:
+                cursor.execute(f'''
+                    INSERT INTO "{TABLE_PLANT_SAMPLE}" ({columns})
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT ("{COL_SAMPLE_ID}") DO NOTHING
+                    RETURNING "{COL_SAMPLE_ID}"
+                ''', row)
+                if cursor.fetchone():
+                    inserted += 1
+                else:
+                    errors.append((line_number, row[0], "Sample ID already exists"))
+                cursor.execute("RELEASE SAVEPOINT import_row")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT import_row")
+                errors.append((line_number, row[0], str(e).strip()))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        del errors[first_error:]
+        errors.extend((line_number, row[0], str(e)) for line_number, row in chunk)
+        return 0
+    return inserted
@@ -0,0 +1,134 @@
+"""
+Cache module for Plant Sample CRUD Application.
+
+Provides LRUCache class, a thread-safe in-process LRU cache with optional
+per-entry time-to-live and hit/miss/eviction counters.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Least-recently-used cache with an optional TTL.
+    
+    Entries beyond ``capacity`` are evicted oldest-use first; entries older
+    than ``ttl`` seconds are treated as misses and dropped. A write sequence
+    number lets readers skip storing a value loaded while a concurrent write
+    may have changed it.
+    """
+    
+    def __init__(self, capacity, ttl=None):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            capacity (int): Maximum number of entries
+            ttl (float): Entry lifetime in seconds, or None for no expiry
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key):
+        """
+        Look up a key and mark it as recently used.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            tuple: (found: bool, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            
+            value, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+    
+    def write_token(self):
+        """
+        Return the current write sequence number.
+        
+        Take a token before loading a value from the database and pass it to
+        put(); the value is then only stored if no write happened meanwhile.
+        
+        Returns:
+            int: Write sequence number
+        """
+        with self._lock:
+            return self._writes
+    
+    def put(self, key, value, token=None):
+        """
+        Store a value, evicting the least recently used entry when full.
+        
+        Args:
+            key: Cache key
+            value: Value to store
+            token (int): Optional write_token() taken before the value was loaded
+        """
+        with self._lock:
+            if token is not None and token != self._writes:
+                return
+            if token is None:
+                self._writes += 1
+            
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, key):
+        """
+        Remove a key if present.
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._writes += 1
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Remove every entry, keeping the counters."""
+        with self._lock:
+            self._writes += 1
+            self._entries.clear()
+    
+    def stats(self):
+        """
+        Return the cache counters.
+        
+        Returns:
+            dict: hits, misses, evictions, expirations, size and capacity
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'capacity': self.capacity,
+            }
@@ -0,0 +1,175 @@
+"""
+Change feed module for Plant Sample CRUD Application.
+
+Provides ChangeFeed, a background listener for the notifications that the
+plant sample triggers (migrations/003_change_feed.py) send on every
+committed write. Notifications are decoded into ChangeEvent objects and
+handed to a callback, so clients learn about other clients' changes
+without polling the server.
+"""
+
+import logging
+import select
+import socket
+import threading
+from config import DB_CONFIG, DB_POOL_KEYS, CHANGE_FEED_CHANNEL, CHANGE_FEED_RETRY_INTERVAL
+import json_codec
+
+OPERATIONS = {"I": "insert", "U": "update", "D": "delete", "R": "reload"}
+
+log = logging.getLogger("plant_sample.change_feed")
+
+KEEPALIVE_PARAMS = {"keepalives": 1, "keepalives_idle": 60, "keepalives_interval": 10, "keepalives_count": 3}
+
+
+class ChangeEvent:
+    """One change to a plant sample, or a request to reload everything."""
+    
+    __slots__ = ("operation", "sample_id", "row")
+    
+    def __init__(self, operation, sample_id=None, row=None):
+        self.operation = operation
+        self.sample_id = sample_id
+        self.row = row
+
+
+def decode_event(payload):
+    """
+    Decode a notification payload sent by the plant sample triggers.
+    
+    Args:
+        payload (str): JSON payload, see migrations/003_change_feed.py
+        
+    Returns:
+        ChangeEvent: operation is "insert", "update", "delete" or "reload"; row is
+        (sample_id, researcher_id, location_id, sample_attributes), or None if the
+        payload carried only the Sample ID
+        
+    Raises:
+        ValueError: If the payload is not a change notification
+    """
+    message = json_codec.loads(payload)
+    try:
+        operation = OPERATIONS[message["op"]]
+    except (TypeError, KeyError):
+        raise ValueError(f"Not a change notification: {payload[:100]}")
+    
+    row = message.get("row")
+    if row is not None:
+        return ChangeEvent(operation, row[0], tuple(row))
+    return ChangeEvent(operation, message.get("id"))
+
+
+class ChangeFeed:
+    """
+    Listens on the change channel over a dedicated connection.
+    
+    The listener thread blocks in select() on the connection's socket, so an
+    idle feed sends no queries; TCP keepalives detect a dead connection.
+    When the connection is lost the feed reconnects every retry_interval
+    seconds and then delivers a "reload" event, since notifications sent
+    while it was away are not replayed. on_event runs on the listener
+    thread and must not touch Tk; an exception it raises is logged and the
+    feed carries on with the next notification.
+    """
+    
+    def __init__(self, on_event, channel=CHANGE_FEED_CHANNEL, retry_interval=CHANGE_FEED_RETRY_INTERVAL):
+        """
+        Prepare the listener; start() opens the connection.
+        
+        Args:
+            on_event: Callable receiving each ChangeEvent
+            channel (str): Notification channel to LISTEN on
+            retry_interval (float): Seconds between reconnection attempts
+        """
+        self.on_event = on_event
+        self.channel = channel
+        self.retry_interval = retry_interval
+        self.last_error = None
+        self.connected = False
+        self._conn = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+    
+    def start(self):
+        """Start the listener thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen_loop, name="change-feed", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout=None):
+        """
+        Stop the listener thread and close its connection.
+        
+        Args:
+            timeout (float): Seconds to wait for the thread, or None to wait until it ends
+        """
+        self._stopping.set()
+        self._wake_writer.send(b"\0")
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._wake_reader.close()
+        self._wake_writer.close()
+    
+    def _connect(self):
+        """Open the listening connection."""
+        import psycopg2
+        import psycopg2.extensions
+        
+        params = {key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS}
+        self._conn = psycopg2.connect(**params, **KEEPALIVE_PARAMS)
+        self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with self._conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+    
+    def _disconnect(self):
+        """Close the listening connection, ignoring errors."""
+        self.connected = False
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+    
+    def _listen_loop(self):
+        """Deliver notifications until stopped, reconnecting after failures."""
+        reconnecting = False
+        while not self._stopping.is_set():
+            try:
+                self._connect()
+                self.connected = True
+                self.last_error = None
+                if reconnecting:
+                    self._deliver(ChangeEvent("reload"))
+                self._receive()
+            except Exception as e:
+                self.last_error = e
+            finally:
+                self._disconnect()
+            reconnecting = True
+            self._stopping.wait(self.retry_interval)
+    
+    def _receive(self):
+        """Wait for notifications and deliver them until stopped or the connection fails."""
+        while True:
+            select.select([self._conn, self._wake_reader], [], [])
+            if self._stopping.is_set():
+                return
+            self._conn.poll()
+            while self._conn.notifies:
+                notify = self._conn.notifies.pop(0)
+                try:
+                    event = decode_event(notify.payload)
+                except ValueError:
+                    continue
+                self._deliver(event)
+    
+    def _deliver(self, event):
+        """Pass an event to on_event, logging its errors so they do not drop the connection."""
+        try:
+            self.on_event(event)
+        except Exception:
+            log.exception("Change feed callback failed for %s of Sample ID %s", event.operation, event.sample_id)
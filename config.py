@@ -1,26 +1,112 @@
-"""
-Configuration module for Plant Sample CRUD Application.
-
-Contains all configuration constants including database connection parameters,
-UI settings, and database table/column names.
-"""
-
-DB_CONFIG = {
-    'dbname': 'plant_database',
-    'user': 'postgres',
-    'password': 'postgres',
-    'host': 'localhost',
-    'port': '5432'
-}
-
-APP_TITLE = "Plant Sample Database System"
-APP_WIDTH = 900
-APP_HEIGHT = 600
-FONT_TITLE = ('Arial', 16, 'bold')
-PADDING = "10"
-
-TABLE_PLANT_SAMPLE = "Plant Sample"
-COL_SAMPLE_ID = "Sample ID"
-COL_RESEARCHER_ID = "Researcher ID"
-COL_LOCATION_ID = "Location ID"
-COL_SAMPLE_ATTRIBUTES = "Sample Attributes"
+"""
+Configuration module for Plant Sample CRUD Application.
+
+Contains all configuration constants including database connection parameters,
+UI settings, and database table/column names.
+"""
+
+DB_CONFIG = {
+    'dbname': 'plant_database',
+    'user': 'postgres',
+    'password': 'postgres',
+    'host': 'localhost',
+    'port': '5432',
+    'minconn': 1,
+    'maxconn': 10
+}
+
+DB_POOL_KEYS = ('minconn', 'maxconn')
+DB_PREPARE_STATEMENTS = True
+
+DB_BACKEND = "postgresql"
+SQLITE_PATH = "plant_samples.sqlite3"
+SQLITE_TIMEOUT = 5.0
+SQLITE_ATTRIBUTE_INDEXES = ("species", "health")
+
+WRITE_QUEUE_ENABLED = False
+WRITE_QUEUE_PATH = "pending_writes.sqlite3"
+WRITE_QUEUE_BATCH_SIZE = 500
+WRITE_QUEUE_FLUSH_INTERVAL = 2.0
+WRITE_QUEUE_RETRY_INTERVAL = 15.0
+SYNC_POLL_MS = 1000
+
+CHANGE_FEED_ENABLED = True
+CHANGE_FEED_CHANNEL = "plant_sample_changes"
+CHANGE_FEED_RETRY_INTERVAL = 15.0
+CHANGE_FEED_POLL_MS = 100
+
+APP_TITLE = "Plant Sample Database System"
+APP_WIDTH = 900
+APP_HEIGHT = 600
+FONT_TITLE = ('Arial', 16, 'bold')
+PADDING = "10"
+
+TABLE_PLANT_SAMPLE = "Plant Sample"
+COL_SAMPLE_ID = "Sample ID"
+COL_RESEARCHER_ID = "Researcher ID"
+COL_LOCATION_ID = "Location ID"
+COL_SAMPLE_ATTRIBUTES = "Sample Attributes"
+
+TABLE_RESEARCHER = "Researcher"
+COL_RESEARCHER_NAME = "Name"
+COL_RESEARCHER_EMAIL = "Email"
+COL_RESEARCHER_PHONE = "Phone"
+COL_RESEARCHER_AFFILIATION = "Affiliation"
+
+TABLE_SAMPLING_LOCATION = "Sampling Location"
+COL_LOCATION_ATTRIBUTES = "Location Attributes"
+
+TABLE_ENVIRONMENTAL_CONDITION = "Environmental Condition"
+COL_CONDITION_ATTRIBUTES = "Condition Attributes"
+
+INDEX_SAMPLE_RESEARCHER = "plant_sample_researcher_id_idx"
+INDEX_SAMPLE_LOCATION = "plant_sample_location_id_idx"
+INDEX_SAMPLE_ATTRIBUTES = "plant_sample_attributes_gin"
+INDEX_LOCATION_ATTRIBUTES = "sampling_location_attributes_gin"
+INDEX_CONDITION_ATTRIBUTES = "environmental_condition_attributes_gin"
+ID_SQL_TYPE = "integer"
+
+PAGE_SIZE = 200
+TABLE_MAX_ROWS = 600
+TABLE_PREFETCH_THRESHOLD = 0.1
+TABLE_LOAD_ALL_PAGE_SIZE = 10000
+TABLE_SEARCH_DELAY_MS = 200
+
+IMPORT_CHUNK_SIZE = 5000
+EXPORT_ITERSIZE = 5000
+READ_ITERSIZE = 10000
+BATCH_PAGE_SIZE = 1000
+
+WORKER_THREADS = 4
+RESULT_POLL_MS = 15
+
+QUERY_CACHE_SIZE = 1024
+QUERY_CACHE_TTL = 300
+
+MIGRATIONS_DIR = "migrations"
+MIGRATIONS_TABLE = "schema_migrations"
+
+PARTITION_SIZE = 1000000
+PARTITIONS_AHEAD = 2
+PARTITION_PREFIX = "plant_sample_p"
+ARCHIVE_DIR = "archive"
+
+STATS_TOP_N = 20
+STATS_MATERIALIZED = False
+STATS_REFRESH_INTERVAL = 300
+STATS_VIEW_PREFIX = "plant_sample_stats_"
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_GZIP_MIN_BYTES = 1024
+SERVICE_MAX_PAGE_SIZE = 1000
+
+JSON_CODEC = "auto"
+TABLE_ATTR_DISPLAY_CHARS = 120
+
+METRICS_ENABLED = False
+METRICS_DUMP_PATH = None
+METRICS_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SLOW_QUERY_MS = 250
+SLOW_QUERY_THRESHOLDS_MS = {'get_all_samples': 2000, 'import_samples': None, 'export_samples': None, 'apply_migrations': None}
+SLOW_QUERY_LOG = None
@@ -3,44 +3,286 @@ Database module for Plant Sample CRUD Application.
 
 Provides DatabaseManager class that manages database connections and delegates
 CRUD operations to specialized operation modules (create, read, update, delete).
+The PostgreSQL server is used by default; DB_BACKEND = "sqlite" selects the
+embedded backend in sqlite_backend.
+
+psycopg2 and the operation modules are imported on first use rather than
+with this module, so the GUI can paint before paying for them.
 """
 
-import psycopg2
-from config import DB_CONFIG
-from create import add_sample
-from read import query_sample, get_all_samples
-from update import update_sample
-from delete import delete_sample
+import threading
+import time
+from types import SimpleNamespace
+from config import DB_CONFIG, DB_POOL_KEYS, DB_PREPARE_STATEMENTS, PAGE_SIZE, IMPORT_CHUNK_SIZE, EXPORT_ITERSIZE, QUERY_CACHE_SIZE, QUERY_CACHE_TTL, METRICS_ENABLED, DB_BACKEND, SQLITE_PATH, WRITE_QUEUE_ENABLED, WRITE_QUEUE_RETRY_INTERVAL, CHANGE_FEED_RETRY_INTERVAL, PARTITION_SIZE, PARTITIONS_AHEAD, ARCHIVE_DIR, STATS_TOP_N, STATS_MATERIALIZED
+from cache import LRUCache
+import json_codec
+
+BACKENDS = ("postgresql", "sqlite")
+
+_OPERATIONS = {}
+
+
+def load_operations(backend):
+    """
+    Import the operation functions of a backend.
+    
+    Args:
+        backend (str): "postgresql" or "sqlite"
+        
+    Returns:
+        Namespace (or module) with one attribute per operation, e.g. add_sample
+    """
+    operations = _OPERATIONS.get(backend)
+    if operations is not None:
+        return operations
+    
+    if backend == "sqlite":
+        import sqlite_backend as operations
+    else:
+        from create import add_sample
+        from read import (query_sample, query_sample_detail, list_sample_details, get_all_samples, get_samples_page,
+                          get_samples_page_before, find_samples, find_samples_before)
+        from update import update_sample, update_samples
+        from delete import delete_sample, delete_samples
+        from bulk_import import import_samples
+        from export import export_samples
+        from migrate import apply_migrations, migration_status
+        from partition import list_partitions, partition_table, ensure_partitions, archive_partitions
+        from stats import sample_statistics, attribute_distribution, create_statistics_views, refresh_statistics_views
+        operations = SimpleNamespace(
+            add_sample=add_sample, update_sample=update_sample, update_samples=update_samples,
+            delete_sample=delete_sample, delete_samples=delete_samples,
+            query_sample=query_sample, query_sample_detail=query_sample_detail, list_sample_details=list_sample_details,
+            get_all_samples=get_all_samples, get_samples_page=get_samples_page, get_samples_page_before=get_samples_page_before,
+            find_samples=find_samples, find_samples_before=find_samples_before,
+            import_samples=import_samples, export_samples=export_samples,
+            apply_migrations=apply_migrations, migration_status=migration_status,
+            list_partitions=list_partitions, partition_table=partition_table, ensure_partitions=ensure_partitions,
+            archive_partitions=archive_partitions,
+            sample_statistics=sample_statistics, attribute_distribution=attribute_distribution,
+            create_statistics_views=create_statistics_views, refresh_statistics_views=refresh_statistics_views,
+        )
+    _OPERATIONS[backend] = operations
+    return operations
+
+
+def _detail_key(sample_id):
+    """Return the query cache key of a sample's detail document."""
+    return ("detail", str(sample_id))
 
 
 class DatabaseManager:
     """
-    Manages database connection and orchestrates CRUD operations.
+    Manages database connections and orchestrates CRUD operations.
     
     Acts as a facade to coordinate between the UI layer and individual
     operation modules. Maintains the database connection and provides
     methods for add, read, update, and delete operations.
+    
+    In pooled mode (the default) every operation checks out its own
+    connection and cursor from a ThreadedConnectionPool sized by
+    DB_CONFIG['minconn'] and DB_CONFIG['maxconn'], so several threads can
+    run CRUD operations at the same time. Without a pool, operations share
+    a single connection and are serialized by a lock. In both modes a
+    connection found closed is discarded and replaced.
+    
+    With DB_PREPARE_STATEMENTS enabled, connections are PreparingConnection
+    instances and the CRUD hot paths run as server-side prepared statements.
+    
+    query_sample is served from an in-process LRU/TTL cache keyed by
+    Sample ID when QUERY_CACHE_SIZE is non-zero. Writes made through this
+    manager refresh or invalidate the affected entries.
+    
+    An instrumentation hook (see metrics.Metrics) is told the duration,
+    rows touched and error of every operation that reaches the database.
+    Without one, operations run untimed.
+    
+    With the "sqlite" backend the operations come from sqlite_backend and
+    run on per-thread connections to the SQLITE_PATH file; pooling and
+    prepared statements do not apply. ``operations`` holds the active set.
+    
+    With a write queue (see write_queue.WriteQueue), add, update and delete
+    calls, single or batched, are checked locally, stored in the queue file
+    and acknowledged with the row they will produce; a background thread
+    sends them to PostgreSQL. Reads still go to the server, so they see a
+    queued write once it has been sent. The manager then starts even if
+    the server is unreachable, and connects on first use.
+    
+    A lazy manager does not connect, or import its backend's operation
+    modules, until the first operation runs; app.py uses this so the window
+    paints while the first page loads on a worker thread.
+    
+    listen() starts a change feed (see change_feed.ChangeFeed) that reports
+    committed writes from every client. The manager drops each changed
+    sample from the query cache before passing the event on, so the cache
+    also stays current with other clients' writes.
     """
     
-    def __init__(self):
-        """Initialize database connection and cursor."""
+    def __init__(self, pooled=True, cache_size=QUERY_CACHE_SIZE, cache_ttl=QUERY_CACHE_TTL, instrumentation=None,
+                 backend=DB_BACKEND, write_queue=WRITE_QUEUE_ENABLED, lazy=False):
+        """
+        Initialize the connection pool, or a single connection and cursor.
+        
+        Args:
+            pooled (bool): Use a connection pool instead of one shared connection
+            cache_size (int): query_sample cache capacity, 0 to disable caching
+            cache_ttl (float): query_sample cache entry lifetime in seconds, or None
+            instrumentation: Object with a record(operation, seconds, rows, error, args)
+                method; a Metrics instance is created if None and METRICS_ENABLED is set
+            backend (str): "postgresql" or "sqlite"
+            write_queue (bool): Acknowledge writes locally and send them in the background
+            lazy (bool): Connect on the first operation instead of now
+            
+        Raises:
+            Exception: If the backend is unknown or the connection fails
+        """
+        self.pooled = pooled
+        self.pool = None
         self.conn = None
         self.cursor = None
-        self.connect()
+        self.sqlite = None
+        self.write_queue = None
+        self.change_feed = None
+        if backend not in BACKENDS:
+            raise Exception(f"Unknown database backend: {backend}")
+        if write_queue and backend != "postgresql":
+            raise Exception("The write queue sends writes to PostgreSQL only")
+        self.backend = backend
+        self._operations = None
+        if backend == "sqlite":
+            self.sqlite = load_operations("sqlite").SQLiteBackend(SQLITE_PATH)
+        self._lock = threading.Lock()
+        self._slots = None
+        self.cache = LRUCache(cache_size, cache_ttl) if cache_size else None
+        if instrumentation is None and METRICS_ENABLED:
+            from metrics import Metrics
+            instrumentation = Metrics()
+        self.instrumentation = instrumentation
+        if not write_queue:
+            if not lazy:
+                self.connect()
+            return
+        
+        from write_queue import WriteQueue
+        self.write_queue = WriteQueue(self)
+        if not lazy:
+            try:
+                self.connect()
+            except Exception:
+                pass
+        self.write_queue.start()
+    
+    @property
+    def operations(self):
+        """Operation functions of the active backend, imported on first use."""
+        if self._operations is None:
+            self._operations = load_operations(self.backend)
+        return self._operations
     
     def connect(self):
         """
-        Establish connection to PostgreSQL database.
+        Establish connection to PostgreSQL database, or open the SQLite database.
         
         Raises:
             Exception: If database connection fails.
         """
+        if self.sqlite:
+            self.sqlite.connect()
+            return
+        
+        import psycopg2
+        import psycopg2.pool
+        from prepared import PreparingConnection
+        
+        json_codec.register_psycopg2()
+        params = {key: value for key, value in DB_CONFIG.items() if key not in DB_POOL_KEYS}
+        if DB_PREPARE_STATEMENTS:
+            params['connection_factory'] = PreparingConnection
         try:
-            self.conn = psycopg2.connect(**DB_CONFIG)
-            self.cursor = self.conn.cursor()
+            if self.pooled:
+                self.pool = psycopg2.pool.ThreadedConnectionPool(
+                    DB_CONFIG['minconn'], DB_CONFIG['maxconn'], **params)
+                self._slots = threading.BoundedSemaphore(DB_CONFIG['maxconn'])
+            else:
+                self.conn = psycopg2.connect(**params)
+                self.cursor = self.conn.cursor()
         except Exception as e:
             raise Exception(f"Failed to connect to database:\n{str(e)}")
     
+    def _run(self, operation, *args, retry=False):
+        """
+        Run a CRUD operation with its own cursor and connection.
+        
+        Args:
+            operation: Function taking (cursor, conn, *args)
+            *args: Remaining arguments for the operation
+            retry (bool): Run the operation once more on a fresh connection if it
+                raised because its connection was lost. Only safe for reads.
+                
+        Returns:
+            The operation's return value
+        """
+        if self.instrumentation is None:
+            return self._execute(operation, args, retry)
+        
+        from metrics import rows_touched, write_error
+        started = time.perf_counter()
+        try:
+            result = self._execute(operation, args, retry)
+        except Exception as e:
+            self.instrumentation.record(operation.__name__, time.perf_counter() - started, 0, e, args)
+            raise
+        self.instrumentation.record(operation.__name__, time.perf_counter() - started, rows_touched(result),
+                                    write_error(result), args)
+        return result
+    
+    def _execute(self, operation, args, retry):
+        """Run an operation on a pooled or the shared connection; see _run."""
+        if self.sqlite:
+            return self.sqlite.execute(operation, args)
+        
+        if not self.pooled:
+            with self._lock:
+                if self.conn is None or self.conn.closed:
+                    self.connect()
+                try:
+                    return operation(self.cursor, self.conn, *args)
+                except Exception:
+                    if not (retry and self.conn.closed):
+                        raise
+                self.connect()
+                return operation(self.cursor, self.conn, *args)
+        
+        if self.pool is None:
+            with self._lock:
+                if self.pool is None:
+                    self.connect()
+        
+        with self._slots:
+            for attempt in range(2 if retry else 1):
+                conn = self._checkout()
+                try:
+                    with conn.cursor() as cursor:
+                        return operation(cursor, conn, *args)
+                except Exception:
+                    if not (conn.closed and attempt == 0 and retry):
+                        raise
+                finally:
+                    self.pool.putconn(conn, close=bool(conn.closed))
+    
+    def _checkout(self):
+        """
+        Take a live connection from the pool, replacing closed ones.
+        
+        Returns:
+            psycopg2 connection
+        """
+        conn = self.pool.getconn()
+        while conn.closed:
+            self.pool.putconn(conn, close=True)
+            conn = self.pool.getconn()
+        return conn
+    
     def add_sample(self, sample_id, researcher_id, location_id, sample_attr):
         """
         Add a new plant sample to the database.
@@ -52,9 +294,14 @@ class DatabaseManager:
             sample_attr (str): JSON string containing sample attributes
             
         Returns:
-            tuple: (success: bool, message: str)
+            tuple: (success: bool, message: str, row: tuple or None)
         """
-        return add_sample(self.cursor, self.conn, sample_id, researcher_id, location_id, sample_attr)
+        if self.write_queue is not None:
+            return self._queue_writes([("add", sample_id, researcher_id, location_id, sample_attr)])[0]
+        
+        result = self._run(self.operations.add_sample, sample_id, researcher_id, location_id, sample_attr)
+        self._refresh_cached(sample_id, result)
+        return result
     
     def update_sample(self, sample_id, researcher_id, location_id, sample_attr):
         """
@@ -67,9 +314,14 @@ class DatabaseManager:
             sample_attr (str): JSON string containing sample attributes
             
         Returns:
-            tuple: (success: bool, message: str)
+            tuple: (success: bool, message: str, row: tuple or None)
         """
-        return update_sample(self.cursor, self.conn, sample_id, researcher_id, location_id, sample_attr)
+        if self.write_queue is not None:
+            return self._queue_writes([("update", sample_id, researcher_id, location_id, sample_attr)])[0]
+        
+        result = self._run(self.operations.update_sample, sample_id, researcher_id, location_id, sample_attr)
+        self._refresh_cached(sample_id, result)
+        return result
     
     def delete_sample(self, sample_id):
         """
@@ -79,9 +331,50 @@ class DatabaseManager:
             sample_id (str): Unique identifier for the sample
             
         Returns:
-            tuple: (success: bool, message: str)
+            tuple: (success: bool, message: str, row: tuple or None)
+        """
+        if self.write_queue is not None:
+            return self._queue_writes([("delete", sample_id, None, None, None)])[0]
+        
+        result = self._run(self.operations.delete_sample, sample_id)
+        self._invalidate_cached(sample_id)
+        return result
+    
+    def update_samples(self, batch):
+        """
+        Update many plant samples in one round trip and one transaction.
+        
+        Args:
+            batch (list): Tuples of (sample_id, researcher_id, location_id, sample_attr)
+            
+        Returns:
+            list: One (success: bool, message: str, row: tuple or None) per batch entry
+        """
+        if self.write_queue is not None:
+            return self._queue_writes([("update", *entry) for entry in batch])
+        
+        results = self._run(self.operations.update_samples, batch)
+        for entry, result in zip(batch, results):
+            self._refresh_cached(entry[0], result)
+        return results
+    
+    def delete_samples(self, sample_ids):
+        """
+        Delete many plant samples in one round trip and one transaction.
+        
+        Args:
+            sample_ids (list): Sample IDs to delete
+            
+        Returns:
+            list: One (success: bool, message: str, row: tuple or None) per sample ID
         """
-        return delete_sample(self.cursor, self.conn, sample_id)
+        if self.write_queue is not None:
+            return self._queue_writes([("delete", sample_id, None, None, None) for sample_id in sample_ids])
+        
+        results = self._run(self.operations.delete_samples, sample_ids)
+        for sample_id in sample_ids:
+            self._invalidate_cached(sample_id)
+        return results
     
     def query_sample(self, sample_id):
         """
@@ -93,19 +386,419 @@ class DatabaseManager:
         Returns:
             tuple: (sample_id, sample_attributes, researcher_id, location_id) or None
         """
-        return query_sample(self.cursor, self.conn, sample_id)
+        if self.cache is None:
+            return self._run(self.operations.query_sample, sample_id, retry=True)
+        
+        key = str(sample_id)
+        found, result = self.cache.get(key)
+        if found:
+            return result
+        
+        token = self.cache.write_token()
+        result = self._run(self.operations.query_sample, sample_id, retry=True)
+        if result is not None:
+            self.cache.put(key, result, token)
+        return result
+    
+    def _queue_writes(self, writes):
+        """
+        Check writes locally and store the valid ones in the write queue.
+        
+        Args:
+            writes (list): Tuples of (operation, sample_id, researcher_id, location_id, sample_attr)
+            
+        Returns:
+            list: One (success: bool, message: str, row: tuple or None) per write. A queued
+            delete's row holds only the Sample ID unless the sample was cached.
+        """
+        from write_queue import local_row
+        
+        results = []
+        queued = []
+        for operation, sample_id, researcher_id, location_id, sample_attr in writes:
+            row, error = local_row(sample_id, researcher_id, location_id, sample_attr)
+            if error:
+                results.append((False, error, None))
+                continue
+            if operation == "delete":
+                cached = self.cache.get(str(sample_id))[1] if self.cache else None
+                row = (cached[0], cached[2], cached[3], cached[1]) if cached else row
+            queued.append((operation, str(sample_id), researcher_id, location_id, sample_attr))
+            results.append((True, f"Sample {operation} queued for sync", row))
+        
+        if queued:
+            self.write_queue.enqueue(queued)
+        for (operation, *_), (success, message, row) in zip(writes, results):
+            if not success:
+                continue
+            if operation == "delete":
+                self._invalidate_cached(row[0])
+            else:
+                self._refresh_cached(row[0], (success, message, row))
+        return results
+    
+    def _refresh_cached(self, sample_id, result):
+        """
+        Update the query cache after a write to one sample.
+        
+        Args:
+            sample_id: Sample ID that was written
+            result (tuple): (success, message, row) returned by the write;
+                the entry is refreshed from row on success, dropped otherwise
+        """
+        if self.cache is None:
+            return
+        
+        success, message, row = result
+        if success:
+            self.cache.put(str(row[0]), (row[0], row[3], row[1], row[2]))
+            self.cache.invalidate(_detail_key(row[0]))
+        else:
+            self.cache.invalidate(str(sample_id))
+            self.cache.invalidate(_detail_key(sample_id))
+    
+    def _invalidate_cached(self, sample_id):
+        """Drop one sample and its detail document from the query cache, if caching is enabled."""
+        if self.cache is not None:
+            self.cache.invalidate(str(sample_id))
+            self.cache.invalidate(_detail_key(sample_id))
+    
+    def cache_stats(self):
+        """
+        Return query cache counters.
+        
+        Returns:
+            dict: hits, misses, evictions, expirations, size and capacity, or None if caching is disabled
+        """
+        return self.cache.stats() if self.cache else None
+    
+    def query_sample_detail(self, sample_id):
+        """
+        Query a plant sample with its researcher, location and environmental conditions.
+        
+        Documents are cached next to the query_sample entry of the same
+        Sample ID and dropped whenever that entry is written or invalidated.
+        
+        Args:
+            sample_id (str): Unique identifier for the sample
+            
+        Returns:
+            dict: Nested sample document, or None if the sample does not exist
+        """
+        if self.cache is None:
+            return self._run(self.operations.query_sample_detail, sample_id, retry=True)
+        
+        key = _detail_key(sample_id)
+        found, result = self.cache.get(key)
+        if found:
+            return result
+        
+        token = self.cache.write_token()
+        result = self._run(self.operations.query_sample_detail, sample_id, retry=True)
+        if result is not None:
+            self.cache.put(key, result, token)
+        return result
+    
+    def list_sample_details(self, after_id=None, limit=PAGE_SIZE):
+        """
+        Retrieve one page of nested sample documents ordered by Sample ID.
+        
+        Args:
+            after_id: Last Sample ID of the previous page, or None for the first page
+            limit (int): Maximum number of documents to return
+            
+        Returns:
+            list: Sample detail documents (dict)
+        """
+        return self._run(self.operations.list_sample_details, after_id, limit, retry=True)
     
     def get_all_samples(self):
         """
         Retrieve all plant samples from the database.
         
+        Returns:
+            SampleColumns: Rows of (sample_id, researcher_id, location_id, sample_attributes),
+            with the attributes decoded as each row is read
+        """
+        return self._run(self.operations.get_all_samples, retry=True)
+    
+    def get_samples_page(self, after_id=None, limit=PAGE_SIZE):
+        """
+        Retrieve one page of plant samples ordered by Sample ID.
+        
+        Args:
+            after_id: Last Sample ID of the previous page, or None for the first page
+            limit (int): Maximum number of rows to return
+            
+        Returns:
+            list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        return self._run(self.operations.get_samples_page, after_id, limit, retry=True)
+    
+    def get_samples_page_before(self, before_id, limit=PAGE_SIZE):
+        """
+        Retrieve the page of plant samples immediately preceding a Sample ID.
+        
+        Args:
+            before_id: First Sample ID of the following page
+            limit (int): Maximum number of rows to return
+            
+        Returns:
+            list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        return self._run(self.operations.get_samples_page_before, before_id, limit, retry=True)
+    
+    def find_samples(self, attr_filter, after_id=None, limit=PAGE_SIZE):
+        """
+        Find one page of plant samples whose attributes match a filter.
+        
+        Args:
+            attr_filter (dict or str): Containment document (@>) or JSON path predicate (@@)
+            after_id: Last Sample ID of the previous page, or None for the first page
+            limit (int): Maximum number of rows to return
+            
+        Returns:
+            list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        return self._run(self.operations.find_samples, attr_filter, after_id, limit, retry=True)
+    
+    def find_samples_before(self, attr_filter, before_id, limit=PAGE_SIZE):
+        """
+        Find the page of matching plant samples immediately preceding a Sample ID.
+        
+        Args:
+            attr_filter (dict or str): Containment document (@>) or JSON path predicate (@@)
+            before_id: First Sample ID of the following page
+            limit (int): Maximum number of rows to return
+            
         Returns:
             list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
         """
-        return get_all_samples(self.cursor, self.conn)
+        return self._run(self.operations.find_samples_before, attr_filter, before_id, limit, retry=True)
+    
+    def import_samples(self, path, file_format=None, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+        """
+        Bulk load plant samples from a CSV or JSONL file using COPY.
+        
+        Args:
+            path (str): Path of the input file
+            file_format (str): "csv" or "jsonl"; inferred from the file extension if None
+            chunk_size (int): Maximum number of rows sent per COPY
+            progress: Optional callable receiving (rows_read, rows_inserted) after each chunk
+            
+        Returns:
+            tuple: (inserted: int, errors: list of (line_number, sample_id, message))
+        """
+        return self._run(self.operations.import_samples, path, file_format, chunk_size, progress)
+    
+    def export_samples(self, path, file_format=None, itersize=EXPORT_ITERSIZE, progress=None):
+        """
+        Stream every plant sample to a JSONL, CSV or Parquet file.
+        
+        Args:
+            path (str): Output file path
+            file_format (str): "jsonl", "csv" or "parquet"; inferred from the file extension if None
+            itersize (int): Rows fetched from the server per round trip
+            progress: Optional callable receiving the number of rows written so far
+            
+        Returns:
+            int: Number of rows written
+        """
+        return self._run(self.operations.export_samples, path, file_format, itersize, progress)
+    
+    def apply_migrations(self, progress=None):
+        """
+        Apply the pending schema migrations in migrations/.
+        
+        Args:
+            progress: Optional callable receiving (version, name) before each migration runs
+            
+        Returns:
+            list: Versions applied by this call
+        """
+        from migrate import DEFAULT_DIRECTORY
+        return self._run(self.operations.apply_migrations, DEFAULT_DIRECTORY, progress)
+    
+    def migration_status(self):
+        """
+        Report which schema migrations have been applied.
+        
+        Returns:
+            list: Tuples of (version, name, applied, changed)
+        """
+        from migrate import DEFAULT_DIRECTORY
+        return self._run(self.operations.migration_status, DEFAULT_DIRECTORY, retry=True)
+    
+    def list_partitions(self):
+        """
+        List the Sample ID range partitions of the plant sample table.
+        
+        Returns:
+            list: Tuples of (name, start_id, end_id, estimated_rows, total_bytes);
+            empty if the table is not partitioned
+        """
+        return self._run(self.operations.list_partitions, retry=True)
+    
+    def partition_table(self, partition_size=PARTITION_SIZE, ahead=PARTITIONS_AHEAD):
+        """
+        Convert the plant sample table into one partitioned by Sample ID range.
+        
+        Args:
+            partition_size (int): Sample IDs per partition
+            ahead (int): Empty partitions to create above the newest Sample ID
+            
+        Returns:
+            list: Names of the partitions created
+        """
+        return self._run(self.operations.partition_table, partition_size, ahead)
+    
+    def ensure_partitions(self, partition_size=PARTITION_SIZE, ahead=PARTITIONS_AHEAD):
+        """
+        Create partitions until `ahead` empty ones lie above the newest Sample ID.
+        
+        Args:
+            partition_size (int): Sample IDs per new partition
+            ahead (int): Empty partitions to keep above the newest Sample ID
+            
+        Returns:
+            list: Names of the partitions created
+        """
+        return self._run(self.operations.ensure_partitions, partition_size, ahead)
+    
+    def archive_partitions(self, before_id, directory=ARCHIVE_DIR, file_format="jsonl", drop=False, progress=None):
+        """
+        Export, then detach or drop, every partition lying below a Sample ID.
+        
+        The query cache is cleared afterwards, since archived samples are no
+        longer in the table.
+        
+        Args:
+            before_id (int): Archive partitions ending at or below this Sample ID
+            directory (str): Directory for the archive files
+            file_format (str): "jsonl", "csv" or "parquet" for the samples file
+            drop (bool): Drop the detached partitions
+            progress: Optional callable receiving (partition, rows_written)
+            
+        Returns:
+            list: Tuples of (partition, rows, path)
+        """
+        try:
+            return self._run(self.operations.archive_partitions, before_id, directory, file_format, drop, progress)
+        finally:
+            if self.cache is not None:
+                self.cache.clear()
+    
+    def sample_statistics(self, limit=STATS_TOP_N, materialized=STATS_MATERIALIZED):
+        """
+        Summarize samples per researcher, per location and per attribute key in SQL.
+        
+        Args:
+            limit (int): Rows returned per ranking
+            materialized (bool): Read the materialized statistics views (PostgreSQL only)
+            
+        Returns:
+            dict: "totals", "researchers", "locations", "attributes" and
+            "refreshed_at"; see stats.sample_statistics
+        """
+        return self._run(self.operations.sample_statistics, limit, materialized, retry=True)
+    
+    def attribute_distribution(self, key, limit=STATS_TOP_N):
+        """
+        Count the samples per value of one top-level attribute key.
+        
+        Args:
+            key (str): Attribute key
+            limit (int): Maximum number of values to return
+            
+        Returns:
+            list: Tuples of (value, samples) by descending sample count
+        """
+        return self._run(self.operations.attribute_distribution, key, limit, retry=True)
+    
+    def create_statistics_views(self):
+        """
+        Create the materialized statistics views if they do not exist.
+        
+        Returns:
+            list: Names of the views
+        """
+        return self._run(self.operations.create_statistics_views)
+    
+    def refresh_statistics_views(self, concurrently=True):
+        """
+        Recompute the materialized statistics views.
+        
+        Args:
+            concurrently (bool): Refresh without blocking readers of the views
+            
+        Returns:
+            int: Number of views refreshed
+        """
+        return self._run(self.operations.refresh_statistics_views, concurrently)
+    
+    def listen(self, on_event):
+        """
+        Start delivering row-level changes made by any client.
+        
+        Events whose notification carried only the Sample ID are completed
+        with the row read from the database; an insert or update of a row
+        that no longer exists becomes a delete.
+        
+        Args:
+            on_event: Callable receiving each change_feed.ChangeEvent. It runs
+                on the listener thread.
+                
+        Raises:
+            Exception: If the backend is not PostgreSQL
+        """
+        if self.backend != "postgresql":
+            raise Exception("The change feed requires PostgreSQL")
+        if self.change_feed is not None:
+            return
+        
+        from change_feed import ChangeFeed
+        self.change_feed = ChangeFeed(lambda event: on_event(self._complete_event(event)))
+        self.change_feed.start()
+    
+    def _complete_event(self, event):
+        """
+        Invalidate the cache for a change event and fill in its row if missing.
+        
+        Args:
+            event: change_feed.ChangeEvent
+            
+        Returns:
+            change_feed.ChangeEvent: The event, with row set for inserts and updates
+        """
+        if event.operation == "reload":
+            if self.cache is not None:
+                self.cache.clear()
+            return event
+        
+        self._invalidate_cached(event.sample_id)
+        if event.operation == "delete" or event.row is not None:
+            return event
+        
+        sample = self.query_sample(event.sample_id)
+        if sample is None:
+            event.operation = "delete"
+        else:
+            event.row = (sample[0], sample[2], sample[3], sample[1])
+        return event
     
     def close(self):
-        """Close the database connection."""
+        """Stop the change feed and the write queue, then close the database connections."""
+        if self.change_feed is not None:
+            self.change_feed.stop(timeout=CHANGE_FEED_RETRY_INTERVAL)
+            self.change_feed = None
+        if self.write_queue is not None:
+            self.write_queue.stop(timeout=WRITE_QUEUE_RETRY_INTERVAL)
+            self.write_queue = None
+        if self.sqlite:
+            self.sqlite.close()
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
         if self.conn:
             self.conn.close()
     
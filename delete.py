@@ -1,35 +1,85 @@
-"""
-Delete operation module for Plant Sample CRUD Application.
-
-Handles DELETE operations for removing plant samples from the database.
-"""
-
-from config import TABLE_PLANT_SAMPLE, COL_SAMPLE_ID
-
-
-def delete_sample(cursor, conn, sample_id):
-    """
-    Delete a plant sample from the database by its ID.
-    
-    Args:
-        cursor: Database cursor
-        conn: Database connection
-        sample_id (str): Unique identifier for the sample
-        
-    Returns:
-        tuple: (success: bool, message: str)
-        - (True, "Sample deleted successfully") on success
-        - (False, "Sample ID not found") if sample doesn't exist
-        - (False, error_message) on other database errors
-    """
-    try:
-        cursor.execute(f'DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" = %s', (sample_id,))
-        conn.commit()
-        
-        if cursor.rowcount > 0:
-            return True, "Sample deleted successfully"
-        else:
-            return False, "Sample ID not found"
-    except Exception as e:
-        conn.rollback()
-        return False, str(e)
+"""
+Delete operation module for Plant Sample CRUD Application.
+
+Handles DELETE operations for removing plant samples from the database.
+"""
+
+from config import TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, ID_SQL_TYPE
+from prepared import PreparedStatement
+
+DELETE_SAMPLE = PreparedStatement("plant_sample_delete", f'''
+    DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" = %s
+    RETURNING "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+''')
+
+DELETE_SAMPLES_SQL = f'''
+    DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" = ANY(%s::{ID_SQL_TYPE}[])
+    RETURNING "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+'''
+
+
+def delete_sample(cursor, conn, sample_id):
+    """
+    Delete a plant sample from the database by its ID.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        sample_id (str): Unique identifier for the sample
+        
+    Returns:
+        tuple: (success: bool, message: str, row: tuple or None)
+        - (True, "Sample deleted successfully", row) on success
+        - (False, "Sample ID not found", None) if sample doesn't exist
+        - (False, error_message, None) on other database errors
+        
+        row is (sample_id, researcher_id, location_id, sample_attributes) as it was before deletion.
+    """
+    try:
+        DELETE_SAMPLE.execute(cursor, conn, (sample_id,))
+        row = cursor.fetchone()
+        conn.commit()
+        
+        if row is not None:
+            return True, "Sample deleted successfully", row
+        else:
+            return False, "Sample ID not found", None
+    except Exception as e:
+        conn.rollback()
+        return False, str(e), None
+
+
+def delete_samples(cursor, conn, sample_ids):
+    """
+    Delete many plant samples in a single statement and transaction.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        sample_ids (list): Sample IDs to delete
+        
+    Returns:
+        list: One (success: bool, message: str, row: tuple or None) per sample ID,
+        in input order, with the same meaning as delete_sample's result.
+        On a database error nothing is deleted and every entry carries the error.
+    """
+    if not sample_ids:
+        return []
+    
+    try:
+        cursor.execute(DELETE_SAMPLES_SQL, (list(sample_ids),))
+        rows = cursor.fetchall()
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return [(False, str(e), None)] * len(sample_ids)
+    
+    deleted = {str(row[0]): row for row in rows}
+    results = []
+    for sample_id in sample_ids:
+        row = deleted.pop(str(sample_id), None)
+        if row is not None:
+            results.append((True, "Sample deleted successfully", row))
+        else:
+            results.append((False, "Sample ID not found", None))
+    return results
@@ -0,0 +1,123 @@
+"""
+Executor module for Plant Sample CRUD Application.
+
+Provides UIExecutor class that runs database calls on worker threads and
+delivers their results back on the Tk main thread, so a slow query never
+blocks event handling or repaints.
+"""
+
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from config import WORKER_THREADS, RESULT_POLL_MS
+
+
+class UIExecutor:
+    """
+    Runs blocking calls in the background and hands results to Tk callbacks.
+    
+    Worker threads never touch Tk: finished futures are put on a queue that
+    the main thread drains with root.after while work is pending. Tasks
+    submitted with a key supersede earlier tasks with the same key; a
+    superseded task is cancelled if it has not started yet, and its result
+    is dropped otherwise.
+    """
+    
+    def __init__(self, root, workers=WORKER_THREADS, on_busy=None):
+        """
+        Initialize the worker pool.
+        
+        Args:
+            root: Tkinter root window used to schedule result delivery
+            workers (int): Number of worker threads
+            on_busy: Optional callable receiving True when work starts and
+                False when the last pending task has been delivered
+        """
+        self.root = root
+        self.on_busy = on_busy
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db-worker")
+        self._results = queue.Queue()
+        self._latest = {}
+        self._pending = 0
+        self._polling = False
+    
+    def submit(self, func, *args, on_done=None, on_error=None, key=None):
+        """
+        Run func(*args) on a worker thread.
+        
+        Args:
+            func: Blocking callable to run
+            *args: Arguments for func
+            on_done: Called on the main thread with the return value
+            on_error: Called on the main thread with the raised exception
+            key (str): Optional supersession key, e.g. "refresh"
+            
+        Returns:
+            concurrent.futures.Future: The submitted task
+        """
+        future = self._pool.submit(func, *args)
+        task = (future, key, on_done, on_error)
+        
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = future
+        
+        self._pending += 1
+        if self._pending == 1 and self.on_busy:
+            self.on_busy(True)
+        
+        future.add_done_callback(lambda _: self._results.put(task))
+        if not self._polling:
+            self._polling = True
+            self.root.after(RESULT_POLL_MS, self._poll)
+        return future
+    
+    def cancel(self, key):
+        """
+        Supersede the pending task with the given key without replacing it.
+        
+        Args:
+            key (str): Supersession key passed to submit
+        """
+        future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+    
+    def shutdown(self):
+        """Stop accepting work and cancel tasks that have not started."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _poll(self):
+        """Deliver finished tasks on the main thread and reschedule while busy."""
+        while True:
+            try:
+                future, key, on_done, on_error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            
+            self._pending -= 1
+            if key is not None:
+                if self._latest.get(key) is not future:
+                    continue
+                del self._latest[key]
+            if future.cancelled():
+                continue
+            
+            try:
+                error = future.exception()
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+        
+        if self._pending:
+            self.root.after(RESULT_POLL_MS, self._poll)
+        else:
+            self._polling = False
+            if self.on_busy:
+                self.on_busy(False)
@@ -0,0 +1,176 @@
+"""
+Export operation module for Plant Sample CRUD Application.
+
+Handles streaming all plant samples to JSONL, CSV or Parquet files. Rows
+are read through a named (server-side) cursor, so only ``itersize`` rows
+are held in memory at a time regardless of table size. The attributes are
+read as JSON text and written as they are, without decoding them.
+"""
+
+import csv
+from config import TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, EXPORT_ITERSIZE
+import json_codec
+
+EXPORT_COLUMNS = (COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID)
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+
+# EXPORT_COLUMNS for a SELECT list, with the attributes as JSON text
+EXPORT_SELECT = ", ".join(f'"{column}"::text' if column == COL_SAMPLE_ATTRIBUTES else f'"{column}"'
+                          for column in EXPORT_COLUMNS)
+
+
+def export_samples(cursor, conn, path, file_format=None, itersize=EXPORT_ITERSIZE, progress=None):
+    """
+    Stream every plant sample to a file ordered by Sample ID.
+    
+    JSONL lines use the same keys as the JSON query result shown by the UI.
+    CSV and Parquet store the attributes as JSON text in one column.
+    
+    Args:
+        cursor: Database cursor (unused; a named cursor is opened on conn)
+        conn: Database connection
+        path (str): Output file path
+        file_format (str): "jsonl", "csv" or "parquet"; inferred from the file extension if None
+        itersize (int): Rows fetched from the server per round trip
+        progress: Optional callable receiving the number of rows written so far
+        
+    Returns:
+        int: Number of rows written
+        
+    Raises:
+        Exception: If the format is unknown, pyarrow is missing for Parquet,
+            or the export fails
+    """
+    writer = _writer(path, file_format)
+    
+    server_cursor = conn.cursor(name="plant_sample_export")
+    server_cursor.itersize = itersize
+    try:
+        server_cursor.execute(f'SELECT {EXPORT_SELECT} FROM "{TABLE_PLANT_SAMPLE}" ORDER BY "{COL_SAMPLE_ID}"')
+        return writer(server_cursor, path, itersize, progress)
+    except Exception as e:
+        raise Exception(f"Export failed:\n{str(e)}")
+    finally:
+        server_cursor.close()
+        conn.rollback()
+
+
+def write_samples(rows, path, file_format=None, itersize=EXPORT_ITERSIZE, progress=None):
+    """
+    Write already-fetched sample rows to a file.
+    
+    Used by backends that stream rows without a named cursor.
+    
+    Args:
+        rows: Iterable of (sample_id, sample_attributes, researcher_id, location_id),
+            the attributes as JSON text (str) or None
+        path (str): Output file path
+        file_format (str): "jsonl", "csv" or "parquet"; inferred from the file extension if None
+        itersize (int): Rows per progress report and Parquet row group
+        progress: Optional callable receiving the number of rows written so far
+        
+    Returns:
+        int: Number of rows written
+        
+    Raises:
+        Exception: If the format is unknown or pyarrow is missing for Parquet
+    """
+    return _writer(path, file_format)(rows, path, itersize, progress)
+
+
+def _writer(path, file_format):
+    """Return the writer function for a format, inferring it from the path if None."""
+    if file_format is None:
+        file_format = path.rsplit(".", 1)[-1].lower()
+    if file_format not in EXPORT_FORMATS:
+        raise Exception(f"Unsupported export format: {file_format}")
+    return {"jsonl": _write_jsonl, "csv": _write_csv, "parquet": _write_parquet}[file_format]
+
+
+def _write_jsonl(rows, path, itersize, progress):
+    """Write rows as JSON Lines, inserting the attribute JSON text into each record as it is."""
+    keys = [json_codec.dumps(column) for column in EXPORT_COLUMNS]
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        for sample_id, sample_attr, researcher_id, location_id in rows:
+            values = (json_codec.dumps(sample_id), sample_attr or "{}",
+                      json_codec.dumps(researcher_id), json_codec.dumps(location_id))
+            file.write("{" + ",".join(f"{key}:{value}" for key, value in zip(keys, values)) + "}\n")
+            count += 1
+            if progress and count % itersize == 0:
+                progress(count)
+    if progress:
+        progress(count)
+    return count
+
+
+def _write_csv(rows, path, itersize, progress):
+    """Write rows as CSV with a header of config column names."""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(EXPORT_COLUMNS)
+        for sample_id, sample_attr, researcher_id, location_id in rows:
+            writer.writerow((sample_id, sample_attr or "{}", researcher_id, location_id))
+            count += 1
+            if progress and count % itersize == 0:
+                progress(count)
+    if progress:
+        progress(count)
+    return count
+
+
+def _write_parquet(rows, path, itersize, progress):
+    """
+    Write rows as Parquet, one row group per ``itersize`` rows.
+    
+    IDs are stored as int64, matching the integer columns in plants.sql.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet export requires the pyarrow package")
+    
+    count = 0
+    writer = None
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= itersize:
+                writer = _write_parquet_batch(pa, pq, writer, path, batch)
+                count += len(batch)
+                batch = []
+                if progress:
+                    progress(count)
+        if batch or writer is None:
+            writer = _write_parquet_batch(pa, pq, writer, path, batch)
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    if progress:
+        progress(count)
+    return count
+
+
+def _write_parquet_batch(pa, pq, writer, path, batch):
+    """Append one batch to the Parquet file, opening the writer on first use."""
+    if writer is None:
+        schema = pa.schema([
+            (COL_SAMPLE_ID, pa.int64()),
+            (COL_SAMPLE_ATTRIBUTES, pa.string()),
+            (COL_RESEARCHER_ID, pa.int64()),
+            (COL_LOCATION_ID, pa.int64()),
+        ])
+        writer = pq.ParquetWriter(path, schema)
+    
+    columns = {
+        COL_SAMPLE_ID: [row[0] for row in batch],
+        COL_SAMPLE_ATTRIBUTES: [row[1] or "{}" for row in batch],
+        COL_RESEARCHER_ID: [row[2] for row in batch],
+        COL_LOCATION_ID: [row[3] for row in batch],
+    }
+    writer.write_table(pa.Table.from_pydict(columns, schema=writer.schema))
+    return writer
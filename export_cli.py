@@ -0,0 +1,48 @@
+"""
+Command-line entry point for exporting plant samples.
+
+Usage:
+    python export_cli.py samples.jsonl
+    python export_cli.py samples.parquet --itersize 20000
+"""
+
+import argparse
+import sys
+from config import EXPORT_ITERSIZE
+from database import DatabaseManager
+from export import EXPORT_FORMATS
+
+
+def main(argv=None):
+    """
+    Parse arguments and stream every sample to the output file.
+    
+    Returns:
+        int: Process exit code
+    """
+    parser = argparse.ArgumentParser(description="Export plant samples to JSONL, CSV or Parquet.")
+    parser.add_argument("path", help="Output file (.jsonl, .csv, .parquet)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default=None,
+                        help="Output format (default: inferred from the file extension)")
+    parser.add_argument("--itersize", type=int, default=EXPORT_ITERSIZE,
+                        help=f"Rows fetched per round trip (default: {EXPORT_ITERSIZE})")
+    args = parser.parse_args(argv)
+    
+    def report(rows_written):
+        print(f"\r{rows_written} rows written", end="", file=sys.stderr)
+    
+    try:
+        db_manager = DatabaseManager(pooled=False)
+        count = db_manager.export_samples(args.path, args.format, args.itersize, report)
+        db_manager.close()
+    except Exception as e:
+        print(f"\nExport failed:\n{str(e)}", file=sys.stderr)
+        return 1
+    
+    print(file=sys.stderr)
+    print(f"{count} samples exported to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Command-line entry point for bulk importing plant samples.
+
+Usage:
+    python import_cli.py samples.csv
+    python import_cli.py samples.jsonl --chunk-size 10000
+"""
+
+import argparse
+import sys
+from config import IMPORT_CHUNK_SIZE
+from database import DatabaseManager
+
+
+def main(argv=None):
+    """
+    Parse arguments, run the import and print a per-row error report.
+    
+    Returns:
+        int: Process exit code, 1 if any row was rejected
+    """
+    parser = argparse.ArgumentParser(description="Bulk import plant samples from CSV or JSONL.")
+    parser.add_argument("path", help="Input file (.csv, .jsonl)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default=None,
+                        help="Input format (default: inferred from the file extension)")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE,
+                        help=f"Rows per COPY chunk (default: {IMPORT_CHUNK_SIZE})")
+    args = parser.parse_args(argv)
+    
+    def report(rows_read, rows_inserted):
+        print(f"\r{rows_read} rows read, {rows_inserted} inserted", end="", file=sys.stderr)
+    
+    try:
+        db_manager = DatabaseManager(pooled=False)
+        inserted, errors = db_manager.import_samples(args.path, args.format, args.chunk_size, report)
+        db_manager.close()
+    except Exception as e:
+        print(f"\nImport failed:\n{str(e)}", file=sys.stderr)
+        return 1
+    
+    print(file=sys.stderr)
+    for line_number, sample_id, message in errors:
+        print(f"line {line_number}: Sample ID {sample_id}: {message}")
+    print(f"{inserted} samples imported, {len(errors)} rejected")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
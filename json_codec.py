@@ -0,0 +1,155 @@
+"""
+JSON codec module for Plant Sample CRUD Application.
+
+Provides one pluggable JSON codec used wherever attribute documents are
+parsed or serialized: psycopg2 result decoding, write validation, table
+display, import and export. With JSON_CODEC set to "auto" the orjson
+package is used when installed and the standard library json module
+otherwise. The choice is made on first use, so importing this module
+does not import orjson.
+"""
+
+import json
+from config import JSON_CODEC
+
+
+class JSONCodec:
+    """
+    A named pair of JSON functions.
+    
+    ``dumps`` returns str, ``loads`` accepts str or bytes and raises
+    ValueError on invalid input, and ``preview`` returns at most ``limit``
+    characters of a document's serialization without necessarily
+    serializing all of it.
+    """
+    
+    def __init__(self, name, dumps, loads, preview):
+        """
+        Bundle the codec functions.
+        
+        Args:
+            name (str): Codec name
+            dumps: Function serializing a value to str
+            loads: Function parsing str or bytes
+            preview: Function (value, limit) returning a serialization prefix
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.preview = preview
+
+
+_ENCODER = json.JSONEncoder()
+
+
+def _stdlib_preview(value, limit):
+    """Serialize incrementally and stop once ``limit`` characters are produced."""
+    parts = []
+    size = 0
+    for chunk in _ENCODER.iterencode(value):
+        parts.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            break
+    return "".join(parts)[:limit]
+
+
+STDLIB_CODEC = JSONCodec("json", json.dumps, json.loads, _stdlib_preview)
+
+
+def _orjson_codec():
+    """Build the orjson codec, or return None if orjson is not installed."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    
+    def dumps(value):
+        return orjson.dumps(value).decode()
+    
+    # orjson can only serialize whole documents; the incremental stdlib
+    # encoder stops early and is faster for previews of large documents.
+    return JSONCodec("orjson", dumps, orjson.loads, _stdlib_preview)
+
+
+def _select_codec(name):
+    """Return the codec for a JSON_CODEC setting."""
+    if name == "json":
+        return STDLIB_CODEC
+    codec = _orjson_codec()
+    if codec is None:
+        if name == "orjson":
+            raise Exception("JSON_CODEC is 'orjson' but the orjson package is not installed")
+        return STDLIB_CODEC
+    return codec
+
+
+_codec = None
+
+
+def get_codec():
+    """Return the active codec, selecting it from JSON_CODEC on first use."""
+    global _codec
+    if _codec is None:
+        _codec = _select_codec(JSON_CODEC)
+    return _codec
+
+
+def set_codec(codec):
+    """
+    Replace the active codec.
+    
+    psycopg2 adapters registered with register_psycopg2 follow the change,
+    since they call through this module.
+    
+    Args:
+        codec (JSONCodec or str): Codec, or "auto", "orjson" or "json"
+    """
+    global _codec
+    _codec = _select_codec(codec) if isinstance(codec, str) else codec
+
+
+def dumps(value):
+    """Serialize a value to a JSON string with the active codec."""
+    return (_codec or get_codec()).dumps(value)
+
+
+def loads(text):
+    """Parse a JSON string or bytes with the active codec."""
+    return (_codec or get_codec()).loads(text)
+
+
+def display(value, limit):
+    """
+    Return a display string of at most ``limit`` characters.
+    
+    Large documents are not fully serialized; longer output is cut and
+    ends with an ellipsis.
+    
+    Args:
+        value: Decoded JSON value
+        limit (int): Maximum length of the result
+        
+    Returns:
+        str: Display string, "" for None
+    """
+    if value is None:
+        return ""
+    text = (_codec or get_codec()).preview(value, limit + 1)
+    if len(text) > limit:
+        return text[:limit - 1] + "…"
+    return text
+
+
+def register_psycopg2():
+    """
+    Register the codec as psycopg2's json/jsonb decoder and dict adapter.
+    
+    Registration is process-wide and idempotent.
+    """
+    import psycopg2.extensions
+    import psycopg2.extras
+    
+    psycopg2.extras.register_default_json(globally=True, loads=loads)
+    psycopg2.extras.register_default_jsonb(globally=True, loads=loads)
+    psycopg2.extensions.register_adapter(dict, lambda value: psycopg2.extras.Json(value, dumps=dumps))
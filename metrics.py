@@ -0,0 +1,291 @@
+"""
+Instrumentation module for Plant Sample CRUD Application.
+
+Provides Metrics, the default instrumentation hook for DatabaseManager. It
+records a latency histogram, rows touched and errors by exception type for
+every database operation, logs operations slower than a configurable
+threshold, and writes snapshots as JSON or Prometheus text.
+
+Any object with a ``record(operation, seconds, rows, error, args)`` method
+can be passed to DatabaseManager as its instrumentation hook instead. With
+no hook the manager skips timing entirely.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+from config import METRICS_BUCKETS_MS, SLOW_QUERY_MS, SLOW_QUERY_THRESHOLDS_MS, SLOW_QUERY_LOG
+from sample_model import SampleColumns
+
+METRICS_FORMATS = ("json", "prometheus")
+
+slow_query_log = logging.getLogger("plant_sample.slow_query")
+
+
+def rows_touched(result):
+    """
+    Count the rows an operation returned or wrote, from its return value.
+    
+    Args:
+        result: Return value of a CRUD operation
+        
+    Returns:
+        int: Rows touched
+    """
+    if result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    if isinstance(result, SampleColumns):
+        return len(result)
+    if isinstance(result, list):
+        return sum(1 for entry in result if not _is_write_result(entry) or entry[0])
+    if _is_write_result(result):
+        return 1 if result[0] else 0
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[0], int):
+        return result[0]
+    return 1
+
+
+def _is_write_result(value):
+    """Return True for a (success, message, row) write result."""
+    return isinstance(value, tuple) and len(value) == 3 and isinstance(value[0], bool)
+
+
+class DuplicateSampleError(Exception):
+    """A write was refused because its Sample ID already exists."""
+
+
+class SampleNotFoundError(Exception):
+    """A write was refused because its Sample ID does not exist."""
+
+
+class WriteFailedError(Exception):
+    """A write was refused for any other reason."""
+
+
+WRITE_ERRORS = {
+    "Sample ID already exists": DuplicateSampleError,
+    "Sample ID not found": SampleNotFoundError,
+}
+
+
+def write_error(result):
+    """
+    Turn a failed write result into an exception for the error counters.
+    
+    Write operations report failure by returning (False, message, None)
+    instead of raising, so without this the errors never reach record().
+    
+    Args:
+        result: Return value of a CRUD operation
+        
+    Returns:
+        Exception: Classified by message for the first failed write result
+            (or list entry), or None if every write succeeded
+    """
+    entries = result if isinstance(result, list) else [result]
+    for entry in entries:
+        if _is_write_result(entry) and not entry[0]:
+            return WRITE_ERRORS.get(entry[1], WriteFailedError)(entry[1])
+    return None
+
+
+def _error_type(error):
+    """
+    Name the root cause of an error.
+    
+    The CRUD modules re-raise driver errors as plain Exception, so the
+    original exception (for example UniqueViolation) is found by following
+    the exception chain.
+    """
+    while (error.__cause__ or error.__context__) is not None:
+        error = error.__cause__ or error.__context__
+    return type(error).__name__
+
+
+class OperationStats:
+    """Latency histogram and counters for one operation."""
+    
+    __slots__ = ("buckets", "count", "total_seconds", "rows", "errors")
+    
+    def __init__(self, bucket_count):
+        """Create empty counters for ``bucket_count`` bounded buckets plus an overflow bucket."""
+        self.buckets = [0] * (bucket_count + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.rows = 0
+        self.errors = {}
+
+
+class Metrics:
+    """
+    Thread-safe latency, row and error recorder for database operations.
+    
+    Latencies are counted into fixed histogram buckets (METRICS_BUCKETS_MS)
+    so recording is constant time and memory; percentiles are estimated
+    from the buckets when a snapshot is taken.
+    """
+    
+    def __init__(self, buckets_ms=METRICS_BUCKETS_MS, slow_query_ms=SLOW_QUERY_MS,
+                 slow_thresholds_ms=SLOW_QUERY_THRESHOLDS_MS, slow_log_path=SLOW_QUERY_LOG):
+        """
+        Initialize empty statistics.
+        
+        Args:
+            buckets_ms (tuple): Ascending histogram bucket upper bounds in milliseconds
+            slow_query_ms (float): Default slow-query threshold, or None to disable the slow-query log
+            slow_thresholds_ms (dict): Per-operation thresholds overriding slow_query_ms
+            slow_log_path (str): File the slow-query log is appended to, or None to
+                leave handling to the application's logging configuration
+        """
+        self.bounds = [bound / 1000 for bound in buckets_ms]
+        self.slow_query_ms = slow_query_ms
+        self.slow_thresholds_ms = dict(slow_thresholds_ms or {})
+        self._operations = {}
+        self._lock = threading.Lock()
+        
+        if slow_log_path and slow_query_ms is not None and not any(
+                getattr(handler, "baseFilename", None) == os.path.abspath(slow_log_path)
+                for handler in slow_query_log.handlers):
+            handler = logging.FileHandler(slow_log_path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            slow_query_log.addHandler(handler)
+            slow_query_log.setLevel(logging.WARNING)
+    
+    def record(self, operation, seconds, rows, error=None, args=()):
+        """
+        Record one operation call.
+        
+        Args:
+            operation (str): Operation name
+            seconds (float): Wall-clock duration
+            rows (int): Rows returned or written
+            error (Exception): Exception raised by the call, if any
+            args (tuple): Operation arguments, included in the slow-query log
+        """
+        bucket = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = OperationStats(len(self.bounds))
+            stats.buckets[bucket] += 1
+            stats.count += 1
+            stats.total_seconds += seconds
+            stats.rows += rows
+            if error is not None:
+                error_type = _error_type(error)
+                stats.errors[error_type] = stats.errors.get(error_type, 0) + 1
+        
+        if self.slow_query_ms is not None:
+            threshold = self.slow_thresholds_ms.get(operation, self.slow_query_ms)
+            if threshold is not None and seconds * 1000 >= threshold:
+                slow_query_log.warning("slow %s %.1f ms rows=%d args=%.200r%s", operation, seconds * 1000,
+                                       rows, args, f" error={_error_type(error)}" if error else "")
+    
+    def reset(self):
+        """Discard all recorded statistics."""
+        with self._lock:
+            self._operations.clear()
+    
+    def snapshot(self):
+        """
+        Return the current statistics.
+        
+        Returns:
+            dict: {operation: {count, rows, errors, mean_ms, p50_ms, p95_ms, p99_ms}}
+        """
+        with self._lock:
+            operations = {name: (list(stats.buckets), stats.count, stats.total_seconds, stats.rows, dict(stats.errors))
+                          for name, stats in self._operations.items()}
+        
+        snapshot = {}
+        for name, (buckets, count, total_seconds, rows, errors) in sorted(operations.items()):
+            snapshot[name] = {
+                "count": count,
+                "rows": rows,
+                "errors": errors,
+                "mean_ms": total_seconds / count * 1000 if count else 0.0,
+                "p50_ms": self._percentile(buckets, count, 0.50),
+                "p95_ms": self._percentile(buckets, count, 0.95),
+                "p99_ms": self._percentile(buckets, count, 0.99),
+            }
+        return snapshot
+    
+    def to_json(self):
+        """Return a snapshot as a JSON document."""
+        return json.dumps(self.snapshot(), indent=2)
+    
+    def to_prometheus(self):
+        """
+        Return the statistics in the Prometheus text exposition format.
+        
+        Latencies are exported as a histogram, so quantiles can be computed
+        server-side across instances; rows and errors as counters.
+        """
+        with self._lock:
+            operations = {name: (list(stats.buckets), stats.count, stats.total_seconds, stats.rows, dict(stats.errors))
+                          for name, stats in self._operations.items()}
+        
+        lines = [
+            "# HELP plant_sample_operation_seconds Database operation latency.",
+            "# TYPE plant_sample_operation_seconds histogram",
+        ]
+        for name, (buckets, count, total_seconds, rows, errors) in sorted(operations.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds, buckets):
+                cumulative += bucket_count
+                lines.append(f'plant_sample_operation_seconds_bucket{{operation="{name}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'plant_sample_operation_seconds_bucket{{operation="{name}",le="+Inf"}} {count}')
+            lines.append(f'plant_sample_operation_seconds_sum{{operation="{name}"}} {total_seconds:.6f}')
+            lines.append(f'plant_sample_operation_seconds_count{{operation="{name}"}} {count}')
+        
+        lines.append("# HELP plant_sample_operation_rows_total Rows returned or written by database operations.")
+        lines.append("# TYPE plant_sample_operation_rows_total counter")
+        for name, (buckets, count, total_seconds, rows, errors) in sorted(operations.items()):
+            lines.append(f'plant_sample_operation_rows_total{{operation="{name}"}} {rows}')
+        
+        lines.append("# HELP plant_sample_operation_errors_total Database operation errors by exception type.")
+        lines.append("# TYPE plant_sample_operation_errors_total counter")
+        for name, (buckets, count, total_seconds, rows, errors) in sorted(operations.items()):
+            for error_type, error_count in sorted(errors.items()):
+                lines.append(f'plant_sample_operation_errors_total{{operation="{name}",type="{error_type}"}} {error_count}')
+        return "\n".join(lines) + "\n"
+    
+    def dump(self, path, file_format=None):
+        """
+        Write a snapshot to a file.
+        
+        Args:
+            path (str): Output file path
+            file_format (str): "json" or "prometheus"; "json" if the path ends in .json, otherwise "prometheus"
+            
+        Raises:
+            Exception: If the format is unknown
+        """
+        if file_format is None:
+            file_format = "json" if path.lower().endswith(".json") else "prometheus"
+        if file_format not in METRICS_FORMATS:
+            raise Exception(f"Unsupported metrics format: {file_format}")
+        
+        text = self.to_json() if file_format == "json" else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+    
+    def _percentile(self, buckets, count, fraction):
+        """Estimate a latency percentile in milliseconds by interpolating within its bucket."""
+        if not count:
+            return 0.0
+        rank = fraction * count
+        seen = 0
+        for index, bucket_count in enumerate(buckets):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                if index == len(self.bounds):
+                    return lower * 1000
+                upper = self.bounds[index]
+                return (lower + (upper - lower) * (rank - seen) / bucket_count) * 1000
+            seen += bucket_count
+        return self.bounds[-1] * 1000
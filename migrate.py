@@ -0,0 +1,170 @@
+"""
+Migration module for Plant Sample CRUD Application.
+
+Applies the versioned SQL files in migrations/ to a database in order and
+records each one in a bookkeeping table, so running the migrations again
+only applies the files that are new. Files are named ``NNN_description.sql``
+or ``NNN_description.py``; the numeric prefix is the version. A Python
+migration defines its statements as the string ``SQL``, built from the
+config.py table, column and index names, so it always matches the schema the
+application queries.
+
+Each file runs in its own transaction together with its bookkeeping row,
+so a failed migration leaves nothing behind. Files whose first line is
+``-- migrate: no-transaction`` run in autocommit mode instead, one
+statement at a time, which CREATE INDEX CONCURRENTLY requires; such files
+must be idempotent on their own and may not contain semicolons inside
+string literals.
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+from config import MIGRATIONS_DIR, MIGRATIONS_TABLE
+
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.(?:sql|py)$")
+NO_TRANSACTION = "-- migrate: no-transaction"
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), MIGRATIONS_DIR)
+
+
+def discover_migrations(directory=DEFAULT_DIRECTORY):
+    """
+    List the migration files in a directory, ordered by version.
+    
+    Args:
+        directory (str): Directory holding ``NNN_description.sql`` or ``.py`` files
+        
+    Returns:
+        list: Tuples of (version: int, name: str, path: str)
+        
+    Raises:
+        Exception: If two files share a version number
+    """
+    migrations = {}
+    for file_name in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(file_name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise Exception(f"Duplicate migration version {version}: {file_name}")
+        migrations[version] = (version, match.group(2), os.path.join(directory, file_name))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def migration_status(cursor, conn, directory=DEFAULT_DIRECTORY):
+    """
+    Report which migrations have been applied.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        directory (str): Migration directory
+        
+    Returns:
+        list: Tuples of (version: int, name: str, applied: bool, changed: bool);
+        changed is True if an applied file has been edited since
+        
+    Raises:
+        Exception: If the bookkeeping table cannot be read
+    """
+    try:
+        applied = _applied_migrations(cursor, conn)
+    except Exception as e:
+        raise Exception(f"Failed to read migration status:\n{str(e)}")
+    
+    status = []
+    for version, name, path in discover_migrations(directory):
+        checksum = applied.get(version)
+        status.append((version, name, checksum is not None,
+                       checksum is not None and checksum != _checksum(_read(path))))
+    return status
+
+
+def apply_migrations(cursor, conn, directory=DEFAULT_DIRECTORY, progress=None):
+    """
+    Apply every migration that has not been applied yet, in version order.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        directory (str): Migration directory
+        progress: Optional callable receiving (version, name) before each migration runs
+        
+    Returns:
+        list: Versions applied by this call
+        
+    Raises:
+        Exception: If a migration fails; earlier migrations stay applied
+    """
+    try:
+        applied = _applied_migrations(cursor, conn)
+    except Exception as e:
+        raise Exception(f"Failed to read migration status:\n{str(e)}")
+    
+    newly_applied = []
+    for version, name, path in discover_migrations(directory):
+        if version in applied:
+            continue
+        if progress:
+            progress(version, name)
+        
+        sql = _read(path)
+        try:
+            if sql.startswith(NO_TRANSACTION):
+                conn.autocommit = True
+                try:
+                    for statement in _statements(sql):
+                        cursor.execute(statement)
+                finally:
+                    conn.autocommit = False
+            else:
+                cursor.execute(sql)
+            cursor.execute(f'INSERT INTO {MIGRATIONS_TABLE} (version, name, checksum) VALUES (%s, %s, %s)',
+                           (version, name, _checksum(sql)))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Migration {version:03d}_{name} failed:\n{str(e)}")
+        newly_applied.append(version)
+    return newly_applied
+
+
+def _applied_migrations(cursor, conn):
+    """Create the bookkeeping table if needed and return {version: checksum}."""
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            checksum TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+    ''')
+    cursor.execute(f'SELECT version, checksum FROM {MIGRATIONS_TABLE}')
+    applied = dict(cursor.fetchall())
+    conn.commit()
+    return applied
+
+
+def _statements(sql):
+    """Split a migration into statements, dropping comment lines."""
+    lines = [line for line in sql.splitlines() if not line.lstrip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def _read(path):
+    """Return a migration's SQL: the file's text, or the SQL string of a Python migration."""
+    if path.endswith(".py"):
+        spec = importlib.util.spec_from_file_location(f"migration_{os.path.basename(path)[:-3]}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.SQL
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def _checksum(sql):
+    """Return a digest of a migration's text, ignoring line-ending differences."""
+    return hashlib.sha256(sql.replace("\r\n", "\n").encode()).hexdigest()
@@ -0,0 +1,47 @@
+"""
+Command-line entry point for applying schema migrations.
+
+Usage:
+    python migrate_cli.py
+    python migrate_cli.py --status
+"""
+
+import argparse
+import sys
+from database import DatabaseManager
+
+
+def main(argv=None):
+    """
+    Parse arguments, then apply pending migrations or print their status.
+    
+    Returns:
+        int: Process exit code, 1 if a migration failed
+    """
+    parser = argparse.ArgumentParser(description="Apply the versioned SQL migrations in migrations/.")
+    parser.add_argument("--status", action="store_true", help="List migrations and whether they are applied")
+    args = parser.parse_args(argv)
+    
+    def report(version, name):
+        print(f"applying {version:03d}_{name}", file=sys.stderr)
+    
+    try:
+        db_manager = DatabaseManager(pooled=False, cache_size=0)
+        if args.status:
+            for version, name, applied, changed in db_manager.migration_status():
+                state = "applied" if applied else "pending"
+                if changed:
+                    state += " (file changed since applied)"
+                print(f"{version:03d}_{name}: {state}")
+        else:
+            applied = db_manager.apply_migrations(report)
+            print(f"{len(applied)} migrations applied")
+        db_manager.close()
+    except Exception as e:
+        print(f"Migration failed:\n{str(e)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Convert attribute columns from JSON to JSONB and index them with GIN.
+
+JSONB is stored pre-parsed, so attribute predicates no longer reparse
+every row. jsonb_path_ops GIN indexes serve containment (@>) and
+SQL/JSON path (@@, @?) searches used by read.find_samples.
+
+Safe to run more than once: altering a column to its current type is a
+no-op and the indexes are created only if missing. migrate.py runs the
+statements in one transaction.
+"""
+
+from config import (TABLE_PLANT_SAMPLE, TABLE_SAMPLING_LOCATION, TABLE_ENVIRONMENTAL_CONDITION,
+                    COL_SAMPLE_ATTRIBUTES, COL_LOCATION_ATTRIBUTES, COL_CONDITION_ATTRIBUTES,
+                    INDEX_SAMPLE_ATTRIBUTES, INDEX_LOCATION_ATTRIBUTES, INDEX_CONDITION_ATTRIBUTES)
+
+SQL = f'''
+ALTER TABLE "{TABLE_PLANT_SAMPLE}"
+  ALTER COLUMN "{COL_SAMPLE_ATTRIBUTES}" TYPE JSONB USING "{COL_SAMPLE_ATTRIBUTES}"::jsonb;
+  
+ALTER TABLE "{TABLE_SAMPLING_LOCATION}"
+  ALTER COLUMN "{COL_LOCATION_ATTRIBUTES}" TYPE JSONB USING "{COL_LOCATION_ATTRIBUTES}"::jsonb;
+  
+ALTER TABLE "{TABLE_ENVIRONMENTAL_CONDITION}"
+  ALTER COLUMN "{COL_CONDITION_ATTRIBUTES}" TYPE JSONB USING "{COL_CONDITION_ATTRIBUTES}"::jsonb;
+  
+CREATE INDEX IF NOT EXISTS "{INDEX_SAMPLE_ATTRIBUTES}"
+  ON "{TABLE_PLANT_SAMPLE}" USING GIN ("{COL_SAMPLE_ATTRIBUTES}" jsonb_path_ops);
+  
+CREATE INDEX IF NOT EXISTS "{INDEX_LOCATION_ATTRIBUTES}"
+  ON "{TABLE_SAMPLING_LOCATION}" USING GIN ("{COL_LOCATION_ATTRIBUTES}" jsonb_path_ops);
+  
+CREATE INDEX IF NOT EXISTS "{INDEX_CONDITION_ATTRIBUTES}"
+  ON "{TABLE_ENVIRONMENTAL_CONDITION}" USING GIN ("{COL_CONDITION_ATTRIBUTES}" jsonb_path_ops);
+'''
@@ -0,0 +1,27 @@
+"""
+Index the plant sample foreign keys.
+
+Without these, ON DELETE SET NULL on researchers and sampling locations
+scans every plant sample for each deleted row, and listing the samples of
+one researcher or location does the same. The Sample ID is the second key
+column so per-researcher and per-location listings paged by Sample ID are
+served from the index without a sort.
+
+The indexes are built CONCURRENTLY so writes continue while they build.
+If a build is interrupted, PostgreSQL leaves an INVALID index behind that
+IF NOT EXISTS would skip: drop it and run the migration again.
+"""
+
+from config import (TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_RESEARCHER_ID, COL_LOCATION_ID,
+                    INDEX_SAMPLE_RESEARCHER, INDEX_SAMPLE_LOCATION)
+
+SQL = f'''-- migrate: no-transaction
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDEX_SAMPLE_RESEARCHER}"
+  ON "{TABLE_PLANT_SAMPLE}" ("{COL_RESEARCHER_ID}", "{COL_SAMPLE_ID}");
+  
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "{INDEX_SAMPLE_LOCATION}"
+  ON "{TABLE_PLANT_SAMPLE}" ("{COL_LOCATION_ID}", "{COL_SAMPLE_ID}");
+  
+ANALYZE "{TABLE_PLANT_SAMPLE}";
+'''
@@ -0,0 +1,75 @@
+"""
+Publish plant sample changes on the CHANGE_FEED_CHANNEL.
+
+Every committed insert, update and delete sends a compact JSON payload
+that change_feed.ChangeFeed turns into row-level events, so GUI clients
+patch their tables instead of polling. Payloads are
+    
+    {"op":"I"|"U","row":[sample_id, researcher_id, location_id, attributes]}
+    {"op":"D","id":sample_id}            also I and U when the row is too large
+    {"op":"R","rows":n}                  one statement changed over 100 rows
+    
+NOTIFY payloads are limited to 8000 bytes, so a row whose attributes do
+not fit is announced by Sample ID and fetched by the listener. Bulk
+statements such as COPY imports send one reload notice instead of one
+notification per row. The triggers are statement-level with transition
+tables, which need one trigger per event. Requires PostgreSQL 11.
+
+Safe to run more than once. migrate.py runs the statements in one
+transaction.
+"""
+
+from config import (TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_RESEARCHER_ID, COL_LOCATION_ID, COL_SAMPLE_ATTRIBUTES,
+                    CHANGE_FEED_CHANNEL)
+
+SQL = f'''
+CREATE OR REPLACE FUNCTION plant_sample_notify() RETURNS trigger AS $$
+DECLARE
+  op TEXT := left(TG_OP, 1);
+  changed RECORD;
+  payload TEXT;
+  total BIGINT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    SELECT count(*) INTO total FROM old_rows;
+  ELSE
+    SELECT count(*) INTO total FROM new_rows;
+  END IF;
+  
+  IF total > 100 THEN
+    PERFORM pg_notify('{CHANGE_FEED_CHANNEL}', json_build_object('op', 'R', 'rows', total)::text);
+  ELSIF TG_OP = 'DELETE' THEN
+    FOR changed IN SELECT "{COL_SAMPLE_ID}" AS sample_id FROM old_rows LOOP
+      PERFORM pg_notify('{CHANGE_FEED_CHANNEL}', json_build_object('op', op, 'id', changed.sample_id)::text);
+    END LOOP;
+  ELSE
+    FOR changed IN SELECT "{COL_SAMPLE_ID}" AS sample_id, "{COL_RESEARCHER_ID}" AS researcher_id,
+                          "{COL_LOCATION_ID}" AS location_id, "{COL_SAMPLE_ATTRIBUTES}" AS sample_attributes
+                   FROM new_rows LOOP
+      payload := json_build_object('op', op, 'row', json_build_array(
+        changed.sample_id, changed.researcher_id, changed.location_id, changed.sample_attributes))::text;
+      IF octet_length(payload) > 7900 THEN
+        payload := json_build_object('op', op, 'id', changed.sample_id)::text;
+      END IF;
+      PERFORM pg_notify('{CHANGE_FEED_CHANNEL}', payload);
+    END LOOP;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS plant_sample_notify_insert ON "{TABLE_PLANT_SAMPLE}";
+CREATE TRIGGER plant_sample_notify_insert
+  AFTER INSERT ON "{TABLE_PLANT_SAMPLE}" REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION plant_sample_notify();
+  
+DROP TRIGGER IF EXISTS plant_sample_notify_update ON "{TABLE_PLANT_SAMPLE}";
+CREATE TRIGGER plant_sample_notify_update
+  AFTER UPDATE ON "{TABLE_PLANT_SAMPLE}" REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION plant_sample_notify();
+  
+DROP TRIGGER IF EXISTS plant_sample_notify_delete ON "{TABLE_PLANT_SAMPLE}";
+CREATE TRIGGER plant_sample_notify_delete
+  AFTER DELETE ON "{TABLE_PLANT_SAMPLE}" REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION plant_sample_notify();
+'''
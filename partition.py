@@ -0,0 +1,334 @@
+"""
+Partition module for Plant Sample CRUD Application.
+
+Converts the plant sample table into one partitioned by Sample ID range,
+keeps empty partitions ready ahead of the newest sample, and archives cold
+partitions: their rows are exported to files, then the partition is
+detached from the table and optionally dropped.
+
+The partitioned table keeps the name, columns, keys, indexes and triggers
+of the original table, so the CRUD modules run against it unchanged and
+lookups by Sample ID only touch the partition holding that ID. There is no
+default partition: inserting an explicit Sample ID above the last
+partition fails until ensure_partitions() adds one. Requires PostgreSQL 12
+(foreign keys referencing a partitioned table).
+"""
+
+import os
+import re
+from config import (TABLE_PLANT_SAMPLE, TABLE_ENVIRONMENTAL_CONDITION, COL_SAMPLE_ID, COL_CONDITION_ATTRIBUTES,
+                    PARTITION_SIZE, PARTITIONS_AHEAD, PARTITION_PREFIX, ARCHIVE_DIR, EXPORT_ITERSIZE,
+                    CHANGE_FEED_CHANNEL)
+from export import EXPORT_SELECT, write_samples
+import json_codec
+
+TABLE = f'"{TABLE_PLANT_SAMPLE}"'
+LEGACY_TABLE = f"{TABLE_PLANT_SAMPLE}_legacy"
+
+PARTITION_BOUNDS = re.compile(r"FROM \((.+)\) TO \((.+)\)")
+
+PARTITIONS_SQL = '''
+    SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint, pg_total_relation_size(c.oid)
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = %s::regclass
+'''
+
+
+def list_partitions(cursor, conn):
+    """
+    List the partitions of the plant sample table.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        
+    Returns:
+        list: Tuples of (name, start_id, end_id, estimated_rows, total_bytes)
+        ordered by start_id; a range is start_id <= Sample ID < end_id, and
+        None stands for an open end. Empty if the table is not partitioned.
+        
+    Raises:
+        Exception: If the catalog query fails
+    """
+    try:
+        partitions = _partitions(cursor)
+        conn.rollback()
+        return partitions
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to list partitions:\n{str(e)}")
+
+
+def partition_table(cursor, conn, partition_size=PARTITION_SIZE, ahead=PARTITIONS_AHEAD):
+    """
+    Convert the plant sample table into a table partitioned by Sample ID range.
+    
+    Runs in one transaction holding an exclusive lock on the table: the
+    rows are copied into partitions of partition_size IDs each, then the
+    original table is dropped and its keys, indexes, triggers and the
+    foreign keys referencing it are recreated on the partitioned table.
+    The first partition also takes every ID below partition_size.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        partition_size (int): Sample IDs per partition
+        ahead (int): Empty partitions to create above the newest Sample ID
+        
+    Returns:
+        list: Names of the partitions created
+        
+    Raises:
+        Exception: If the table is already partitioned or the conversion
+            fails; the table is then left as it was
+    """
+    try:
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+        if _is_partitioned(cursor):
+            raise Exception(f"{TABLE_PLANT_SAMPLE} is already partitioned")
+        
+        sequence = _sequence(cursor)
+        newest = _newest_id(cursor, sequence)
+        cursor.execute('SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+                       "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f', 'c') "
+                       "ORDER BY contype <> 'p'", (TABLE,))
+        constraints = cursor.fetchall()
+        cursor.execute('SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint '
+                       "WHERE confrelid = %s::regclass AND contype = 'f'", (TABLE,))
+        references = cursor.fetchall()
+        cursor.execute('''
+            SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i
+            WHERE i.indrelid = %s::regclass AND NOT EXISTS (
+                SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid AND c.contype IN ('p', 'u', 'x'))
+        ''', (TABLE,))
+        indexes = [row[0] for row in cursor.fetchall()]
+        cursor.execute('SELECT pg_get_triggerdef(oid) FROM pg_trigger WHERE tgrelid = %s::regclass AND NOT tgisinternal',
+                       (TABLE,))
+        triggers = [row[0] for row in cursor.fetchall()]
+        
+        for table, name, _ in references:
+            cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO "{LEGACY_TABLE}"')
+        cursor.execute(f'''
+            CREATE TABLE {TABLE} (LIKE "{LEGACY_TABLE}" INCLUDING DEFAULTS INCLUDING STORAGE INCLUDING COMMENTS)
+            PARTITION BY RANGE ("{COL_SAMPLE_ID}")
+        ''')
+        created = _create_partitions(cursor, newest, partition_size, ahead)
+        cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM "{LEGACY_TABLE}"')
+        if sequence is not None:
+            cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {TABLE}."{COL_SAMPLE_ID}"')
+        cursor.execute(f'DROP TABLE "{LEGACY_TABLE}"')
+        
+        # The definitions were read under the original table name, which now
+        # belongs to the partitioned table.
+        for name, definition in constraints:
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" {definition}')
+        for statement in indexes + triggers:
+            cursor.execute(statement)
+        for table, name, definition in references:
+            cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+        cursor.execute(f'ANALYZE {TABLE}')
+        conn.commit()
+        return created
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to partition {TABLE_PLANT_SAMPLE}:\n{str(e)}")
+
+
+def ensure_partitions(cursor, conn, partition_size=PARTITION_SIZE, ahead=PARTITIONS_AHEAD):
+    """
+    Create partitions until `ahead` empty ones lie above the newest Sample ID.
+    
+    Run this periodically (see partition_cli.py extend) so new samples
+    always have a partition to go to.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        partition_size (int): Sample IDs per new partition
+        ahead (int): Empty partitions to keep above the newest Sample ID
+        
+    Returns:
+        list: Names of the partitions created
+        
+    Raises:
+        Exception: If the table is not partitioned or a partition cannot be created
+    """
+    try:
+        if not _is_partitioned(cursor):
+            raise Exception(f"{TABLE_PLANT_SAMPLE} is not partitioned; run partition_cli.py convert first")
+        cursor.execute(f'LOCK TABLE {TABLE} IN SHARE UPDATE EXCLUSIVE MODE')
+        created = _create_partitions(cursor, _newest_id(cursor, _sequence(cursor)), partition_size, ahead)
+        conn.commit()
+        return created
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to add partitions:\n{str(e)}")
+
+
+def archive_partitions(cursor, conn, before_id, directory=ARCHIVE_DIR, file_format="jsonl", drop=False,
+                       progress=None, itersize=EXPORT_ITERSIZE):
+    """
+    Export and detach every partition whose Sample IDs all lie below before_id.
+    
+    Each partition is archived in its own transaction. Its samples are
+    written to ``<partition>.<format>`` in directory, in the export.py
+    layout, and their environmental conditions to
+    ``<partition>_conditions.jsonl``. The conditions are then removed (kept
+    in a ``<partition>_conditions`` table unless drop is set) and the
+    partition is detached, or dropped if drop is set. Writes to the
+    partition are blocked while it is exported; other partitions stay
+    available. Clients listening on the change feed are told to reload.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        before_id (int): Archive partitions ending at or below this Sample ID
+        directory (str): Directory for the archive files, created if needed
+        file_format (str): "jsonl", "csv" or "parquet" for the samples file
+        drop (bool): Drop the detached partition instead of keeping it as a table
+        progress: Optional callable receiving (partition, rows_written)
+        itersize (int): Rows fetched from the server per round trip
+        
+    Returns:
+        list: Tuples of (partition, rows, path) for each archived partition
+        
+    Raises:
+        Exception: If the table is not partitioned, an archive file already
+            exists or archiving fails; partitions archived before the failure
+            stay archived
+    """
+    try:
+        if not _is_partitioned(cursor):
+            raise Exception(f"{TABLE_PLANT_SAMPLE} is not partitioned")
+        cold = [name for name, _, end, _, _ in _partitions(cursor) if end is not None and end <= before_id]
+        conn.rollback()
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to archive partitions:\n{str(e)}")
+    
+    os.makedirs(directory, exist_ok=True)
+    archived = []
+    for name in cold:
+        path = os.path.join(directory, f"{name}.{file_format}")
+        conditions_path = os.path.join(directory, f"{name}_conditions.jsonl")
+        written = []
+        try:
+            for existing in (path, conditions_path):
+                if os.path.exists(existing):
+                    raise Exception(f"{existing} already exists")
+            cursor.execute(f'LOCK TABLE "{name}" IN SHARE MODE')
+            
+            report = (lambda count: progress(name, count)) if progress else None
+            written.append(path)
+            rows = write_samples(_stream(conn, f'SELECT {EXPORT_SELECT} FROM "{name}" ORDER BY "{COL_SAMPLE_ID}"', itersize),
+                                 path, file_format, itersize, report)
+            written.append(conditions_path)
+            _write_conditions(_stream(conn, f'''
+                SELECT c."{COL_SAMPLE_ID}", c."{COL_CONDITION_ATTRIBUTES}"
+                FROM "{TABLE_ENVIRONMENTAL_CONDITION}" c JOIN "{name}" s USING ("{COL_SAMPLE_ID}")
+                ORDER BY c."{COL_SAMPLE_ID}"
+            ''', itersize), conditions_path)
+            
+            if not drop:
+                cursor.execute(f'''
+                    CREATE TABLE "{name}_conditions" AS
+                    SELECT c.* FROM "{TABLE_ENVIRONMENTAL_CONDITION}" c JOIN "{name}" s USING ("{COL_SAMPLE_ID}")
+                ''')
+            cursor.execute(f'''
+                DELETE FROM "{TABLE_ENVIRONMENTAL_CONDITION}" c USING "{name}" s
+                WHERE c."{COL_SAMPLE_ID}" = s."{COL_SAMPLE_ID}"
+            ''')
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION "{name}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{name}"')
+            cursor.execute("SELECT pg_notify(%s, %s)", (CHANGE_FEED_CHANNEL, json_codec.dumps({"op": "R", "rows": rows})))
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            for leftover in written:
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            raise Exception(f"Failed to archive partition {name}:\n{str(e)}")
+        archived.append((name, rows, path))
+    return archived
+
+
+def _is_partitioned(cursor):
+    """Return True if the plant sample table is a partitioned table."""
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = %s::regclass", (TABLE,))
+    return cursor.fetchone()[0] == "p"
+
+
+def _partitions(cursor):
+    """Return the partitions of the plant sample table; see list_partitions."""
+    cursor.execute(PARTITIONS_SQL, (TABLE,))
+    partitions = []
+    for name, bounds, rows, size in cursor.fetchall():
+        match = PARTITION_BOUNDS.search(bounds)
+        start, end = (None if bound in ("MINVALUE", "MAXVALUE") else int(bound.strip("'")) for bound in match.groups())
+        partitions.append((name, start, end, max(rows, 0), size))
+    partitions.sort(key=lambda partition: (partition[1] is not None, partition[1]))
+    return partitions
+
+
+def _sequence(cursor):
+    """Return the qualified name of the Sample ID sequence, or None if the column has none."""
+    cursor.execute("SELECT pg_get_serial_sequence(%s, %s)", (TABLE, COL_SAMPLE_ID))
+    return cursor.fetchone()[0]
+
+
+def _newest_id(cursor, sequence):
+    """Return the highest Sample ID stored or handed out by the sequence."""
+    cursor.execute(f'SELECT COALESCE(MAX("{COL_SAMPLE_ID}"), 0) FROM {TABLE}')
+    newest = cursor.fetchone()[0]
+    if sequence is not None:
+        cursor.execute(f"SELECT last_value FROM {sequence}")
+        newest = max(newest, cursor.fetchone()[0])
+    return newest
+
+
+def _create_partitions(cursor, newest, partition_size, ahead):
+    """
+    Add range partitions above the existing ones up to newest plus `ahead` partitions.
+    
+    Returns:
+        list: Names of the partitions created
+    """
+    partitions = _partitions(cursor)
+    created = []
+    if not partitions:
+        name = f"{PARTITION_PREFIX}0"
+        cursor.execute(f'CREATE TABLE "{name}" PARTITION OF {TABLE} FOR VALUES FROM (MINVALUE) TO ({partition_size})')
+        created.append(name)
+        top = partition_size
+    else:
+        top = partitions[-1][2]
+        if top is None:
+            return created
+    
+    while top <= newest + ahead * partition_size:
+        name = f"{PARTITION_PREFIX}{top}"
+        cursor.execute(f'CREATE TABLE "{name}" PARTITION OF {TABLE} FOR VALUES FROM ({top}) TO ({top + partition_size})')
+        created.append(name)
+        top += partition_size
+    return created
+
+
+def _stream(conn, sql, itersize):
+    """Yield the rows of a query through a named (server-side) cursor."""
+    server_cursor = conn.cursor(name="plant_sample_archive")
+    server_cursor.itersize = itersize
+    try:
+        server_cursor.execute(sql)
+        yield from server_cursor
+    finally:
+        server_cursor.close()
+
+
+def _write_conditions(rows, path):
+    """Write (sample_id, condition_attributes) rows as JSON Lines."""
+    with open(path, "w", encoding="utf-8") as file:
+        for sample_id, attributes in rows:
+            file.write(json_codec.dumps({COL_SAMPLE_ID: sample_id, COL_CONDITION_ATTRIBUTES: attributes or {}}) + "\n")
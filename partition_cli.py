@@ -0,0 +1,78 @@
+"""
+Command-line entry point for partitioning and archiving plant samples.
+
+Usage:
+    python partition_cli.py convert --size 1000000
+    python partition_cli.py status
+    python partition_cli.py extend
+    python partition_cli.py archive --before 5000000 --output-dir archive --drop
+"""
+
+import argparse
+import sys
+from config import PARTITION_SIZE, PARTITIONS_AHEAD, ARCHIVE_DIR
+from database import DatabaseManager
+from export import EXPORT_FORMATS
+
+
+def main(argv=None):
+    """
+    Parse arguments and run one partition command.
+    
+    Returns:
+        int: Process exit code, 1 if the command failed
+    """
+    parser = argparse.ArgumentParser(description="Partition the plant sample table by Sample ID and archive old partitions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    for name, help_text in (("convert", "Convert the table into Sample ID range partitions"),
+                            ("extend", "Add partitions ahead of the newest Sample ID")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--size", type=int, default=PARTITION_SIZE,
+                             help=f"Sample IDs per partition (default: {PARTITION_SIZE})")
+        command.add_argument("--ahead", type=int, default=PARTITIONS_AHEAD,
+                             help=f"Empty partitions to keep above the newest Sample ID (default: {PARTITIONS_AHEAD})")
+    
+    commands.add_parser("status", help="List the partitions")
+    
+    archive = commands.add_parser("archive", help="Export and detach partitions below a Sample ID")
+    archive.add_argument("--before", type=int, required=True, help="Archive partitions ending at or below this Sample ID")
+    archive.add_argument("--output-dir", default=ARCHIVE_DIR, help=f"Directory for archive files (default: {ARCHIVE_DIR})")
+    archive.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl", help="Samples file format (default: jsonl)")
+    archive.add_argument("--drop", action="store_true", help="Drop archived partitions instead of keeping them detached")
+    args = parser.parse_args(argv)
+    
+    def report(partition, rows_written):
+        print(f"\r{partition}: {rows_written} rows written", end="", file=sys.stderr)
+    
+    try:
+        db_manager = DatabaseManager(pooled=False, cache_size=0)
+        if args.command == "convert":
+            created = db_manager.partition_table(args.size, args.ahead)
+            print(f"table partitioned into {len(created)} partitions")
+        elif args.command == "extend":
+            created = db_manager.ensure_partitions(args.size, args.ahead)
+            print(f"{len(created)} partitions added" + (f": {', '.join(created)}" if created else ""))
+        elif args.command == "status":
+            partitions = db_manager.list_partitions()
+            if not partitions:
+                print("table is not partitioned")
+            for name, start, end, rows, size in partitions:
+                low = "MINVALUE" if start is None else start
+                high = "MAXVALUE" if end is None else end
+                print(f"{name}: {low} to {high}, ~{rows} rows, {size / 1048576:.1f} MiB")
+        else:
+            archived = db_manager.archive_partitions(args.before, args.output_dir, args.format, args.drop, report)
+            print(file=sys.stderr)
+            for name, rows, path in archived:
+                print(f"{name}: {rows} samples archived to {path}")
+            print(f"{len(archived)} partitions archived")
+        db_manager.close()
+    except Exception as e:
+        print(f"\nPartition command failed:\n{str(e)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
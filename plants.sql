@@ -1,26 +1,77 @@
-
-CREATE TABLE researcher (
-  researcher_id SERIAL PRIMARY KEY,
-  name VARCHAR(50),
-  email VARCHAR(50),
-  phone VARCHAR(50),
-  affiliation VARCHAR(50)
-);
-
-CREATE TABLE sampling_location (
-  location_id SERIAL PRIMARY KEY,
-  location_attributes JSON
-);
-
-CREATE TABLE plant_sample (
-  sample_id SERIAL PRIMARY KEY,
-  sample_attributes JSON,
-  researcher_id INTEGER REFERENCES researcher(researcher_id) ON DELETE SET NULL,
-  location_id INTEGER REFERENCES sampling_location(location_id) ON DELETE SET NULL
-);
-
-CREATE TABLE environmental_condition (
-  sample_id INTEGER PRIMARY KEY REFERENCES plant_sample(sample_id) ON DELETE CASCADE,
-  condition_attributes JSON
-);
-
+
+CREATE TABLE "Researcher" (
+  "Researcher ID" SERIAL PRIMARY KEY,
+  "Name" VARCHAR(50),
+  "Email" VARCHAR(50),
+  "Phone" VARCHAR(50),
+  "Affiliation" VARCHAR(50)
+);
+
+CREATE TABLE "Sampling Location" (
+  "Location ID" SERIAL PRIMARY KEY,
+  "Location Attributes" JSONB
+);
+
+CREATE TABLE "Plant Sample" (
+  "Sample ID" SERIAL PRIMARY KEY,
+  "Sample Attributes" JSONB,
+  "Researcher ID" INTEGER REFERENCES "Researcher"("Researcher ID") ON DELETE SET NULL,
+  "Location ID" INTEGER REFERENCES "Sampling Location"("Location ID") ON DELETE SET NULL
+);
+
+CREATE TABLE "Environmental Condition" (
+  "Sample ID" INTEGER PRIMARY KEY REFERENCES "Plant Sample"("Sample ID") ON DELETE CASCADE,
+  "Condition Attributes" JSONB
+);
+
+CREATE INDEX plant_sample_researcher_id_idx ON "Plant Sample" ("Researcher ID", "Sample ID");
+CREATE INDEX plant_sample_location_id_idx ON "Plant Sample" ("Location ID", "Sample ID");
+CREATE INDEX plant_sample_attributes_gin ON "Plant Sample" USING GIN ("Sample Attributes" jsonb_path_ops);
+CREATE INDEX sampling_location_attributes_gin ON "Sampling Location" USING GIN ("Location Attributes" jsonb_path_ops);
+CREATE INDEX environmental_condition_attributes_gin ON "Environmental Condition" USING GIN ("Condition Attributes" jsonb_path_ops);
+
+CREATE OR REPLACE FUNCTION plant_sample_notify() RETURNS trigger AS $$
+DECLARE
+  op TEXT := left(TG_OP, 1);
+  changed RECORD;
+  payload TEXT;
+  total BIGINT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    SELECT count(*) INTO total FROM old_rows;
+  ELSE
+    SELECT count(*) INTO total FROM new_rows;
+  END IF;
+
+  IF total > 100 THEN
+    PERFORM pg_notify('plant_sample_changes', json_build_object('op', 'R', 'rows', total)::text);
+  ELSIF TG_OP = 'DELETE' THEN
+    FOR changed IN SELECT "Sample ID" AS sample_id FROM old_rows LOOP
+      PERFORM pg_notify('plant_sample_changes', json_build_object('op', op, 'id', changed.sample_id)::text);
+    END LOOP;
+  ELSE
+    FOR changed IN SELECT "Sample ID" AS sample_id, "Researcher ID" AS researcher_id, "Location ID" AS location_id,
+                          "Sample Attributes" AS sample_attributes FROM new_rows LOOP
+      payload := json_build_object('op', op, 'row', json_build_array(
+        changed.sample_id, changed.researcher_id, changed.location_id, changed.sample_attributes))::text;
+      IF octet_length(payload) > 7900 THEN
+        payload := json_build_object('op', op, 'id', changed.sample_id)::text;
+      END IF;
+      PERFORM pg_notify('plant_sample_changes', payload);
+    END LOOP;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER plant_sample_notify_insert
+  AFTER INSERT ON "Plant Sample" REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION plant_sample_notify();
+
+CREATE TRIGGER plant_sample_notify_update
+  AFTER UPDATE ON "Plant Sample" REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION plant_sample_notify();
+
+CREATE TRIGGER plant_sample_notify_delete
+  AFTER DELETE ON "Plant Sample" REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION plant_sample_notify();
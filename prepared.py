@@ -0,0 +1,101 @@
+"""
+Prepared statement module for Plant Sample CRUD Application.
+
+Provides PreparedStatement, which holds SQL text built once at import time
+and runs it through server-side PREPARE/EXECUTE, and PreparingConnection,
+a psycopg2 connection class that remembers which statements have been
+prepared in its session.
+"""
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+
+
+def to_positional(sql):
+    """
+    Convert psycopg2 ``%s`` placeholders to PostgreSQL ``$1, $2, ...``.
+    
+    Args:
+        sql (str): Statement with ``%s`` placeholders
+        
+    Returns:
+        str: Statement with positional placeholders
+    """
+    for index in range(1, sql.count('%s') + 1):
+        sql = sql.replace('%s', f'${index}', 1)
+    return sql
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """
+    psycopg2 connection that tracks the statements prepared on it.
+    
+    Pass as ``connection_factory`` to psycopg2.connect or a pool. Prepared
+    statements live for the session, so the set is per connection and is
+    discarded with it.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+class PreparedStatement:
+    """
+    SQL statement prepared once per connection and executed by name.
+    
+    The statement is written with psycopg2 ``%s`` placeholders; the
+    PREPARE and EXECUTE texts, and a ``$n`` positional form for drivers
+    that take it directly, are derived from it when the object is created.
+    On connections that are not PreparingConnection instances the plain
+    SQL is executed instead, so callers work with any connection.
+    """
+    
+    def __init__(self, name, sql):
+        """
+        Build the PREPARE and EXECUTE texts.
+        
+        Args:
+            name (str): Server-side statement name, unique per application
+            sql (str): Statement with ``%s`` placeholders
+        """
+        self.name = name
+        self.sql = sql
+        self.param_count = sql.count('%s')
+        
+        self.positional_sql = to_positional(sql)
+        self.prepare_sql = f'PREPARE {name} AS {self.positional_sql}'
+        
+        if self.param_count:
+            self.execute_sql = f'EXECUTE {name} ({", ".join(["%s"] * self.param_count)})'
+        else:
+            self.execute_sql = f'EXECUTE {name}'
+    
+    def execute(self, cursor, conn, params=()):
+        """
+        Execute the statement, preparing it on this connection first if needed.
+        
+        If the server no longer knows the statement (for example because the
+        PREPARE was rolled back with a failed transaction) the transaction is
+        rolled back and the statement is prepared again once.
+        
+        Args:
+            cursor: Database cursor
+            conn: Database connection
+            params (tuple): Statement parameters
+        """
+        prepared = getattr(conn, 'prepared', None)
+        if prepared is None:
+            cursor.execute(self.sql, params)
+            return
+        
+        if self.name not in prepared:
+            cursor.execute(self.prepare_sql)
+            prepared.add(self.name)
+        try:
+            cursor.execute(self.execute_sql, params)
+        except psycopg2.errors.InvalidSqlStatementName:
+            conn.rollback()
+            cursor.execute(self.prepare_sql)
+            cursor.execute(self.execute_sql, params)
@@ -1,57 +1,351 @@
-"""
-Read operation module for Plant Sample CRUD Application.
-
-Handles SELECT operations for querying plant samples from the database.
-"""
-
-from config import TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID
-
-
-def query_sample(cursor, conn, sample_id):
-    """
-    Query a specific plant sample by its ID.
-    
-    Args:
-        cursor: Database cursor
-        conn: Database connection
-        sample_id (str): Unique identifier for the sample
-        
-    Returns:
-        tuple: (sample_id, sample_attributes, researcher_id, location_id) or None
-        
-    Raises:
-        Exception: If database query fails
-    """
-    try:
-        cursor.execute(f'''
-            SELECT "{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}"
-            FROM "{TABLE_PLANT_SAMPLE}"
-            WHERE "{COL_SAMPLE_ID}" = %s
-        ''', (sample_id,))
-        
-        result = cursor.fetchone()
-        return result
-    except Exception as e:
-        raise Exception(f"Query failed: {str(e)}")
-
-
-def get_all_samples(cursor, conn):
-    """
-    Retrieve all plant samples from the database.
-    
-    Args:
-        cursor: Database cursor
-        conn: Database connection
-        
-    Returns:
-        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
-        
-    Raises:
-        Exception: If database query fails
-    """
-    try:
-        cursor.execute(f'SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}" FROM "{TABLE_PLANT_SAMPLE}"')
-        rows = cursor.fetchall()
-        return rows
-    except Exception as e:
-        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+"""
+Read operation module for Plant Sample CRUD Application.
+
+Handles SELECT operations for querying plant samples from the database.
+"""
+
+from config import (TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, PAGE_SIZE, READ_ITERSIZE,
+                    TABLE_RESEARCHER, COL_RESEARCHER_NAME, COL_RESEARCHER_EMAIL, COL_RESEARCHER_PHONE, COL_RESEARCHER_AFFILIATION,
+                    TABLE_SAMPLING_LOCATION, COL_LOCATION_ATTRIBUTES, TABLE_ENVIRONMENTAL_CONDITION, COL_CONDITION_ATTRIBUTES)
+from prepared import PreparedStatement
+from sample_model import SampleColumns
+import json_codec
+
+SELECT_SAMPLE = PreparedStatement("plant_sample_select", f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ID}" = %s
+''')
+
+SELECT_ALL_SAMPLES = PreparedStatement("plant_sample_select_all", f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"::text
+    FROM "{TABLE_PLANT_SAMPLE}"
+''')
+
+FIRST_PAGE_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    ORDER BY "{COL_SAMPLE_ID}"
+    LIMIT %s
+'''
+
+PAGE_AFTER_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ID}" > %s
+    ORDER BY "{COL_SAMPLE_ID}"
+    LIMIT %s
+'''
+
+PAGE_BEFORE_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ID}" < %s
+    ORDER BY "{COL_SAMPLE_ID}" DESC
+    LIMIT %s
+'''
+
+SAMPLE_DETAIL_SQL = f'''
+    SELECT json_build_object(
+        '{COL_SAMPLE_ID}', s."{COL_SAMPLE_ID}",
+        '{COL_SAMPLE_ATTRIBUTES}', COALESCE(s."{COL_SAMPLE_ATTRIBUTES}", '{{}}'::jsonb),
+        '{COL_RESEARCHER_ID}', s."{COL_RESEARCHER_ID}",
+        '{COL_LOCATION_ID}', s."{COL_LOCATION_ID}",
+        '{TABLE_RESEARCHER}', CASE WHEN r."{COL_RESEARCHER_ID}" IS NOT NULL THEN json_build_object(
+            '{COL_RESEARCHER_ID}', r."{COL_RESEARCHER_ID}",
+            '{COL_RESEARCHER_NAME}', r."{COL_RESEARCHER_NAME}",
+            '{COL_RESEARCHER_EMAIL}', r."{COL_RESEARCHER_EMAIL}",
+            '{COL_RESEARCHER_PHONE}', r."{COL_RESEARCHER_PHONE}",
+            '{COL_RESEARCHER_AFFILIATION}', r."{COL_RESEARCHER_AFFILIATION}"
+        ) END,
+        '{TABLE_SAMPLING_LOCATION}', CASE WHEN l."{COL_LOCATION_ID}" IS NOT NULL THEN json_build_object(
+            '{COL_LOCATION_ID}', l."{COL_LOCATION_ID}",
+            '{COL_LOCATION_ATTRIBUTES}', COALESCE(l."{COL_LOCATION_ATTRIBUTES}", '{{}}'::jsonb)
+        ) END,
+        '{TABLE_ENVIRONMENTAL_CONDITION}', e."{COL_CONDITION_ATTRIBUTES}"
+    )
+    FROM "{TABLE_PLANT_SAMPLE}" s
+    LEFT JOIN "{TABLE_RESEARCHER}" r ON r."{COL_RESEARCHER_ID}" = s."{COL_RESEARCHER_ID}"
+    LEFT JOIN "{TABLE_SAMPLING_LOCATION}" l ON l."{COL_LOCATION_ID}" = s."{COL_LOCATION_ID}"
+    LEFT JOIN "{TABLE_ENVIRONMENTAL_CONDITION}" e ON e."{COL_SAMPLE_ID}" = s."{COL_SAMPLE_ID}"
+'''
+
+SELECT_SAMPLE_DETAIL = PreparedStatement("plant_sample_select_detail", SAMPLE_DETAIL_SQL + f'''
+    WHERE s."{COL_SAMPLE_ID}" = %s
+''')
+
+DETAIL_FIRST_PAGE_SQL = SAMPLE_DETAIL_SQL + f'''
+    ORDER BY s."{COL_SAMPLE_ID}"
+    LIMIT %s
+'''
+
+DETAIL_PAGE_AFTER_SQL = SAMPLE_DETAIL_SQL + f'''
+    WHERE s."{COL_SAMPLE_ID}" > %s
+    ORDER BY s."{COL_SAMPLE_ID}"
+    LIMIT %s
+'''
+
+
+def query_sample(cursor, conn, sample_id):
+    """
+    Query a specific plant sample by its ID.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        sample_id (str): Unique identifier for the sample
+        
+    Returns:
+        tuple: (sample_id, sample_attributes, researcher_id, location_id) or None
+        
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        SELECT_SAMPLE.execute(cursor, conn, (sample_id,))
+        
+        result = cursor.fetchone()
+        return result
+    except Exception as e:
+        raise Exception(f"Query failed: {str(e)}")
+
+
+def query_sample_detail(cursor, conn, sample_id):
+    """
+    Query a plant sample together with its researcher, location and environmental conditions.
+    
+    The document is built server-side by one joined query, so no further
+    round trips are needed for the related rows. Related objects are null
+    when the sample has no such row.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        sample_id (str): Unique identifier for the sample
+        
+    Returns:
+        dict: Sample document with nested Researcher, Sampling Location and
+        Environmental Condition entries, or None if the sample does not exist
+        
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        SELECT_SAMPLE_DETAIL.execute(cursor, conn, (sample_id,))
+        
+        result = cursor.fetchone()
+        return result[0] if result else None
+    except Exception as e:
+        raise Exception(f"Query failed: {str(e)}")
+
+
+def list_sample_details(cursor, conn, after_id=None, limit=PAGE_SIZE):
+    """
+    Retrieve one page of sample detail documents ordered by Sample ID.
+    
+    Uses the same joined query as query_sample_detail with keyset
+    pagination, so a page costs one round trip regardless of its size.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        after_id: Last Sample ID of the previous page, or None for the first page
+        limit (int): Maximum number of documents to return
+        
+    Returns:
+        list: Sample detail documents (dict)
+        
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        if after_id is None:
+            cursor.execute(DETAIL_FIRST_PAGE_SQL, (limit,))
+        else:
+            cursor.execute(DETAIL_PAGE_AFTER_SQL, (after_id, limit))
+        return [row[0] for row in cursor.fetchall()]
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+
+
+def get_all_samples(cursor, conn):
+    """
+    Retrieve all plant samples from the database.
+    
+    The rows are read through a named (server-side) cursor, READ_ITERSIZE
+    at a time, as export_samples does, and the attributes are fetched as
+    JSON text and kept undecoded in a SampleColumns. Neither the client
+    library nor this function holds the fetched tuples of the whole table
+    at once.
+    
+    Args:
+        cursor: Database cursor (unused; a named cursor is opened on conn)
+        conn: Database connection
+        
+    Returns:
+        SampleColumns: Rows of (sample_id, researcher_id, location_id, sample_attributes)
+        
+    Raises:
+        Exception: If database query fails
+    """
+    server_cursor = conn.cursor(name="plant_sample_read_all")
+    server_cursor.itersize = READ_ITERSIZE
+    try:
+        server_cursor.execute(SELECT_ALL_SAMPLES.sql)
+        samples = SampleColumns()
+        rows = server_cursor.fetchmany(READ_ITERSIZE)
+        while rows:
+            samples.extend(rows)
+            rows = server_cursor.fetchmany(READ_ITERSIZE)
+        return samples
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+    finally:
+        server_cursor.close()
+        conn.rollback()
+
+
+def get_samples_page(cursor, conn, after_id=None, limit=PAGE_SIZE):
+    """
+    Retrieve one page of plant samples ordered by Sample ID.
+    
+    Uses keyset pagination: the page starts strictly after ``after_id``
+    instead of using OFFSET, so the cost of a page does not grow with its
+    position in the table.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        after_id: Last Sample ID of the previous page, or None for the first page
+        limit (int): Maximum number of rows to return
+        
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        if after_id is None:
+            cursor.execute(FIRST_PAGE_SQL, (limit,))
+        else:
+            cursor.execute(PAGE_AFTER_SQL, (after_id, limit))
+        return cursor.fetchall()
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+
+
+def get_samples_page_before(cursor, conn, before_id, limit=PAGE_SIZE):
+    """
+    Retrieve the page of plant samples immediately preceding a Sample ID.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        before_id: First Sample ID of the following page
+        limit (int): Maximum number of rows to return
+        
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes),
+        in ascending Sample ID order
+        
+    Raises:
+        Exception: If database query fails
+    """
+    try:
+        cursor.execute(PAGE_BEFORE_SQL, (before_id, limit))
+        rows = cursor.fetchall()
+        rows.reverse()
+        return rows
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+
+
+def find_samples(cursor, conn, attr_filter, after_id=None, limit=PAGE_SIZE):
+    """
+    Find plant samples whose attributes match a filter, ordered by Sample ID.
+    
+    A dict filter is matched with JSONB containment (``@>``), e.g.
+    ``{"species": "Quercus robur"}``. A string filter is evaluated as a
+    SQL/JSON path predicate (``@@``), e.g. ``$.height_cm > 100``. Both are
+    served by the GIN index on the attribute column.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        attr_filter (dict or str): Containment document or JSON path predicate
+        after_id: Last Sample ID of the previous page, or None for the first page
+        limit (int): Maximum number of rows to return
+        
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+        
+    Raises:
+        Exception: If database query fails
+    """
+    condition, params = _attribute_condition(attr_filter)
+    if after_id is not None:
+        condition += f' AND "{COL_SAMPLE_ID}" > %s'
+        params.append(after_id)
+    
+    try:
+        cursor.execute(f'''
+            SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+            FROM "{TABLE_PLANT_SAMPLE}"
+            WHERE {condition}
+            ORDER BY "{COL_SAMPLE_ID}"
+            LIMIT %s
+        ''', (*params, limit))
+        return cursor.fetchall()
+    except Exception as e:
+        raise Exception(f"Attribute search failed:\n{str(e)}")
+
+
+def find_samples_before(cursor, conn, attr_filter, before_id, limit=PAGE_SIZE):
+    """
+    Find the page of matching plant samples immediately preceding a Sample ID.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        attr_filter (dict or str): Containment document or JSON path predicate
+        before_id: First Sample ID of the following page
+        limit (int): Maximum number of rows to return
+        
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes),
+        in ascending Sample ID order
+        
+    Raises:
+        Exception: If database query fails
+    """
+    condition, params = _attribute_condition(attr_filter)
+    
+    try:
+        cursor.execute(f'''
+            SELECT "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+            FROM "{TABLE_PLANT_SAMPLE}"
+            WHERE {condition} AND "{COL_SAMPLE_ID}" < %s
+            ORDER BY "{COL_SAMPLE_ID}" DESC
+            LIMIT %s
+        ''', (*params, before_id, limit))
+        rows = cursor.fetchall()
+        rows.reverse()
+        return rows
+    except Exception as e:
+        raise Exception(f"Attribute search failed:\n{str(e)}")
+
+
+def _attribute_condition(attr_filter):
+    """
+    Build the WHERE condition for an attribute filter.
+    
+    Args:
+        attr_filter (dict or str): Containment document or JSON path predicate
+        
+    Returns:
+        tuple: (condition: str, params: list)
+    """
+    if isinstance(attr_filter, dict):
+        return f'"{COL_SAMPLE_ATTRIBUTES}" @> %s::jsonb', [json_codec.dumps(attr_filter)]
+    return f'"{COL_SAMPLE_ATTRIBUTES}" @@ %s::jsonpath', [attr_filter]
@@ -0,0 +1,505 @@
+"""
+Sample model module for Plant Sample CRUD Application.
+
+Provides SampleModel, an in-memory store of loaded sample rows that the
+table sorts and searches without querying the database. Rows are kept in
+columns: IDs in int64 arrays and attributes as undecoded JSON text, decoded
+only when a row is read. Per-column sort indexes and a token index over
+attribute text are maintained as rows are added, changed and removed.
+
+Also provides SampleColumns, the equally compact container returned by
+get_all_samples.
+"""
+
+import re
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate, compress, islice
+import json_codec
+
+SAMPLE_ID, RESEARCHER_ID, LOCATION_ID, SAMPLE_ATTRIBUTES = range(4)
+
+# Stored in the ID arrays for a NULL Researcher or Location ID; sorts first.
+MISSING_ID = -2 ** 63
+
+WORD = re.compile(r"[^\W_]+")
+
+DENSE_WORD_FRACTION = 64
+WORD_MASK_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=65536)
+def _words(text):
+    """Return the lower-cased, non-numeric words of one string value."""
+    return frozenset(word for word in WORD.findall(text.lower()) if not word.isdigit())
+
+
+def attribute_tokens(attributes):
+    """
+    Return the searchable words of an attribute document.
+    
+    Args:
+        attributes: Decoded attribute JSON, or None
+        
+    Returns:
+        set: Lower-cased words found in string values; keys and purely
+        numeric words are left out, since nearly every row has them
+    """
+    words = set()
+    values = [attributes]
+    for value in values:
+        kind = type(value)
+        if kind is str:
+            words |= _words(value)
+        elif kind is dict:
+            values.extend(value.values())
+        elif kind is list:
+            values.extend(value)
+    return words
+
+
+def _attribute_key(text):
+    """Sort key for the attributes column: the stored JSON text, empty documents first."""
+    return b"" if text is None or text == b"{}" else text
+
+
+def _encode(attributes):
+    """Return decoded attributes as stored JSON text (bytes), keeping None."""
+    return json_codec.dumps(attributes).encode() if attributes is not None else None
+
+
+def _decode(text):
+    """Decode stored JSON text, keeping None."""
+    return json_codec.loads(text) if text is not None else None
+
+
+def _nullable(value):
+    """Return a stored ID, or None for MISSING_ID."""
+    return None if value == MISSING_ID else value
+
+
+class SampleColumns:
+    """
+    Compact, column-oriented sample rows as read from the database.
+    
+    IDs are kept in int64 arrays and the attribute documents as undecoded
+    JSON text, concatenated into one buffer with an array of end offsets.
+    A row costs 32 bytes plus its JSON text, where a fetched tuple costs a
+    tuple, three int objects and a decoded dict. Indexing and iteration
+    return (sample_id, researcher_id, location_id, sample_attributes)
+    tuples like the paged reads, decoding the attributes of each row read;
+    raw_rows() leaves them as JSON text.
+    """
+    
+    def __init__(self, rows=()):
+        """
+        Initialize the container.
+        
+        Args:
+            rows: Iterable of (sample_id, researcher_id, location_id, attributes_json),
+                the JSON as str or bytes, or None
+        """
+        self.sample_ids = array('q')
+        self.researcher_ids = array('q')
+        self.location_ids = array('q')
+        self._text = bytearray()
+        self._ends = array('Q')
+        self.extend(rows)
+    
+    def __len__(self):
+        return len(self.sample_ids)
+    
+    def __getitem__(self, index):
+        """Return one row with its attributes decoded."""
+        sample_id, researcher_id, location_id, text = self.raw_row(index)
+        return sample_id, researcher_id, location_id, _decode(text)
+    
+    def __iter__(self):
+        for sample_id, researcher_id, location_id, text in self.raw_rows():
+            yield sample_id, researcher_id, location_id, _decode(text)
+    
+    def extend(self, rows):
+        """
+        Append rows.
+        
+        Args:
+            rows: Iterable of (sample_id, researcher_id, location_id, attributes_json)
+        """
+        for sample_id, researcher_id, location_id, attributes_json in rows:
+            self.sample_ids.append(sample_id)
+            self.researcher_ids.append(MISSING_ID if researcher_id is None else researcher_id)
+            self.location_ids.append(MISSING_ID if location_id is None else location_id)
+            if attributes_json is not None:
+                self._text += attributes_json.encode() if isinstance(attributes_json, str) else attributes_json
+            self._ends.append(len(self._text))
+    
+    def raw_row(self, index):
+        """
+        Return one row without decoding its attributes.
+        
+        Args:
+            index (int): Row index; negative indexes count from the end
+            
+        Returns:
+            tuple: (sample_id, researcher_id, location_id, attributes_json),
+            the JSON as bytes or None
+        """
+        index = range(len(self))[index]
+        start = self._ends[index - 1] if index else 0
+        end = self._ends[index]
+        return (self.sample_ids[index], _nullable(self.researcher_ids[index]), _nullable(self.location_ids[index]),
+                bytes(self._text[start:end]) if end > start else None)
+    
+    def raw_rows(self):
+        """Yield every row as raw_row() returns it, in order."""
+        start = 0
+        for sample_id, researcher_id, location_id, end in zip(self.sample_ids, self.researcher_ids,
+                                                              self.location_ids, self._ends):
+            yield (sample_id, _nullable(researcher_id), _nullable(location_id),
+                   bytes(self._text[start:end]) if end > start else None)
+            start = end
+
+
+class SampleView:
+    """
+    Positions of the rows in one sorted and searched view of a SampleModel.
+    
+    A search view keeps the sort index and a match mask instead of the list
+    of matches, with match counts per block of BLOCK entries, so its length
+    is known at once and a slice only walks the blocks it covers.
+    """
+    
+    BLOCK = 4096
+    
+    def __init__(self, index, mask=None, descending=False):
+        """
+        Initialize the view.
+        
+        Args:
+            index (array): Positions in ascending sort order
+            mask (bytes): 1 for each index entry that matches, or None if all match
+            descending (bool): Present the matches in reverse order
+        """
+        self._index = index
+        self._mask = mask
+        self.descending = descending
+        self._starts = None
+        self._length = len(index)
+        if mask is not None:
+            counts = [mask.count(1, start, start + self.BLOCK) for start in range(0, len(index), self.BLOCK)]
+            self._starts = [0, *accumulate(counts)]
+            self._length = self._starts[-1]
+    
+    def __len__(self):
+        return self._length
+    
+    def __getitem__(self, item):
+        """Return the position at an offset, or a list of positions for a slice."""
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._length)
+            if step != 1:
+                raise ValueError("SampleView slices do not support a step")
+            if stop <= start:
+                return []
+            if self.descending:
+                return self._ascending(self._length - stop, self._length - start)[::-1]
+            return self._ascending(start, stop)
+        
+        if item < 0:
+            item += self._length
+        if not 0 <= item < self._length:
+            raise IndexError("SampleView index out of range")
+        return self[item:item + 1][0]
+    
+    def _ascending(self, start, stop):
+        """Return the matches from offset start to stop in ascending order."""
+        if self._mask is None:
+            return self._index[start:stop].tolist()
+        
+        block = bisect_right(self._starts, start) - 1
+        first = block * self.BLOCK
+        matches = compress(memoryview(self._index)[first:], memoryview(self._mask)[first:len(self._index)])
+        return list(islice(matches, start - self._starts[block], stop - self._starts[block]))
+
+
+class SampleModel:
+    """
+    Array-backed store of sample rows with sort and search indexes.
+    
+    Each row has a position in four columns: int64 arrays of IDs, with
+    MISSING_ID for NULL, and a list of attribute JSON texts (bytes), which
+    row() decodes. A sort index is an array
+    of positions ordered by one column, and its rank array maps a position
+    back to its place in that order. The token index maps each word in
+    attribute string values to a sorted array of positions; search terms
+    match words by prefix. Sort indexes are built on first use, or by
+    build_indexes(), and kept current with bisection as single rows change,
+    so a new sort order or search marks matches by rank and compresses an
+    existing index instead of sorting. Loading many rows at once drops the
+    sort indexes to be rebuilt on next use. A removed row's position is
+    reused by the next new row.
+    """
+    
+    def __init__(self, rows=()):
+        """
+        Initialize the model.
+        
+        Args:
+            rows: Iterable of (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        self._columns = (array('q'), array('q'), array('q'), [])
+        self._positions = {}
+        self._free = []
+        self._sort_indexes = {}
+        self._ranks = {}
+        self._word_masks = OrderedDict()
+        self._postings = {}
+        self._words = None
+        self.extend(rows)
+    
+    def __len__(self):
+        return len(self._positions)
+    
+    def __contains__(self, sample_id):
+        return sample_id in self._positions
+    
+    def row(self, position):
+        """
+        Return the row stored at a position.
+        
+        Args:
+            position (int): Position from view()
+            
+        Returns:
+            tuple: (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        sample_ids, researcher_ids, location_ids, texts = self._columns
+        return (sample_ids[position], _nullable(researcher_ids[position]), _nullable(location_ids[position]),
+                _decode(texts[position]))
+    
+    def extend(self, rows):
+        """
+        Add rows, replacing rows with the same Sample ID.
+        
+        Args:
+            rows: Iterable of (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        rows = list(rows)
+        self._bulk(len(rows))
+        for row in rows:
+            self.upsert(row)
+    
+    def extend_columns(self, columns):
+        """
+        Add the rows of a SampleColumns, replacing rows with the same Sample ID.
+        
+        The attribute JSON is stored as read, without encoding it again.
+        
+        Args:
+            columns (SampleColumns): Rows from get_all_samples
+        """
+        self._bulk(len(columns))
+        for sample_id, researcher_id, location_id, text in columns.raw_rows():
+            self._store(sample_id, researcher_id, location_id, text, _decode(text))
+    
+    def upsert(self, row):
+        """
+        Add a row, or replace the row with the same Sample ID.
+        
+        Args:
+            row (tuple): (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        self._store(row[0], row[1], row[2], _encode(row[3]), row[3])
+    
+    def _store(self, sample_id, researcher_id, location_id, text, attributes):
+        """Add or replace a row given its attribute JSON text and the decoded attributes."""
+        sample_ids, researcher_ids, location_ids, texts = self._columns
+        position = self._positions.get(sample_id)
+        if position is not None:
+            self._unindex(position)
+        elif self._free:
+            position = self._free.pop()
+        else:
+            position = len(sample_ids)
+            for column in (sample_ids, researcher_ids, location_ids):
+                column.append(MISSING_ID)
+            texts.append(None)
+        
+        sample_ids[position] = sample_id
+        researcher_ids[position] = MISSING_ID if researcher_id is None else researcher_id
+        location_ids[position] = MISSING_ID if location_id is None else location_id
+        texts[position] = text
+        self._positions[sample_id] = position
+        self._index(position, attributes)
+    
+    def _bulk(self, count):
+        """Drop the sort indexes before adding many rows, rather than inserting into them one by one."""
+        if count * 16 > len(self._positions):
+            self._sort_indexes.clear()
+            self._ranks.clear()
+            self._word_masks.clear()
+    
+    def remove(self, sample_id):
+        """
+        Remove a row if it is loaded.
+        
+        Args:
+            sample_id: Sample ID of the row
+        """
+        position = self._positions.pop(sample_id, None)
+        if position is None:
+            return
+        self._unindex(position)
+        sample_ids, researcher_ids, location_ids, texts = self._columns
+        for column in (sample_ids, researcher_ids, location_ids):
+            column[position] = MISSING_ID
+        texts[position] = None
+        self._free.append(position)
+    
+    def build_indexes(self):
+        """Build every column's sort index and rank array now instead of on first use."""
+        for column in range(len(self._columns)):
+            self._rank(column)
+    
+    def view(self, column=SAMPLE_ID, descending=False, query=""):
+        """
+        Return the positions of matching rows in sort order.
+        
+        Args:
+            column (int): Column to sort by, SAMPLE_ID to SAMPLE_ATTRIBUTES
+            descending (bool): Reverse the order
+            query (str): Search text; every word must prefix-match a word in
+                the row's attributes, or equal its Sample ID. Empty matches all.
+                
+        Returns:
+            SampleView: Positions for row(), unaffected by later changes
+        """
+        index = array('q', self._sort_index(column))
+        terms = WORD.findall(query.lower())
+        mask = self._match_mask(column, terms) if terms else None
+        return SampleView(index, mask, descending)
+    
+    def _match_mask(self, column, terms):
+        """
+        Mark the rows matching every search term.
+        
+        Returns:
+            bytes: One byte per entry of the column's sort index (and possibly
+            more), 1 where the row matches
+        """
+        if self._words is None:
+            self._words = sorted(self._postings)
+        rank = self._rank(column)
+        size = len(rank)
+        
+        mask = None
+        for term in terms:
+            marks = bytearray(size)
+            dense = 0
+            start = bisect_left(self._words, term)
+            for word in self._words[start:]:
+                if not word.startswith(term):
+                    break
+                postings = self._postings[word]
+                if len(postings) * DENSE_WORD_FRACTION >= size:
+                    dense |= self._word_mask(column, word)
+                    continue
+                for place in map(rank.__getitem__, postings):
+                    marks[place] = 1
+            position = self._positions.get(int(term) if term.isdigit() else term)
+            if position is not None:
+                marks[rank[position]] = 1
+            matches = int.from_bytes(marks, "big") | dense
+            mask = matches if mask is None else mask & matches
+        return mask.to_bytes(size, "big")
+    
+    def _word_mask(self, column, word):
+        """
+        Return the rows containing a word as a mask in a column's sort order.
+        
+        Masks of words found in many rows are cached until the sort order
+        changes, so typing a longer prefix of the same words does not mark
+        them again.
+        
+        Returns:
+            int: Big-endian bytes of the mask, one per rank, as an integer
+        """
+        key = (column, word)
+        mask = self._word_masks.get(key)
+        if mask is not None:
+            self._word_masks.move_to_end(key)
+            return mask
+        
+        rank = self._rank(column)
+        marks = bytearray(len(rank))
+        for place in map(rank.__getitem__, self._postings[word]):
+            marks[place] = 1
+        mask = self._word_masks[key] = int.from_bytes(marks, "big")
+        if len(self._word_masks) > WORD_MASK_CACHE_SIZE:
+            self._word_masks.popitem(last=False)
+        return mask
+    
+    def _key(self, column):
+        """Return the sort key function over positions for a column."""
+        values = self._columns[column]
+        if column == SAMPLE_ATTRIBUTES:
+            return lambda position: _attribute_key(values[position])
+        return values.__getitem__
+    
+    def _sort_index(self, column):
+        """Return a column's sort index, building it if needed."""
+        index = self._sort_indexes.get(column)
+        if index is not None:
+            return index
+        
+        index = array('q', sorted(self._positions.values(), key=self._key(column)))
+        self._sort_indexes[column] = index
+        return index
+    
+    def _rank(self, column):
+        """
+        Return a column's rank array, building it if needed.
+        
+        Returns:
+            array: Place of each position in the sort index; indexed by
+            position, so it is as long as the column lists
+        """
+        rank = self._ranks.get(column)
+        if rank is None:
+            rank = array('q', bytes(8 * len(self._columns[0])))
+            for place, position in enumerate(self._sort_index(column)):
+                rank[position] = place
+            self._ranks[column] = rank
+        return rank
+    
+    def _index(self, position, attributes):
+        """Add a stored row to the built sort indexes, and its decoded attributes to the token index."""
+        for column, index in self._sort_indexes.items():
+            insort(index, position, key=self._key(column))
+        self._ranks.clear()
+        self._word_masks.clear()
+        for word in attribute_tokens(attributes):
+            postings = self._postings.get(word)
+            if postings is None:
+                self._postings[word] = array('q', (position,))
+                self._words = None
+            elif postings[-1] < position:
+                postings.append(position)
+            else:
+                insort(postings, position)
+    
+    def _unindex(self, position):
+        """Remove a stored row from the built sort indexes and the token index."""
+        for column, index in self._sort_indexes.items():
+            key = self._key(column)
+            del index[index.index(position, bisect_left(index, key(position), key=key))]
+        self._ranks.clear()
+        self._word_masks.clear()
+        for word in attribute_tokens(_decode(self._columns[SAMPLE_ATTRIBUTES][position])):
+            postings = self._postings[word]
+            del postings[bisect_left(postings, position)]
+            if not postings:
+                del self._postings[word]
+                self._words = None
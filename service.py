@@ -0,0 +1,357 @@
+"""
+HTTP service entry point for Plant Sample CRUD Application.
+
+Serves the CRUD operations as JSON over HTTP without a display, for
+pipelines that cannot run the Tk GUI. Requests are handled on threads that
+share one pooled DatabaseManager.
+
+Endpoints:
+    GET    /samples/<id>                   Query one sample (ETag, If-None-Match)
+    GET    /samples?after=<id>&limit=<n>   List one page (gzip when accepted)
+    GET    /samples?filter=<json or path>  List one page of an attribute search
+    GET    /stats?limit=<n>                Counts per researcher, location and attribute key
+    GET    /stats/<key>?limit=<n>          Most common values of one attribute key
+    GET    /metrics                        Operation metrics in Prometheus text format
+    POST   /samples                        Add a sample from a JSON object
+    PUT    /samples/<id>                   Update a sample from a JSON object
+    DELETE /samples/<id>                   Delete a sample
+    
+Usage:
+    python service.py --port 8080
+"""
+
+import argparse
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from config import (SERVICE_HOST, SERVICE_PORT, SERVICE_GZIP_MIN_BYTES, PAGE_SIZE, SERVICE_MAX_PAGE_SIZE,
+                    COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, STATS_TOP_N)
+from database import DatabaseManager
+from bulk_import import convert_id, validate_record
+from stats import statistics_to_dict
+import json_codec
+
+# SQLSTATE classes of errors caused by the request rather than the server:
+# data exceptions (22) and syntax errors (42), e.g. a malformed JSON path.
+CLIENT_ERROR_CLASSES = ("22", "42")
+
+
+def query_result_to_dict(result):
+    """Convert a query_sample result to the JSON document shown by the UI."""
+    return {
+        COL_SAMPLE_ID: result[0],
+        COL_SAMPLE_ATTRIBUTES: result[1] if result[1] else {},
+        COL_RESEARCHER_ID: result[2],
+        COL_LOCATION_ID: result[3]
+    }
+
+
+def is_client_error(error):
+    """
+    Return True if a database error was caused by the request's input.
+    
+    The CRUD modules re-raise driver errors as plain Exception, so the
+    driver error is found by following the exception chain.
+    """
+    while error is not None:
+        if str(getattr(error, "pgcode", None) or "")[:2] in CLIENT_ERROR_CLASSES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def row_to_dict(row):
+    """Convert a listing or write row (id, researcher, location, attributes) to a JSON document."""
+    return {
+        COL_SAMPLE_ID: row[0],
+        COL_SAMPLE_ATTRIBUTES: row[3] if row[3] else {},
+        COL_RESEARCHER_ID: row[1],
+        COL_LOCATION_ID: row[2]
+    }
+
+
+class SampleRequestHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to the DatabaseManager attached to the server."""
+    
+    protocol_version = "HTTP/1.1"
+    server_version = "PlantSampleService/1.0"
+    
+    def do_GET(self):
+        """Handle sample lookups, page listings and statistics."""
+        path, query = self._route()
+        if path == ["metrics"]:
+            self._send_metrics()
+        elif path[:1] == ["stats"] and len(path) <= 2:
+            self._send_stats(unquote(path[1]) if len(path) == 2 else None, query)
+        elif path == ["samples"]:
+            self._list_samples(query)
+        elif len(path) == 2 and path[0] == "samples":
+            self._get_sample(path[1])
+        else:
+            self._send_json(404, {"error": "Not found"})
+    
+    def do_POST(self):
+        """Handle sample creation."""
+        path, _ = self._route()
+        if path != ["samples"]:
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        record = self._read_json()
+        if record is None:
+            return
+        values, error = validate_record(record)
+        if error:
+            self._send_json(400, {"error": error})
+            return
+        try:
+            success, message, row = self.server.db_manager.add_sample(*values)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_write_result(success, message, row, 201, 409)
+    
+    def do_PUT(self):
+        """Handle sample updates."""
+        path, _ = self._route()
+        if len(path) != 2 or path[0] != "samples":
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        sample_id = self._path_id(path[1])
+        if sample_id is None:
+            return
+        record = self._read_json()
+        if record is None:
+            return
+        values, error = validate_record({**record, COL_SAMPLE_ID: sample_id})
+        if error:
+            self._send_json(400, {"error": error})
+            return
+        try:
+            success, message, row = self.server.db_manager.update_sample(*values)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_write_result(success, message, row, 200, 404)
+    
+    def do_DELETE(self):
+        """Handle sample deletion."""
+        path, _ = self._route()
+        if len(path) != 2 or path[0] != "samples":
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        sample_id = self._path_id(path[1])
+        if sample_id is None:
+            return
+        try:
+            success, message, row = self.server.db_manager.delete_sample(sample_id)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_write_result(success, message, row, 200, 404)
+    
+    def _get_sample(self, sample_id):
+        """Send one sample, or 304 if the client's ETag still matches."""
+        sample_id = self._path_id(sample_id)
+        if sample_id is None:
+            return
+        try:
+            result = self.server.db_manager.query_sample(sample_id)
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        if not result:
+            self._send_json(404, {"error": "Sample not found"})
+            return
+        
+        body = json_codec.dumps(query_result_to_dict(result)).encode()
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_body(200, body, {"ETag": etag, "Cache-Control": "no-cache"})
+    
+    def _send_metrics(self):
+        """Send the DatabaseManager's instrumentation as Prometheus text."""
+        instrumentation = self.server.db_manager.instrumentation
+        if not hasattr(instrumentation, "to_prometheus"):
+            self._send_json(404, {"error": "Metrics are not enabled"})
+            return
+        self._send_body(200, instrumentation.to_prometheus().encode(), content_type="text/plain; version=0.0.4")
+    
+    def _send_stats(self, key, query):
+        """Send the sample statistics, or the value counts of one attribute key."""
+        limit = self._read_limit(query, STATS_TOP_N)
+        if limit is None:
+            return
+        
+        try:
+            if key is None:
+                document = statistics_to_dict(self.server.db_manager.sample_statistics(limit))
+            else:
+                rows = self.server.db_manager.attribute_distribution(key, limit)
+                document = {"key": key, "values": [{"value": value, "samples": samples} for value, samples in rows]}
+        except Exception as e:
+            self._send_json(400 if is_client_error(e) else 500, {"error": str(e)})
+            return
+        self._send_json(200, document)
+    
+    def _list_samples(self, query):
+        """Send one page of samples, optionally filtered by attributes."""
+        after_id, error = convert_id("after", query.get("after", [None])[0])
+        if error:
+            self._send_json(400, {"error": error})
+            return
+        limit = self._read_limit(query, PAGE_SIZE)
+        if limit is None:
+            return
+        
+        attr_filter = query.get("filter", [None])[0]
+        try:
+            if attr_filter is None:
+                rows = self.server.db_manager.get_samples_page(after_id, limit)
+            else:
+                try:
+                    parsed = json_codec.loads(attr_filter)
+                except ValueError:
+                    parsed = None
+                if isinstance(parsed, dict):
+                    attr_filter = parsed
+                rows = self.server.db_manager.find_samples(attr_filter, after_id, limit)
+        except Exception as e:
+            self._send_json(400 if is_client_error(e) else 500, {"error": str(e)})
+            return
+        
+        next_after = rows[-1][0] if rows and len(rows) == limit else None
+        self._send_json(200, {"samples": [row_to_dict(row) for row in rows], "next_after": next_after})
+    
+    def _send_write_result(self, success, message, row, ok_status, fail_status):
+        """Send the outcome of an add, update or delete."""
+        if success:
+            self._send_json(ok_status, {"message": message, "sample": row_to_dict(row)})
+        elif message in ("Sample ID already exists", "Sample ID not found"):
+            self._send_json(fail_status, {"error": message})
+        else:
+            self._send_json(400, {"error": message})
+    
+    def _route(self):
+        """Split the request URL into path segments and query parameters."""
+        url = urlsplit(self.path)
+        return [part for part in url.path.split("/") if part], parse_qs(url.query)
+    
+    def _path_id(self, value):
+        """Convert a Sample ID from the URL path, sending 404 and returning None if it cannot exist."""
+        sample_id, error = convert_id(COL_SAMPLE_ID, unquote(value))
+        if error or sample_id is None:
+            self._send_json(404, {"error": "Sample not found"})
+            return None
+        return sample_id
+    
+    def _read_limit(self, query, default):
+        """
+        Read the limit query parameter, capped at SERVICE_MAX_PAGE_SIZE.
+        
+        Sends 400 and returns None unless it is an integer of at least 1;
+        zero and negative values would otherwise reach the database, where
+        SQLite treats a negative LIMIT as no limit at all.
+        """
+        try:
+            limit = int(query.get("limit", [default])[0])
+        except ValueError:
+            self._send_json(400, {"error": "limit must be an integer"})
+            return None
+        if limit < 1:
+            self._send_json(400, {"error": "limit must be at least 1"})
+            return None
+        return min(limit, SERVICE_MAX_PAGE_SIZE)
+    
+    def _read_json(self):
+        """Read a JSON object request body, sending 400 and returning None if invalid."""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self._send_json(400, {"error": "Content-Length must be an integer"})
+            return None
+        if length < 0:
+            self._send_json(400, {"error": "Content-Length must not be negative"})
+            return None
+        try:
+            record = json_codec.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            record = None
+        if not isinstance(record, dict):
+            self._send_json(400, {"error": "Request body must be a JSON object"})
+            return None
+        return record
+    
+    def _send_json(self, status, document):
+        """Serialize a document and send it."""
+        self._send_body(status, json_codec.dumps(document).encode())
+    
+    def _send_body(self, status, body, headers=None, content_type="application/json"):
+        """Send a response body, gzip-compressed if large and accepted by the client."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if len(body) >= SERVICE_GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Vary", "Accept-Encoding")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """Log requests only when the server runs with --verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(host=SERVICE_HOST, port=SERVICE_PORT, db_manager=None, verbose=False):
+    """
+    Create the HTTP server with a pooled DatabaseManager attached.
+    
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind
+        db_manager: DatabaseManager to use; a pooled one is created if None
+        verbose (bool): Log every request to stderr
+        
+    Returns:
+        ThreadingHTTPServer: Server ready for serve_forever()
+    """
+    server = ThreadingHTTPServer((host, port), SampleRequestHandler)
+    server.daemon_threads = True
+    server.db_manager = db_manager or DatabaseManager(pooled=True)
+    server.verbose = verbose
+    return server
+
+
+def main():
+    """Parse arguments and serve until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve plant samples as JSON over HTTP.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    
+    server = create_server(args.host, args.port, verbose=args.verbose)
+    print(f"Serving on http://{args.host}:{args.port}/samples")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
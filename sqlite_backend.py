@@ -0,0 +1,881 @@
+"""
+SQLite backend module for Plant Sample CRUD Application.
+
+Provides SQLiteBackend, an embedded single-file database for machines
+without a PostgreSQL server, and SQLite versions of the CRUD, import and
+export operations. Each operation has the same name, (cursor, conn, ...)
+signature and result as its counterpart in the create, read, update,
+delete, bulk_import and export modules, so DatabaseManager runs either set
+unchanged when DB_BACKEND is "sqlite".
+
+Attributes are stored as JSON text, validated and minified by the JSON1
+json() function on write and decoded with json_codec on read, so callers
+receive the same dicts as from PostgreSQL's jsonb columns. RETURNING and
+STRICT tables need SQLite 3.37 or later.
+"""
+
+import re
+import sqlite3
+import threading
+from config import (TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, PAGE_SIZE,
+                    TABLE_RESEARCHER, COL_RESEARCHER_NAME, COL_RESEARCHER_EMAIL, COL_RESEARCHER_PHONE, COL_RESEARCHER_AFFILIATION,
+                    TABLE_SAMPLING_LOCATION, COL_LOCATION_ATTRIBUTES, TABLE_ENVIRONMENTAL_CONDITION, COL_CONDITION_ATTRIBUTES,
+                    IMPORT_CHUNK_SIZE, EXPORT_ITERSIZE, BATCH_PAGE_SIZE, SQLITE_PATH, SQLITE_TIMEOUT, SQLITE_ATTRIBUTE_INDEXES,
+                    STATS_TOP_N, INDEX_SAMPLE_RESEARCHER, INDEX_SAMPLE_LOCATION)
+from bulk_import import record_reader, validate_record
+from export import write_samples
+from stats import TOTAL_COLUMNS
+from sample_model import SampleColumns
+import json_codec
+
+MIN_SQLITE_VERSION = (3, 37, 0)
+
+SAMPLE_COLUMNS = f'"{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"'
+
+SCHEMA_SQL = f'''
+    CREATE TABLE IF NOT EXISTS "{TABLE_RESEARCHER}" (
+        "{COL_RESEARCHER_ID}" INTEGER PRIMARY KEY,
+        "{COL_RESEARCHER_NAME}" TEXT,
+        "{COL_RESEARCHER_EMAIL}" TEXT,
+        "{COL_RESEARCHER_PHONE}" TEXT,
+        "{COL_RESEARCHER_AFFILIATION}" TEXT
+    ) STRICT;
+    
+    CREATE TABLE IF NOT EXISTS "{TABLE_SAMPLING_LOCATION}" (
+        "{COL_LOCATION_ID}" INTEGER PRIMARY KEY,
+        "{COL_LOCATION_ATTRIBUTES}" TEXT CHECK (json_valid("{COL_LOCATION_ATTRIBUTES}"))
+    ) STRICT;
+    
+    CREATE TABLE IF NOT EXISTS "{TABLE_PLANT_SAMPLE}" (
+        "{COL_SAMPLE_ID}" INTEGER PRIMARY KEY,
+        "{COL_SAMPLE_ATTRIBUTES}" TEXT CHECK (json_valid("{COL_SAMPLE_ATTRIBUTES}")),
+        "{COL_RESEARCHER_ID}" INTEGER REFERENCES "{TABLE_RESEARCHER}" ON DELETE SET NULL,
+        "{COL_LOCATION_ID}" INTEGER REFERENCES "{TABLE_SAMPLING_LOCATION}" ON DELETE SET NULL
+    ) STRICT;
+    
+    CREATE TABLE IF NOT EXISTS "{TABLE_ENVIRONMENTAL_CONDITION}" (
+        "{COL_SAMPLE_ID}" INTEGER PRIMARY KEY REFERENCES "{TABLE_PLANT_SAMPLE}" ON DELETE CASCADE,
+        "{COL_CONDITION_ATTRIBUTES}" TEXT CHECK (json_valid("{COL_CONDITION_ATTRIBUTES}"))
+    ) STRICT;
+    
+    CREATE INDEX IF NOT EXISTS "{INDEX_SAMPLE_RESEARCHER}" ON "{TABLE_PLANT_SAMPLE}" ("{COL_RESEARCHER_ID}", "{COL_SAMPLE_ID}");
+    CREATE INDEX IF NOT EXISTS "{INDEX_SAMPLE_LOCATION}" ON "{TABLE_PLANT_SAMPLE}" ("{COL_LOCATION_ID}", "{COL_SAMPLE_ID}");
+'''
+
+INSERT_SAMPLE_SQL = f'''
+    INSERT INTO "{TABLE_PLANT_SAMPLE}" ("{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}")
+    VALUES (?, json(?), ?, ?)
+    RETURNING {SAMPLE_COLUMNS}
+'''
+
+IMPORT_SAMPLE_SQL = f'''
+    INSERT INTO "{TABLE_PLANT_SAMPLE}" ("{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}")
+    VALUES (?, json(?), ?, ?)
+'''
+
+UPDATE_SAMPLE_SQL = f'''
+    UPDATE "{TABLE_PLANT_SAMPLE}"
+    SET "{COL_SAMPLE_ATTRIBUTES}" = json(?), "{COL_RESEARCHER_ID}" = ?, "{COL_LOCATION_ID}" = ?
+    WHERE "{COL_SAMPLE_ID}" = ?
+    RETURNING {SAMPLE_COLUMNS}
+'''
+
+SELECT_SAMPLE_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ID}" = ?
+'''
+
+SELECT_ALL_SAMPLES_SQL = f'SELECT {SAMPLE_COLUMNS} FROM "{TABLE_PLANT_SAMPLE}"'
+
+FIRST_PAGE_SQL = f'''
+    SELECT {SAMPLE_COLUMNS}
+    FROM "{TABLE_PLANT_SAMPLE}"
+    ORDER BY "{COL_SAMPLE_ID}"
+    LIMIT ?
+'''
+
+PAGE_AFTER_SQL = f'''
+    SELECT {SAMPLE_COLUMNS}
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ID}" > ?
+    ORDER BY "{COL_SAMPLE_ID}"
+    LIMIT ?
+'''
+
+PAGE_BEFORE_SQL = f'''
+    SELECT {SAMPLE_COLUMNS}
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ID}" < ?
+    ORDER BY "{COL_SAMPLE_ID}" DESC
+    LIMIT ?
+'''
+
+# json() around the nested values keeps them JSON instead of quoted text.
+SAMPLE_DETAIL_SQL = f'''
+    SELECT json_object(
+        '{COL_SAMPLE_ID}', s."{COL_SAMPLE_ID}",
+        '{COL_SAMPLE_ATTRIBUTES}', json(COALESCE(s."{COL_SAMPLE_ATTRIBUTES}", '{{}}')),
+        '{COL_RESEARCHER_ID}', s."{COL_RESEARCHER_ID}",
+        '{COL_LOCATION_ID}', s."{COL_LOCATION_ID}",
+        '{TABLE_RESEARCHER}', json(CASE WHEN r."{COL_RESEARCHER_ID}" IS NOT NULL THEN json_object(
+            '{COL_RESEARCHER_ID}', r."{COL_RESEARCHER_ID}",
+            '{COL_RESEARCHER_NAME}', r."{COL_RESEARCHER_NAME}",
+            '{COL_RESEARCHER_EMAIL}', r."{COL_RESEARCHER_EMAIL}",
+            '{COL_RESEARCHER_PHONE}', r."{COL_RESEARCHER_PHONE}",
+            '{COL_RESEARCHER_AFFILIATION}', r."{COL_RESEARCHER_AFFILIATION}"
+        ) END),
+        '{TABLE_SAMPLING_LOCATION}', json(CASE WHEN l."{COL_LOCATION_ID}" IS NOT NULL THEN json_object(
+            '{COL_LOCATION_ID}', l."{COL_LOCATION_ID}",
+            '{COL_LOCATION_ATTRIBUTES}', json(COALESCE(l."{COL_LOCATION_ATTRIBUTES}", '{{}}'))
+        ) END),
+        '{TABLE_ENVIRONMENTAL_CONDITION}', json(e."{COL_CONDITION_ATTRIBUTES}")
+    )
+    FROM "{TABLE_PLANT_SAMPLE}" s
+    LEFT JOIN "{TABLE_RESEARCHER}" r ON r."{COL_RESEARCHER_ID}" = s."{COL_RESEARCHER_ID}"
+    LEFT JOIN "{TABLE_SAMPLING_LOCATION}" l ON l."{COL_LOCATION_ID}" = s."{COL_LOCATION_ID}"
+    LEFT JOIN "{TABLE_ENVIRONMENTAL_CONDITION}" e ON e."{COL_SAMPLE_ID}" = s."{COL_SAMPLE_ID}"
+'''
+
+SELECT_SAMPLE_DETAIL_SQL = SAMPLE_DETAIL_SQL + f'''
+    WHERE s."{COL_SAMPLE_ID}" = ?
+'''
+
+DETAIL_FIRST_PAGE_SQL = SAMPLE_DETAIL_SQL + f'''
+    ORDER BY s."{COL_SAMPLE_ID}"
+    LIMIT ?
+'''
+
+DETAIL_PAGE_AFTER_SQL = SAMPLE_DETAIL_SQL + f'''
+    WHERE s."{COL_SAMPLE_ID}" > ?
+    ORDER BY s."{COL_SAMPLE_ID}"
+    LIMIT ?
+'''
+
+EXPORT_SQL = f'''
+    SELECT "{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    ORDER BY "{COL_SAMPLE_ID}"
+'''
+
+STATS_TOTALS_SQL = f'''
+    SELECT count(*), (SELECT count(*) FROM "{TABLE_RESEARCHER}"), (SELECT count(*) FROM "{TABLE_SAMPLING_LOCATION}"),
+           count(*) FILTER (WHERE "{COL_RESEARCHER_ID}" IS NULL), count(*) FILTER (WHERE "{COL_LOCATION_ID}" IS NULL),
+           (SELECT count(*) FROM "{TABLE_ENVIRONMENTAL_CONDITION}")
+    FROM "{TABLE_PLANT_SAMPLE}"
+'''
+
+STATS_RESEARCHERS_SQL = f'''
+    SELECT g.researcher_id, r."{COL_RESEARCHER_NAME}", g.samples
+    FROM (
+        SELECT "{COL_RESEARCHER_ID}" AS researcher_id, count(*) AS samples
+        FROM "{TABLE_PLANT_SAMPLE}"
+        WHERE "{COL_RESEARCHER_ID}" IS NOT NULL
+        GROUP BY "{COL_RESEARCHER_ID}"
+    ) g
+    LEFT JOIN "{TABLE_RESEARCHER}" r ON r."{COL_RESEARCHER_ID}" = g.researcher_id
+    ORDER BY g.samples DESC, g.researcher_id
+    LIMIT ?
+'''
+
+STATS_LOCATIONS_SQL = f'''
+    SELECT g.location_id, json_extract(l."{COL_LOCATION_ATTRIBUTES}", '$.name'), g.samples
+    FROM (
+        SELECT "{COL_LOCATION_ID}" AS location_id, count(*) AS samples
+        FROM "{TABLE_PLANT_SAMPLE}"
+        WHERE "{COL_LOCATION_ID}" IS NOT NULL
+        GROUP BY "{COL_LOCATION_ID}"
+    ) g
+    LEFT JOIN "{TABLE_SAMPLING_LOCATION}" l ON l."{COL_LOCATION_ID}" = g.location_id
+    ORDER BY g.samples DESC, g.location_id
+    LIMIT ?
+'''
+
+STATS_NUMBER = "CASE WHEN a.type IN ('integer', 'real') THEN a.value END"
+
+STATS_ATTRIBUTES_SQL = f'''
+    SELECT a.key, count(*) AS samples, count(DISTINCT a.type || ':' || COALESCE(a.value, '')),
+           min({STATS_NUMBER}), avg({STATS_NUMBER}), max({STATS_NUMBER})
+    FROM "{TABLE_PLANT_SAMPLE}" s, json_each(s."{COL_SAMPLE_ATTRIBUTES}") a
+    WHERE json_type(s."{COL_SAMPLE_ATTRIBUTES}") = 'object'
+    GROUP BY a.key
+    ORDER BY samples DESC, a.key
+    LIMIT ?
+'''
+
+STATS_DISTRIBUTION_SQL = f'''
+    SELECT a.type, a.value, count(*) AS samples
+    FROM "{TABLE_PLANT_SAMPLE}" s, json_each(s."{COL_SAMPLE_ATTRIBUTES}") a
+    WHERE json_type(s."{COL_SAMPLE_ATTRIBUTES}") = 'object' AND a.key = ?
+    GROUP BY a.type, a.value
+    ORDER BY samples DESC, a.value
+    LIMIT ?
+'''
+
+JSON_CONSTANTS = {"true": True, "false": False, "null": None}
+
+JSONPATH_COMPARISON = re.compile(r'^\s*\$((?:\.\w+)+)\s*(==|!=|<>|<=|>=|<|>)\s*(.+?)\s*$')
+COMPARISON_OPERATORS = {"==": "=", "!=": "<>", "<>": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+class SQLiteBackend:
+    """
+    Per-thread connections to one SQLite database file.
+    
+    A sqlite3 connection must not be used by two threads at once, so each
+    thread opens its own on first use; WAL mode lets them read while one of
+    them writes, and writers wait up to SQLITE_TIMEOUT seconds for each
+    other. The schema and indexes are created when the first connection
+    opens. An in-memory database is private to one connection, so use a
+    file path.
+    """
+    
+    def __init__(self, path=SQLITE_PATH, timeout=SQLITE_TIMEOUT):
+        """
+        Configure the backend without opening a connection.
+        
+        Args:
+            path (str): Database file path, or a ``file:`` URI
+            timeout (float): Seconds to wait for another writer's lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._schema_ready = False
+    
+    def connect(self):
+        """
+        Open the calling thread's connection, creating the schema if needed.
+        
+        Returns:
+            sqlite3.Connection
+            
+        Raises:
+            Exception: If the SQLite library is too old or the database cannot be opened
+        """
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise Exception(f"SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or later is required, "
+                            f"found {sqlite3.sqlite_version}")
+        try:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False,
+                                   uri=self.path.startswith("file:"))
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            with self._lock:
+                if not self._schema_ready:
+                    create_schema(conn)
+                    self._schema_ready = True
+                self._connections.append(conn)
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to open SQLite database {self.path}:\n{str(e)}")
+        self._local.conn = conn
+        return conn
+    
+    def execute(self, operation, args):
+        """
+        Run an operation on the calling thread's connection.
+        
+        Args:
+            operation: Function taking (cursor, conn, *args)
+            args (tuple): Remaining arguments for the operation
+            
+        Returns:
+            The operation's return value
+        """
+        conn = getattr(self._local, "conn", None) or self.connect()
+        cursor = conn.cursor()
+        try:
+            return operation(cursor, conn, *args)
+        finally:
+            cursor.close()
+    
+    def close(self):
+        """Close every thread's connection, updating query planner statistics first."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            conn.close()
+
+
+def create_schema(conn):
+    """
+    Create the tables and indexes if they do not exist.
+    
+    Besides the foreign-key indexes, an expression index on
+    json_extract(attributes, key) is created for every key in
+    SQLITE_ATTRIBUTE_INDEXES, which serves attribute filters on that key.
+    
+    Args:
+        conn: SQLite connection
+    """
+    statements = [SCHEMA_SQL]
+    for key in SQLITE_ATTRIBUTE_INDEXES:
+        statements.append(f'CREATE INDEX IF NOT EXISTS "plant_sample_attr_{key}_idx" '
+                          f'ON "{TABLE_PLANT_SAMPLE}" ({_attribute_expression((key,))}, "{COL_SAMPLE_ID}");')
+    conn.executescript("\n".join(statements))
+    conn.commit()
+
+
+def add_sample(cursor, conn, sample_id, researcher_id, location_id, sample_attr):
+    """
+    Insert a new plant sample; see create.add_sample.
+    
+    Returns:
+        tuple: (success: bool, message: str, row: tuple or None)
+    """
+    try:
+        cursor.execute(INSERT_SAMPLE_SQL, (sample_id, sample_attr, researcher_id, location_id))
+        row = cursor.fetchall()[0]
+        conn.commit()
+        return True, "Sample added successfully", _sample_row(row)
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        return False, _insert_error(e), None
+    except Exception as e:
+        conn.rollback()
+        return False, str(e), None
+
+
+def update_sample(cursor, conn, sample_id, researcher_id, location_id, sample_attr):
+    """
+    Update an existing plant sample; see update.update_sample.
+    
+    Returns:
+        tuple: (success: bool, message: str, row: tuple or None)
+    """
+    try:
+        cursor.execute(UPDATE_SAMPLE_SQL, (sample_attr, researcher_id, location_id, sample_id))
+        rows = cursor.fetchall()
+        conn.commit()
+        
+        if rows:
+            return True, "Sample updated successfully", _sample_row(rows[0])
+        else:
+            return False, "Sample ID not found", None
+    except Exception as e:
+        conn.rollback()
+        return False, str(e), None
+
+
+def update_samples(cursor, conn, batch):
+    """
+    Update many plant samples in a single transaction; see update.update_samples.
+    
+    Statements run in-process, so one UPDATE per entry costs no round trips.
+    
+    Returns:
+        list: One (success: bool, message: str, row: tuple or None) per batch entry
+    """
+    results = []
+    try:
+        for sample_id, researcher_id, location_id, sample_attr in batch:
+            cursor.execute(UPDATE_SAMPLE_SQL, (sample_attr, researcher_id, location_id, sample_id))
+            rows = cursor.fetchall()
+            if rows:
+                results.append((True, "Sample updated successfully", _sample_row(rows[0])))
+            else:
+                results.append((False, "Sample ID not found", None))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return [(False, str(e), None)] * len(batch)
+    return results
+
+
+def delete_sample(cursor, conn, sample_id):
+    """
+    Delete a plant sample by its ID; see delete.delete_sample.
+    
+    Returns:
+        tuple: (success: bool, message: str, row: tuple or None)
+    """
+    try:
+        cursor.execute(f'DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" = ? RETURNING {SAMPLE_COLUMNS}',
+                       (sample_id,))
+        rows = cursor.fetchall()
+        conn.commit()
+        
+        if rows:
+            return True, "Sample deleted successfully", _sample_row(rows[0])
+        else:
+            return False, "Sample ID not found", None
+    except Exception as e:
+        conn.rollback()
+        return False, str(e), None
+
+
+def delete_samples(cursor, conn, sample_ids):
+    """
+    Delete many plant samples in a single transaction; see delete.delete_samples.
+    
+    IDs are bound BATCH_PAGE_SIZE at a time into DELETE ... WHERE IN (...).
+    
+    Returns:
+        list: One (success: bool, message: str, row: tuple or None) per sample ID
+    """
+    if not sample_ids:
+        return []
+    
+    sample_ids = list(sample_ids)
+    deleted = {}
+    try:
+        for start in range(0, len(sample_ids), BATCH_PAGE_SIZE):
+            chunk = sample_ids[start:start + BATCH_PAGE_SIZE]
+            cursor.execute(f'''
+                DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" IN ({", ".join("?" * len(chunk))})
+                RETURNING {SAMPLE_COLUMNS}
+            ''', chunk)
+            deleted.update((str(row[0]), row) for row in cursor.fetchall())
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return [(False, str(e), None)] * len(sample_ids)
+    
+    results = []
+    for sample_id in sample_ids:
+        row = deleted.pop(str(sample_id), None)
+        if row is not None:
+            results.append((True, "Sample deleted successfully", _sample_row(row)))
+        else:
+            results.append((False, "Sample ID not found", None))
+    return results
+
+
+def query_sample(cursor, conn, sample_id):
+    """
+    Query a specific plant sample by its ID; see read.query_sample.
+    
+    Returns:
+        tuple: (sample_id, sample_attributes, researcher_id, location_id) or None
+    """
+    try:
+        cursor.execute(SELECT_SAMPLE_SQL, (sample_id,))
+        row = cursor.fetchone()
+        return (row[0], _decode(row[1]), row[2], row[3]) if row else None
+    except Exception as e:
+        raise Exception(f"Query failed: {str(e)}")
+
+
+def query_sample_detail(cursor, conn, sample_id):
+    """
+    Query a plant sample with its related rows; see read.query_sample_detail.
+    
+    Returns:
+        dict: Sample detail document, or None if the sample does not exist
+    """
+    try:
+        cursor.execute(SELECT_SAMPLE_DETAIL_SQL, (sample_id,))
+        row = cursor.fetchone()
+        return json_codec.loads(row[0]) if row else None
+    except Exception as e:
+        raise Exception(f"Query failed: {str(e)}")
+
+
+def list_sample_details(cursor, conn, after_id=None, limit=PAGE_SIZE):
+    """
+    Retrieve one page of sample detail documents; see read.list_sample_details.
+    
+    Returns:
+        list: Sample detail documents (dict)
+    """
+    try:
+        if after_id is None:
+            cursor.execute(DETAIL_FIRST_PAGE_SQL, (limit,))
+        else:
+            cursor.execute(DETAIL_PAGE_AFTER_SQL, (after_id, limit))
+        return [json_codec.loads(row[0]) for row in cursor.fetchall()]
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+
+
+def get_all_samples(cursor, conn):
+    """
+    Retrieve all plant samples; see read.get_all_samples.
+    
+    The stored attribute text goes into the SampleColumns undecoded.
+    
+    Returns:
+        SampleColumns: Rows of (sample_id, researcher_id, location_id, sample_attributes)
+    """
+    try:
+        cursor.execute(SELECT_ALL_SAMPLES_SQL)
+        return SampleColumns(cursor)
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+
+
+def get_samples_page(cursor, conn, after_id=None, limit=PAGE_SIZE):
+    """
+    Retrieve one page of plant samples by keyset; see read.get_samples_page.
+    
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+    """
+    try:
+        if after_id is None:
+            cursor.execute(FIRST_PAGE_SQL, (limit,))
+        else:
+            cursor.execute(PAGE_AFTER_SQL, (after_id, limit))
+        return [_sample_row(row) for row in cursor.fetchall()]
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+
+
+def get_samples_page_before(cursor, conn, before_id, limit=PAGE_SIZE):
+    """
+    Retrieve the page preceding a Sample ID; see read.get_samples_page_before.
+    
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes),
+        in ascending Sample ID order
+    """
+    try:
+        cursor.execute(PAGE_BEFORE_SQL, (before_id, limit))
+        rows = [_sample_row(row) for row in cursor.fetchall()]
+        rows.reverse()
+        return rows
+    except Exception as e:
+        raise Exception(f"Failed to fetch samples:\n{str(e)}")
+
+
+def find_samples(cursor, conn, attr_filter, after_id=None, limit=PAGE_SIZE):
+    """
+    Find plant samples whose attributes match a filter; see read.find_samples.
+    
+    See _attribute_condition for the filters SQLite supports.
+    
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes)
+    """
+    try:
+        condition, params = _attribute_condition(attr_filter)
+        if after_id is not None:
+            condition += f' AND "{COL_SAMPLE_ID}" > ?'
+            params.append(after_id)
+        cursor.execute(f'''
+            SELECT {SAMPLE_COLUMNS}
+            FROM "{TABLE_PLANT_SAMPLE}"
+            WHERE {condition}
+            ORDER BY "{COL_SAMPLE_ID}"
+            LIMIT ?
+        ''', (*params, limit))
+        return [_sample_row(row) for row in cursor.fetchall()]
+    except Exception as e:
+        raise Exception(f"Attribute search failed:\n{str(e)}")
+
+
+def find_samples_before(cursor, conn, attr_filter, before_id, limit=PAGE_SIZE):
+    """
+    Find the matching page preceding a Sample ID; see read.find_samples_before.
+    
+    Returns:
+        list: List of tuples containing (sample_id, researcher_id, location_id, sample_attributes),
+        in ascending Sample ID order
+    """
+    try:
+        condition, params = _attribute_condition(attr_filter)
+        cursor.execute(f'''
+            SELECT {SAMPLE_COLUMNS}
+            FROM "{TABLE_PLANT_SAMPLE}"
+            WHERE {condition} AND "{COL_SAMPLE_ID}" < ?
+            ORDER BY "{COL_SAMPLE_ID}" DESC
+            LIMIT ?
+        ''', (*params, before_id, limit))
+        rows = [_sample_row(row) for row in cursor.fetchall()]
+        rows.reverse()
+        return rows
+    except Exception as e:
+        raise Exception(f"Attribute search failed:\n{str(e)}")
+
+
+def import_samples(cursor, conn, path, file_format=None, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+    """
+    Bulk load plant samples from a CSV or JSONL file; see bulk_import.import_samples.
+    
+    Rows are inserted one statement at a time, which is cheap in-process,
+    and committed every ``chunk_size`` rows. A rejected row only fails its
+    own statement, so duplicates are reported per row without savepoints.
+    
+    Returns:
+        tuple: (inserted: int, errors: list of (line_number, sample_id, message))
+        
+    Raises:
+        Exception: If the file format is unknown
+    """
+    reader = record_reader(path, file_format)
+    
+    inserted = 0
+    rows_read = 0
+    pending = 0
+    errors = []
+    with open(path, newline='', encoding='utf-8') as file:
+        for line_number, record in reader(file):
+            rows_read += 1
+            row, error = validate_record(record)
+            if error:
+                errors.append((line_number, record.get(COL_SAMPLE_ID) if record else None, error))
+                continue
+            
+            sample_id, researcher_id, location_id, sample_attr = row
+            try:
+                cursor.execute(IMPORT_SAMPLE_SQL, (sample_id, sample_attr, researcher_id, location_id))
+            except sqlite3.IntegrityError as e:
+                errors.append((line_number, sample_id, _insert_error(e)))
+                continue
+            except sqlite3.Error as e:
+                errors.append((line_number, sample_id, str(e)))
+                continue
+            inserted += 1
+            pending += 1
+            
+            if pending >= chunk_size:
+                conn.commit()
+                pending = 0
+                if progress:
+                    progress(rows_read, inserted)
+        
+        conn.commit()
+        if progress:
+            progress(rows_read, inserted)
+    
+    return inserted, errors
+
+
+def export_samples(cursor, conn, path, file_format=None, itersize=EXPORT_ITERSIZE, progress=None):
+    """
+    Stream every plant sample to a file; see export.export_samples.
+    
+    SQLite cursors step through results lazily, so rows are written as
+    they are read without holding the table in memory. The stored
+    attribute text is written without decoding it.
+    
+    Returns:
+        int: Number of rows written
+    """
+    try:
+        cursor.execute(EXPORT_SQL)
+        return write_samples(cursor, path, file_format, itersize, progress)
+    except Exception as e:
+        raise Exception(f"Export failed:\n{str(e)}")
+
+
+def apply_migrations(cursor, conn, directory, progress=None):
+    """
+    Versioned migrations are PostgreSQL scripts; SQLite databases need none.
+    
+    Raises:
+        Exception: Always
+    """
+    raise Exception("Schema migrations apply to PostgreSQL only; the SQLite schema is created on connect")
+
+
+def migration_status(cursor, conn, directory):
+    """
+    Versioned migrations are PostgreSQL scripts; SQLite databases need none.
+    
+    Raises:
+        Exception: Always
+    """
+    raise Exception("Schema migrations apply to PostgreSQL only; the SQLite schema is created on connect")
+
+
+def list_partitions(cursor, conn):
+    """
+    SQLite tables are not partitioned.
+    
+    Returns:
+        list: Always empty
+    """
+    return []
+
+
+def partition_table(cursor, conn, partition_size, ahead):
+    """
+    Table partitioning is a PostgreSQL feature.
+    
+    Raises:
+        Exception: Always
+    """
+    raise Exception("Table partitioning requires PostgreSQL")
+
+
+def ensure_partitions(cursor, conn, partition_size, ahead):
+    """
+    Table partitioning is a PostgreSQL feature.
+    
+    Raises:
+        Exception: Always
+    """
+    raise Exception("Table partitioning requires PostgreSQL")
+
+
+def archive_partitions(cursor, conn, before_id, directory, file_format="jsonl", drop=False, progress=None,
+                       itersize=EXPORT_ITERSIZE):
+    """
+    Table partitioning is a PostgreSQL feature.
+    
+    Raises:
+        Exception: Always
+    """
+    raise Exception("Table partitioning requires PostgreSQL")
+
+
+def sample_statistics(cursor, conn, limit=STATS_TOP_N, materialized=False):
+    """
+    Summarize the samples; see stats.sample_statistics.
+    
+    SQLite has no materialized views, so the statistics are always computed
+    from the tables and materialized is ignored.
+    
+    Returns:
+        dict: "totals", "researchers", "locations", "attributes" and "refreshed_at" (always None)
+    """
+    try:
+        cursor.execute(STATS_TOTALS_SQL)
+        statistics = {"totals": dict(zip(TOTAL_COLUMNS, cursor.fetchone())), "refreshed_at": None}
+        for name, sql in (("researchers", STATS_RESEARCHERS_SQL), ("locations", STATS_LOCATIONS_SQL),
+                          ("attributes", STATS_ATTRIBUTES_SQL)):
+            cursor.execute(sql, (limit,))
+            statistics[name] = [tuple(row) for row in cursor.fetchall()]
+        statistics["attributes"] = [(key, samples, distinct, *(None if value is None else float(value)
+                                                               for value in numbers))
+                                    for key, samples, distinct, *numbers in statistics["attributes"]]
+        return statistics
+    except Exception as e:
+        raise Exception(f"Failed to compute statistics:\n{str(e)}")
+
+
+def attribute_distribution(cursor, conn, key, limit=STATS_TOP_N):
+    """
+    Count the samples per value of one attribute key; see stats.attribute_distribution.
+    
+    Returns:
+        list: Tuples of (value, samples) by descending sample count
+    """
+    try:
+        cursor.execute(STATS_DISTRIBUTION_SQL, (key, limit))
+        rows = []
+        for kind, value, samples in cursor.fetchall():
+            if kind in ("object", "array"):
+                value = json_codec.loads(value)
+            elif kind in JSON_CONSTANTS:
+                value = JSON_CONSTANTS[kind]
+            rows.append((value, samples))
+        return rows
+    except Exception as e:
+        raise Exception(f"Failed to count values of {key}:\n{str(e)}")
+
+
+def create_statistics_views(cursor, conn):
+    """
+    Materialized statistics views are a PostgreSQL feature.
+    
+    Raises:
+        Exception: Always
+    """
+    raise Exception("Materialized statistics views require PostgreSQL; SQLite statistics are computed live")
+
+
+def refresh_statistics_views(cursor, conn, concurrently=True):
+    """
+    Materialized statistics views are a PostgreSQL feature.
+    
+    Raises:
+        Exception: Always
+    """
+    raise Exception("Materialized statistics views require PostgreSQL; SQLite statistics are computed live")
+
+
+def _attribute_condition(attr_filter):
+    """
+    Build the WHERE condition for an attribute filter.
+    
+    SQLite has no containment operator or SQL/JSON path, so filters are
+    translated to json_extract comparisons. A dict is matched key by key:
+    scalars by equality, nested objects and arrays by their whole JSON
+    value, which covers the containment documents the UI builds but not
+    PostgreSQL's partial matching inside nested values. A string must be
+    one or more path comparisons joined with ``&&``, e.g.
+    ``$.height_cm > 100 && $.health == "healthy"``. Keys in
+    SQLITE_ATTRIBUTE_INDEXES are served by expression indexes.
+    
+    Args:
+        attr_filter (dict or str): Containment document or JSON path predicate
+        
+    Returns:
+        tuple: (condition: str, params: list)
+        
+    Raises:
+        Exception: If a JSON path predicate has an unsupported form
+    """
+    conditions = []
+    params = []
+    if isinstance(attr_filter, dict):
+        for key, value in attr_filter.items():
+            if value is None or isinstance(value, bool):
+                conditions.append(f'json_type("{COL_SAMPLE_ATTRIBUTES}", {_json_path((key,))}) = ?')
+                params.append(json_codec.dumps(value))
+            elif isinstance(value, (dict, list)):
+                conditions.append(f'{_attribute_expression((key,))} = json(?)')
+                params.append(json_codec.dumps(value))
+            else:
+                conditions.append(f'{_attribute_expression((key,))} = ?')
+                params.append(value)
+        return " AND ".join(conditions) or f'"{COL_SAMPLE_ATTRIBUTES}" IS NOT NULL', params
+    
+    for predicate in attr_filter.split("&&"):
+        match = JSONPATH_COMPARISON.match(predicate)
+        if match is None:
+            raise Exception(f"Unsupported JSON path filter for SQLite: {predicate.strip()}")
+        path, operator, literal = match.groups()
+        try:
+            value = json_codec.loads(literal)
+        except ValueError:
+            raise Exception(f"Invalid JSON path literal: {literal}")
+        conditions.append(f'{_attribute_expression(path[1:].split("."))} {COMPARISON_OPERATORS[operator]} ?')
+        params.append(value)
+    return " AND ".join(conditions), params
+
+
+def _attribute_expression(keys):
+    """
+    Return the json_extract expression for a key path.
+    
+    Index and query expressions must match textually for SQLite to use an
+    expression index, so both are built here.
+    """
+    return f'json_extract("{COL_SAMPLE_ATTRIBUTES}", {_json_path(keys)})'
+
+
+def _json_path(keys):
+    """Return a quoted SQL literal of the JSON path for a sequence of keys."""
+    for key in keys:
+        if '"' in key:
+            raise Exception(f"Unsupported attribute key: {key}")
+    path = "$" + "".join(f'."{key}"' for key in keys)
+    return "'" + path.replace("'", "''") + "'"
+
+
+def _insert_error(error):
+    """Map an IntegrityError from an INSERT to the message create.add_sample uses."""
+    if "UNIQUE constraint failed" in str(error):
+        return "Sample ID already exists"
+    return str(error)
+
+
+def _decode(text):
+    """Decode stored attribute JSON, keeping NULL as None."""
+    return json_codec.loads(text) if text is not None else None
+
+
+def _sample_row(row):
+    """Decode the attributes of a (sample_id, researcher_id, location_id, sample_attributes) row."""
+    return row[0], row[1], row[2], _decode(row[3])
@@ -0,0 +1,237 @@
+"""
+Statistics module for Plant Sample CRUD Application.
+
+Computes summary statistics in SQL so that only the aggregates reach the
+client: overall counts, samples per researcher and per location, a rollup
+of the top-level attribute keys (how many samples have each key, how many
+distinct values it takes and, for numbers, their range and mean) and the
+value distribution of one key.
+
+The summaries scan the whole sample table. For large tables they can be
+served from materialized views instead (create_statistics_views), which
+return in milliseconds and are as current as their last refresh
+(refresh_statistics_views, e.g. every STATS_REFRESH_INTERVAL seconds from
+stats_cli.py refresh --every).
+"""
+
+from config import (TABLE_PLANT_SAMPLE, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID,
+                    TABLE_RESEARCHER, COL_RESEARCHER_NAME, TABLE_SAMPLING_LOCATION, COL_LOCATION_ATTRIBUTES,
+                    TABLE_ENVIRONMENTAL_CONDITION, STATS_TOP_N, STATS_VIEW_PREFIX)
+
+TOTAL_COLUMNS = ("samples", "researchers", "locations", "without_researcher", "without_location", "with_conditions")
+
+TOTALS_SQL = f'''
+    SELECT s.samples, (SELECT count(*) FROM "{TABLE_RESEARCHER}") AS researchers,
+           (SELECT count(*) FROM "{TABLE_SAMPLING_LOCATION}") AS locations,
+           s.without_researcher, s.without_location,
+           (SELECT count(*) FROM "{TABLE_ENVIRONMENTAL_CONDITION}") AS with_conditions
+    FROM (
+        SELECT count(*) AS samples,
+               count(*) FILTER (WHERE "{COL_RESEARCHER_ID}" IS NULL) AS without_researcher,
+               count(*) FILTER (WHERE "{COL_LOCATION_ID}" IS NULL) AS without_location
+        FROM "{TABLE_PLANT_SAMPLE}"
+    ) s
+'''
+
+RESEARCHERS_SQL = f'''
+    SELECT g.researcher_id, r."{COL_RESEARCHER_NAME}" AS name, g.samples
+    FROM (
+        SELECT "{COL_RESEARCHER_ID}" AS researcher_id, count(*) AS samples
+        FROM "{TABLE_PLANT_SAMPLE}"
+        WHERE "{COL_RESEARCHER_ID}" IS NOT NULL
+        GROUP BY "{COL_RESEARCHER_ID}"
+    ) g
+    LEFT JOIN "{TABLE_RESEARCHER}" r ON r."{COL_RESEARCHER_ID}" = g.researcher_id
+'''
+
+LOCATIONS_SQL = f'''
+    SELECT g.location_id, l."{COL_LOCATION_ATTRIBUTES}" ->> 'name' AS name, g.samples
+    FROM (
+        SELECT "{COL_LOCATION_ID}" AS location_id, count(*) AS samples
+        FROM "{TABLE_PLANT_SAMPLE}"
+        WHERE "{COL_LOCATION_ID}" IS NOT NULL
+        GROUP BY "{COL_LOCATION_ID}"
+    ) g
+    LEFT JOIN "{TABLE_SAMPLING_LOCATION}" l ON l."{COL_LOCATION_ID}" = g.location_id
+'''
+
+NUMBER = "CASE WHEN jsonb_typeof(a.value) = 'number' THEN (a.value #>> '{}')::numeric END"
+
+ATTRIBUTES_SQL = f'''
+    SELECT a.key, count(*) AS samples, count(DISTINCT a.value) AS distinct_values,
+           min({NUMBER}) AS minimum, avg({NUMBER}) AS mean, max({NUMBER}) AS maximum
+    FROM "{TABLE_PLANT_SAMPLE}" s
+    CROSS JOIN LATERAL jsonb_each(s."{COL_SAMPLE_ATTRIBUTES}") a
+    WHERE jsonb_typeof(s."{COL_SAMPLE_ATTRIBUTES}") = 'object'
+    GROUP BY a.key
+'''
+
+DISTRIBUTION_SQL = f'''
+    SELECT "{COL_SAMPLE_ATTRIBUTES}" -> %s AS value, count(*) AS samples
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ATTRIBUTES}" ? %s
+    GROUP BY 1
+    ORDER BY samples DESC, value
+    LIMIT %s
+'''
+
+# name: (definition, unique key column, ranking for reads)
+STATISTICS_VIEWS = {
+    "researchers": (RESEARCHERS_SQL, "researcher_id", "samples DESC, researcher_id"),
+    "locations": (LOCATIONS_SQL, "location_id", "samples DESC, location_id"),
+    "attributes": (ATTRIBUTES_SQL, "key", "samples DESC, key"),
+    "totals": (f"SELECT 1 AS id, t.*, now() AS refreshed_at FROM ({TOTALS_SQL}) t", "id", None),
+}
+
+
+def sample_statistics(cursor, conn, limit=STATS_TOP_N, materialized=False):
+    """
+    Summarize the samples, grouped and counted by the database.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        limit (int): Rows returned per ranking (researchers, locations, attributes)
+        materialized (bool): Read the statistics views instead of the tables
+        
+    Returns:
+        dict: "totals" maps each of TOTAL_COLUMNS to a count; "researchers"
+        and "locations" list (id, name, samples) by descending sample count;
+        "attributes" lists (key, samples, distinct_values, minimum, mean,
+        maximum), the last three None for keys without numeric values;
+        "refreshed_at" is the views' last refresh time, or None for live figures
+        
+    Raises:
+        Exception: If the statistics cannot be computed, or the views do not exist
+    """
+    try:
+        statistics = {}
+        for name, (definition, _, ranking) in STATISTICS_VIEWS.items():
+            source = f'"{STATS_VIEW_PREFIX}{name}"' if materialized else f"({definition}) v"
+            if ranking is None:
+                cursor.execute(f"SELECT * FROM {source}")
+                row = cursor.fetchone()
+                statistics["totals"] = dict(zip(TOTAL_COLUMNS, row[1:-1]))
+                statistics["refreshed_at"] = row[-1] if materialized else None
+            else:
+                cursor.execute(f"SELECT * FROM {source} ORDER BY {ranking} LIMIT %s", (limit,))
+                statistics[name] = cursor.fetchall()
+        statistics["attributes"] = [(key, samples, distinct, *(None if value is None else float(value)
+                                                               for value in numbers))
+                                    for key, samples, distinct, *numbers in statistics["attributes"]]
+        conn.rollback()
+        return statistics
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to compute statistics:\n{str(e)}")
+
+
+def attribute_distribution(cursor, conn, key, limit=STATS_TOP_N):
+    """
+    Count the samples per value of one top-level attribute key.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        key (str): Attribute key, e.g. "species"
+        limit (int): Maximum number of values to return
+        
+    Returns:
+        list: Tuples of (value, samples) by descending sample count; values
+        are decoded JSON
+        
+    Raises:
+        Exception: If the query fails
+    """
+    try:
+        cursor.execute(DISTRIBUTION_SQL, (key, key, limit))
+        rows = cursor.fetchall()
+        conn.rollback()
+        return rows
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to count values of {key}:\n{str(e)}")
+
+
+def create_statistics_views(cursor, conn):
+    """
+    Create the materialized statistics views if they do not exist.
+    
+    Each view gets a unique index, which REFRESH ... CONCURRENTLY needs.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        
+    Returns:
+        list: Names of the views
+        
+    Raises:
+        Exception: If a view cannot be created
+    """
+    views = []
+    try:
+        for name, (definition, key, _) in STATISTICS_VIEWS.items():
+            view = f"{STATS_VIEW_PREFIX}{name}"
+            cursor.execute(f'CREATE MATERIALIZED VIEW IF NOT EXISTS "{view}" AS {definition}')
+            cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{view}_key" ON "{view}" ({key})')
+            views.append(view)
+        conn.commit()
+        return views
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to create statistics views:\n{str(e)}")
+
+
+def refresh_statistics_views(cursor, conn, concurrently=True):
+    """
+    Recompute the materialized statistics views.
+    
+    Each view is refreshed and committed in turn, totals last, so its
+    refreshed_at marks a completed refresh. A concurrent refresh keeps
+    the views readable while it runs.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        concurrently (bool): Refresh without blocking readers of the views
+        
+    Returns:
+        int: Number of views refreshed
+        
+    Raises:
+        Exception: If the views do not exist or a refresh fails
+    """
+    mode = " CONCURRENTLY" if concurrently else ""
+    try:
+        for name in STATISTICS_VIEWS:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW{mode} "{STATS_VIEW_PREFIX}{name}"')
+            conn.commit()
+        return len(STATISTICS_VIEWS)
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"Failed to refresh statistics views:\n{str(e)}")
+
+
+def statistics_to_dict(statistics):
+    """
+    Convert a sample_statistics result to a JSON document.
+    
+    Args:
+        statistics (dict): Result of DatabaseManager.sample_statistics
+        
+    Returns:
+        dict: The same figures with named fields and an ISO refresh time
+    """
+    refreshed_at = statistics["refreshed_at"]
+    return {
+        "totals": statistics["totals"],
+        "researchers": [{"id": row_id, "name": name, "samples": samples}
+                        for row_id, name, samples in statistics["researchers"]],
+        "locations": [{"id": row_id, "name": name, "samples": samples}
+                      for row_id, name, samples in statistics["locations"]],
+        "attributes": [{"key": key, "samples": samples, "distinct_values": distinct,
+                        "min": minimum, "mean": mean, "max": maximum}
+                       for key, samples, distinct, minimum, mean, maximum in statistics["attributes"]],
+        "refreshed_at": refreshed_at.isoformat() if refreshed_at is not None else None,
+    }
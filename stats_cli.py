@@ -0,0 +1,89 @@
+"""
+Command-line entry point for sample statistics.
+
+Usage:
+    python stats_cli.py summary --limit 10
+    python stats_cli.py values species
+    python stats_cli.py create-views
+    python stats_cli.py refresh --every 300
+"""
+
+import argparse
+import sys
+import time
+from config import STATS_TOP_N, STATS_MATERIALIZED, STATS_REFRESH_INTERVAL
+from database import DatabaseManager
+from stats import statistics_to_dict
+import json_codec
+
+
+def main(argv=None):
+    """
+    Parse arguments and run one statistics command.
+    
+    summary and values print JSON. refresh --every keeps refreshing the
+    materialized views at that interval until interrupted; a failed
+    refresh is reported and retried at the next interval.
+    
+    Returns:
+        int: Process exit code, 1 if the command failed
+    """
+    parser = argparse.ArgumentParser(description="Summarize plant samples in the database.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    summary = commands.add_parser("summary", help="Print counts per researcher, location and attribute key")
+    summary.add_argument("--limit", type=int, default=STATS_TOP_N, help=f"Rows per ranking (default: {STATS_TOP_N})")
+    source = summary.add_mutually_exclusive_group()
+    source.add_argument("--materialized", action="store_true", default=STATS_MATERIALIZED,
+                        help="Read the materialized views")
+    source.add_argument("--live", dest="materialized", action="store_false", help="Compute from the tables")
+    
+    values = commands.add_parser("values", help="Print the most common values of one attribute key")
+    values.add_argument("key")
+    values.add_argument("--limit", type=int, default=STATS_TOP_N, help=f"Values to print (default: {STATS_TOP_N})")
+    
+    commands.add_parser("create-views", help="Create the materialized statistics views")
+    
+    refresh = commands.add_parser("refresh", help="Refresh the materialized statistics views")
+    refresh.add_argument("--every", type=float, nargs="?", const=STATS_REFRESH_INTERVAL, default=None,
+                         help=f"Keep refreshing every SECONDS (default when given: {STATS_REFRESH_INTERVAL})")
+    args = parser.parse_args(argv)
+    
+    try:
+        db_manager = DatabaseManager(pooled=False, cache_size=0)
+        if args.command == "summary":
+            statistics = db_manager.sample_statistics(args.limit, args.materialized)
+            print(json_codec.dumps(statistics_to_dict(statistics)))
+        elif args.command == "values":
+            rows = db_manager.attribute_distribution(args.key, args.limit)
+            print(json_codec.dumps([{"value": value, "samples": samples} for value, samples in rows]))
+        elif args.command == "create-views":
+            print(f"{len(db_manager.create_statistics_views())} statistics views ready")
+        elif args.every is None:
+            db_manager.refresh_statistics_views()
+            print("statistics views refreshed")
+        else:
+            refresh_forever(db_manager, args.every)
+        db_manager.close()
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        print(f"Statistics command failed:\n{str(e)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def refresh_forever(db_manager, interval):
+    """Refresh the statistics views every interval seconds until interrupted."""
+    while True:
+        started = time.monotonic()
+        try:
+            db_manager.refresh_statistics_views()
+            print(f"statistics views refreshed in {time.monotonic() - started:.1f} s", file=sys.stderr)
+        except Exception as e:
+            print(f"Refresh failed:\n{str(e)}", file=sys.stderr)
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Summary panel module for Plant Sample CRUD Application.
+
+Provides SummaryPanel, a dashboard of sample statistics computed by the
+database (see stats.py): overall counts, the researchers and locations
+with the most samples, and a rollup of the attribute keys. Selecting an
+attribute key lists its most common values. Only the aggregates are
+fetched, never the sample rows.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from config import STATS_TOP_N, TABLE_ATTR_DISPLAY_CHARS
+import json_codec
+
+STATS_KEY = "summary-statistics"
+VALUES_KEY = "summary-values"
+
+RANKINGS = {
+    "researchers": ("Researchers", ("Researcher ID", "Name", "Samples")),
+    "locations": ("Locations", ("Location ID", "Name", "Samples")),
+    "attributes": ("Attributes", ("Key", "Samples", "Distinct Values", "Min", "Mean", "Max")),
+}
+VALUE_COLUMNS = ("Value", "Samples")
+
+
+def _cell(value):
+    """Format one statistic for a Treeview cell."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return value
+
+
+class SummaryPanel:
+    """
+    Dashboard of counts and attribute rollups for all samples.
+    
+    Statistics are fetched through the UIExecutor when the panel opens and
+    on refresh(). With STATS_MATERIALIZED they come from the statistics
+    views, and the panel shows when those were last refreshed.
+    """
+    
+    def __init__(self, parent, db_manager, executor, on_error, limit=STATS_TOP_N):
+        """
+        Create the panel's widgets inside the given parent and load the statistics.
+        
+        Args:
+            parent: Tkinter container to pack the panel into
+            db_manager: DatabaseManager instance used to compute the statistics
+            executor: UIExecutor that runs the queries in the background
+            on_error: Called on the main thread with a failed query's exception
+            limit (int): Rows shown per ranking
+        """
+        self.db_manager = db_manager
+        self.executor = executor
+        self.on_error = on_error
+        self.limit = limit
+        self.trees = {}
+        
+        header = ttk.Frame(parent)
+        header.pack(fill=tk.X)
+        self.totals = ttk.Label(header, text="Loading statistics...")
+        self.totals.pack(side=tk.LEFT, padx=5)
+        ttk.Button(header, text="Refresh", command=self.refresh).pack(side=tk.RIGHT, padx=5)
+        self.freshness = ttk.Label(header, text="")
+        self.freshness.pack(side=tk.RIGHT, padx=5)
+        
+        self.notebook = ttk.Notebook(parent)
+        self.notebook.pack(fill=tk.BOTH, expand=True, pady=5)
+        for name, (title, columns) in RANKINGS.items():
+            self.trees[name] = self._add_tab(title, columns)
+        self.values = self._add_tab("Values", VALUE_COLUMNS)
+        self.trees["attributes"].bind("<<TreeviewSelect>>", self._on_attribute_selected)
+        
+        self.refresh()
+    
+    def refresh(self):
+        """Fetch the statistics again."""
+        self.executor.submit(self.db_manager.sample_statistics, self.limit,
+                             on_done=self._show_statistics, on_error=self.on_error, key=STATS_KEY)
+    
+    def close(self):
+        """Drop any statistics still being fetched."""
+        self.executor.cancel(STATS_KEY)
+        self.executor.cancel(VALUES_KEY)
+    
+    def _add_tab(self, title, columns):
+        """Add a notebook tab holding a Treeview with the given columns."""
+        frame = ttk.Frame(self.notebook)
+        scrollbar = ttk.Scrollbar(frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree = ttk.Treeview(frame, columns=columns, show='headings', yscrollcommand=scrollbar.set)
+        scrollbar.config(command=tree.yview)
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=100)
+        tree.pack(fill=tk.BOTH, expand=True)
+        self.notebook.add(frame, text=title)
+        return tree
+    
+    def _show_statistics(self, statistics):
+        """Fill the totals and rankings from a sample_statistics result."""
+        totals = statistics["totals"]
+        self.totals.config(text=f"{totals['samples']} samples, {totals['researchers']} researchers, "
+                                f"{totals['locations']} locations; {totals['without_researcher']} without researcher, "
+                                f"{totals['without_location']} without location, "
+                                f"{totals['with_conditions']} with conditions")
+        refreshed_at = statistics["refreshed_at"]
+        self.freshness.config(text="live" if refreshed_at is None else f"as of {refreshed_at:%Y-%m-%d %H:%M}")
+        
+        for name, tree in self.trees.items():
+            tree.delete(*tree.get_children())
+            for row in statistics[name]:
+                tree.insert('', tk.END, values=[_cell(value) for value in row])
+    
+    def _on_attribute_selected(self, event):
+        """List the most common values of the selected attribute key."""
+        selection = self.trees["attributes"].selection()
+        if not selection:
+            return
+        key = str(self.trees["attributes"].item(selection[0], "values")[0])
+        self.executor.submit(self.db_manager.attribute_distribution, key, self.limit,
+                             on_done=self._show_values, on_error=self.on_error, key=VALUES_KEY)
+    
+    def _show_values(self, rows):
+        """Fill the Values tab from an attribute_distribution result and switch to it."""
+        self.values.delete(*self.values.get_children())
+        for value, samples in rows:
+            self.values.insert('', tk.END, values=(json_codec.display(value, TABLE_ATTR_DISPLAY_CHARS), samples))
+        self.notebook.select(len(self.trees))
@@ -0,0 +1,538 @@
+"""
+Table module for Plant Sample CRUD Application.
+
+Provides SampleTable class that displays plant samples in a virtualized
+Treeview. Only a bounded window of rows is kept in the widget; pages are
+fetched with keyset pagination as the user scrolls towards either edge,
+or taken from the in-memory SampleModel while the table is sorted or
+searched locally.
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from bisect import bisect_left
+from config import PAGE_SIZE, TABLE_MAX_ROWS, TABLE_PREFETCH_THRESHOLD, TABLE_ATTR_DISPLAY_CHARS, TABLE_LOAD_ALL_PAGE_SIZE
+from sample_model import SampleModel
+import json_codec
+
+COLUMNS = ('Sample ID', 'Researcher ID', 'Location ID', 'Sample Attributes')
+PAGE_KEY = "table-page"
+LOAD_ALL_KEY = "table-load-all"
+VIEW_KEY = "table-view"
+SORT_MARKERS = {False: " \u25b2", True: " \u25bc"}
+
+
+class SampleTable:
+    """
+    Virtualized sample table backed by paged database reads.
+    
+    Keeps at most TABLE_MAX_ROWS rows in the Treeview. Scrolling near the
+    bottom fetches the next page and drops rows from the top; scrolling
+    near the top fetches the previous page and drops rows from the bottom.
+    Memory use and refresh time therefore stay flat as the table grows.
+    
+    Pages are fetched through the UIExecutor under a single key, so a
+    reload supersedes any page load still in flight.
+    
+    Single-row changes are applied in place through an index from Sample ID
+    to Treeview item ID, without re-reading the window.
+    
+    The attributes column shows a preview cut to TABLE_ATTR_DISPLAY_CHARS;
+    the rows themselves are kept, and the full attribute JSON is serialized
+    only when asked for with attributes_json().
+    
+    The rows in the window are also kept in a SampleModel, which drops
+    them as they are trimmed, so it stays as small as the window while
+    paging. load_all() replaces it with every sample. Clicking a column
+    heading or searching switches the table to local mode: the window then
+    pages through the model's sorted and searched view instead of the
+    database, without any query. reload() and set_filter() drop the model
+    and return to database paging.
+    
+    Views are computed on a worker thread, since a first search of a
+    large model builds its indexes. Until the view is ready, changes to
+    the rows are held and then applied to the model, so the worker never
+    sees the model change under it.
+    """
+    
+    def __init__(self, parent, db_manager, executor, on_error):
+        """
+        Create the Treeview and scrollbar inside the given parent frame.
+        
+        Args:
+            parent: Tkinter container to pack the table into
+            db_manager: DatabaseManager instance used to fetch pages
+            executor: UIExecutor that runs page fetches in the background
+            on_error: Called on the main thread with a failed fetch's exception
+        """
+        self.db_manager = db_manager
+        self.executor = executor
+        self.on_error = on_error
+        self.attr_filter = None
+        self._keys = []
+        self._items = {}
+        self._rows = {}
+        self._has_before = False
+        self._has_after = False
+        self._loading = False
+        self.model = SampleModel()
+        self.sort_column = None
+        self.descending = False
+        self.search_text = ""
+        self._complete = False
+        self._view = None
+        self._offset = 0
+        self._view_stale = False
+        self._view_lock = threading.Lock()
+        self._deferred = None
+        self._changes_while_loading = None
+        
+        self.scrollbar = ttk.Scrollbar(parent)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.tree = ttk.Treeview(parent, columns=COLUMNS, show='headings',
+                                 yscrollcommand=self._on_yscroll)
+        self.scrollbar.config(command=self.tree.yview)
+        
+        for column in COLUMNS:
+            self.tree.heading(column, text=column, command=lambda column=column: self.sort_by(column))
+        
+        self.tree.column('Sample ID', width=100)
+        self.tree.column('Researcher ID', width=120)
+        self.tree.column('Location ID', width=100)
+        self.tree.column('Sample Attributes', width=300)
+        
+        self.tree.pack(fill=tk.BOTH, expand=True)
+    
+    def reload(self):
+        """Leave local mode, empty the model and show the first page from the database."""
+        self.executor.cancel(LOAD_ALL_KEY)
+        self.executor.cancel(VIEW_KEY)
+        self._changes_while_loading = None
+        self._deferred = None
+        self.model = SampleModel()
+        self.sort_column = None
+        self.descending = False
+        self.search_text = ""
+        self._complete = False
+        self._view = None
+        self._show_sort_marker()
+        self._fetch(False, None, self._show_first_page)
+    
+    @property
+    def local(self):
+        """True while the window shows the model's sorted or searched view."""
+        return self._view is not None
+    
+    def sort_by(self, column):
+        """
+        Sort the loaded rows by a column, reversing the order if already sorted by it.
+        
+        Args:
+            column (str): Column name from COLUMNS
+        """
+        self.descending = column == self.sort_column and not self.descending
+        self.sort_column = column
+        self._show_sort_marker()
+        self._show_view()
+    
+    def search(self, text):
+        """
+        Show only loaded rows whose attributes contain words starting with each
+        word of the text, or whose Sample ID equals one of them.
+        
+        Clearing the search of a table that is not sorted returns to database
+        paging, unless every sample has been loaded.
+        
+        Args:
+            text (str): Search text; empty shows every loaded row
+        """
+        self.search_text = text.strip()
+        if self.search_text or self.sort_column is not None or self._complete:
+            self._show_view()
+        elif self.local or self._deferred is not None:
+            self.executor.cancel(VIEW_KEY)
+            self._view = None
+            self._fetch(False, None, self._show_first_page)
+    
+    def load_all(self):
+        """Read every sample (matching the filter) into the model in the background, then show it locally."""
+        self._changes_while_loading = []
+        self.executor.submit(self._read_all, self.attr_filter, on_done=self._show_model,
+                             on_error=self._on_fetch_error, key=LOAD_ALL_KEY)
+    
+    def _read_all(self, attr_filter):
+        """
+        Build a model of all samples; runs on a worker thread.
+        
+        Without a filter the samples are read in one get_all_samples call,
+        whose attribute JSON goes into the model undecoded. Matches of a
+        filter are read one keyset page at a time.
+        
+        Args:
+            attr_filter: Attribute filter in effect when the load started, or None
+            
+        Returns:
+            SampleModel: Every matching sample, with its sort indexes built
+        """
+        model = SampleModel()
+        if attr_filter is None:
+            model.extend_columns(self.db_manager.get_all_samples())
+            model.build_indexes()
+            return model
+        
+        after_id = None
+        while True:
+            rows = self.db_manager.find_samples(attr_filter, after_id, TABLE_LOAD_ALL_PAGE_SIZE)
+            model.extend(rows)
+            if len(rows) < TABLE_LOAD_ALL_PAGE_SIZE:
+                break
+            after_id = rows[-1][0]
+        model.build_indexes()
+        return model
+    
+    def _show_model(self, model):
+        """
+        Replace the model with a complete one, replaying changes made while it loaded.
+        
+        With an attribute filter only rows the load found are patched, since
+        a changed row may not match the filter.
+        """
+        for row, sample_id in self._changes_while_loading or ():
+            if row is None:
+                model.remove(sample_id)
+            elif self.attr_filter is None or sample_id in model:
+                model.upsert(row)
+        self._changes_while_loading = None
+        self.executor.cancel(VIEW_KEY)
+        self._deferred = None
+        self.model = model
+        self._complete = True
+        self._show_view()
+    
+    def _show_view(self):
+        """Compute the model view for the current sort and search and show its first page."""
+        self._view_stale = False
+        self._compute_view(lambda: self._fetch(False, None, self._show_first_page))
+    
+    def _compute_view(self, on_ready):
+        """
+        Compute the model view for the current sort and search in the background.
+        
+        Supersedes any view still being computed. Page loads are stopped and
+        model changes held until the view is ready.
+        
+        Args:
+            on_ready: Called on the main thread once the new view is in place
+        """
+        self.executor.cancel(PAGE_KEY)
+        self._loading = True
+        if self._deferred is None:
+            self._deferred = []
+        column = COLUMNS.index(self.sort_column) if self.sort_column else 0
+        self.executor.submit(self._build_view, self.model, column, self.descending, self.search_text,
+                             on_done=lambda view: self._view_ready(view, on_ready),
+                             on_error=self._on_view_error, key=VIEW_KEY)
+    
+    def _build_view(self, model, column, descending, search_text):
+        """Return a model view; runs on a worker thread, one view at a time."""
+        with self._view_lock:
+            return model.view(column, descending, search_text)
+    
+    def _view_ready(self, view, on_ready):
+        """Show a computed view, then apply the changes held meanwhile and refresh it again if there were any."""
+        self._view = view
+        on_ready()
+        if self._apply_deferred():
+            self._schedule_refresh()
+    
+    def _on_view_error(self, error):
+        """Apply the changes held for a failed view computation and report it."""
+        self._apply_deferred()
+        self._on_fetch_error(error)
+    
+    def _apply_deferred(self):
+        """Apply the held model changes; return True if there were any."""
+        changes, self._deferred = self._deferred or [], None
+        for rows, removed in changes:
+            self._change_model(rows, removed)
+        return bool(changes)
+    
+    def _change_model(self, rows=(), removed=()):
+        """
+        Add or replace rows in the model and remove Sample IDs from it, or hold
+        the changes while a view of the model is being computed.
+        """
+        if self._deferred is not None:
+            self._deferred.append((list(rows), list(removed)))
+            return
+        self.model.extend(rows)
+        for sample_id in removed:
+            self.model.remove(sample_id)
+    
+    def _refresh_view(self):
+        """Recompute the view after model changes, keeping the window's offset."""
+        if not self._view_stale or not self.local:
+            return
+        self._view_stale = False
+        self._compute_view(self._show_refreshed_view)
+    
+    def _show_refreshed_view(self):
+        """Show a recomputed view at the window's previous offset."""
+        offset = max(0, min(self._offset, len(self._view) - TABLE_MAX_ROWS))
+        first, _ = self.tree.yview()
+        self._show_first_page(self._local_rows(offset, offset + TABLE_MAX_ROWS))
+        self._offset = offset
+        self._has_before = offset > 0
+        self._has_after = offset + len(self._keys) < len(self._view)
+        self.tree.yview_moveto(first)
+    
+    def _schedule_refresh(self):
+        """Recompute the local view once pending events have been handled."""
+        if not self._view_stale:
+            self._view_stale = True
+            self.tree.after_idle(self._refresh_view)
+    
+    def _local_rows(self, start, stop):
+        """Return the model rows at view offsets start to stop."""
+        return [self.model.row(position) for position in self._view[max(start, 0):stop]]
+    
+    def _show_sort_marker(self):
+        """Mark the sorted column's heading with the sort direction."""
+        for column in COLUMNS:
+            marker = SORT_MARKERS[self.descending] if column == self.sort_column else ""
+            self.tree.heading(column, text=column + marker)
+    
+    def set_filter(self, attr_filter):
+        """
+        Show only samples matching an attribute filter and reload.
+        
+        Args:
+            attr_filter (dict or str): Filter passed to DatabaseManager.find_samples,
+                or None to show all samples
+        """
+        self.attr_filter = attr_filter
+        self.reload()
+    
+    def _fetch(self, before, anchor, on_done):
+        """Fetch a page in the background, superseding any pending fetch."""
+        if self.local:
+            self.executor.cancel(PAGE_KEY)
+            if anchor is None:
+                rows = self._local_rows(0, PAGE_SIZE)
+            elif before:
+                rows = self._local_rows(self._offset - PAGE_SIZE, self._offset)
+            else:
+                start = self._offset + len(self._keys)
+                rows = self._local_rows(start, start + PAGE_SIZE)
+            self._loading = True
+            self.tree.after_idle(on_done, rows)
+            return
+        
+        if self.attr_filter is None:
+            method = self.db_manager.get_samples_page_before if before else self.db_manager.get_samples_page
+            args = (anchor, PAGE_SIZE)
+        else:
+            method = self.db_manager.find_samples_before if before else self.db_manager.find_samples
+            args = (self.attr_filter, anchor, PAGE_SIZE)
+        
+        self._loading = True
+        self.executor.submit(method, *args, on_done=on_done,
+                             on_error=self._on_fetch_error, key=PAGE_KEY)
+    
+    def _on_fetch_error(self, error):
+        """Clear the loading state and report a failed fetch."""
+        self._loading = False
+        self.on_error(error)
+    
+    def _show_first_page(self, rows):
+        """Replace the window with the first page."""
+        self.tree.delete(*self.tree.get_children())
+        self._keys = []
+        self._items = {}
+        self._rows = {}
+        self._has_before = False
+        self._has_after = len(rows) == PAGE_SIZE
+        self._offset = 0
+        if not self.local:
+            self.executor.cancel(VIEW_KEY)
+            self._deferred = None
+            self.model = SampleModel(rows)
+        self._append(rows)
+        self.tree.yview_moveto(0)
+        self._loading = False
+    
+    def _on_yscroll(self, first, last):
+        """Update the scrollbar and schedule a page load near either edge."""
+        self.scrollbar.set(first, last)
+        if self._loading or not self._keys:
+            return
+        
+        if float(last) >= 1 - TABLE_PREFETCH_THRESHOLD and self._has_after:
+            self._fetch(False, self._keys[-1], self._show_next_page)
+        elif float(first) <= TABLE_PREFETCH_THRESHOLD and self._has_before:
+            self._fetch(True, self._keys[0], self._show_previous_page)
+    
+    def _show_next_page(self, rows):
+        """Append the page after the window and trim rows from the top."""
+        try:
+            self._has_after = len(rows) == PAGE_SIZE
+            if not self.local:
+                self._change_model(rows)
+            rows = [row for row in rows if row[0] not in self._items]
+            self._append(rows)
+            
+            excess = len(self._keys) - TABLE_MAX_ROWS
+            if excess > 0:
+                self._forget(self._keys[:excess])
+                del self._keys[:excess]
+                self._offset += excess
+                self._has_before = True
+                self.tree.yview_scroll(-excess, 'units')
+        finally:
+            self._loading = False
+    
+    def _show_previous_page(self, rows):
+        """Prepend the page before the window and trim rows from the bottom."""
+        try:
+            self._has_before = len(rows) == PAGE_SIZE
+            if not self.local:
+                self._change_model(rows)
+            rows = [row for row in rows if row[0] not in self._items]
+            for index, row in enumerate(rows):
+                self._items[row[0]] = self.tree.insert('', index, values=self._format_row(row))
+                self._rows[row[0]] = row
+            self._keys[:0] = [row[0] for row in rows]
+            self._offset -= len(rows)
+            self.tree.yview_scroll(len(rows), 'units')
+            
+            excess = len(self._keys) - TABLE_MAX_ROWS
+            if excess > 0:
+                self._forget(self._keys[-excess:])
+                del self._keys[-excess:]
+                self._has_after = True
+        finally:
+            self._loading = False
+    
+    def upsert_row(self, row):
+        """
+        Insert or patch a single row in the window.
+        
+        Rows whose Sample ID falls outside the loaded window are ignored;
+        they will be fetched with their page when scrolled into view. While
+        an attribute filter is active only rows already shown are patched,
+        since a new row may not match the filter. The model follows the
+        window while paging. In local mode it patches the rows it holds, and
+        adds new ones only if it holds every sample; the view is then
+        recomputed once idle.
+        
+        Args:
+            row (tuple): (sample_id, researcher_id, location_id, sample_attributes)
+        """
+        key = row[0]
+        if self._changes_while_loading is not None:
+            self._changes_while_loading.append((row, key))
+        if self.local:
+            if key in self.model or (self._complete and self.attr_filter is None):
+                self._change_model((row,))
+                self._schedule_refresh()
+            return
+        
+        item = self._items.get(key)
+        if item is not None:
+            self.tree.item(item, values=self._format_row(row))
+            self._rows[key] = row
+            self._change_model((row,))
+            return
+        
+        if self.attr_filter is not None:
+            return
+        if self._keys and key < self._keys[0] and self._has_before:
+            return
+        if self._keys and key > self._keys[-1] and self._has_after:
+            return
+        
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._items[key] = self.tree.insert('', index, values=self._format_row(row))
+        self._rows[key] = row
+        self._change_model((row,))
+    
+    def remove_row(self, sample_id):
+        """
+        Remove a single row from the window if it is loaded.
+        
+        Args:
+            sample_id: Sample ID of the row to remove
+        """
+        self._change_model(removed=(sample_id,))
+        if self._changes_while_loading is not None:
+            self._changes_while_loading.append((None, sample_id))
+        if self.local:
+            self._schedule_refresh()
+            return
+        
+        item = self._items.pop(sample_id, None)
+        if item is None:
+            return
+        del self._rows[sample_id]
+        
+        self.tree.delete(item)
+        del self._keys[bisect_left(self._keys, sample_id)]
+    
+    def selected_ids(self):
+        """
+        Return the Sample IDs of the selected rows.
+        
+        Returns:
+            list: Sample IDs as displayed, in selection order
+        """
+        return [self.tree.item(item)['values'][0] for item in self.tree.selection()]
+    
+    def attributes_json(self, sample_id):
+        """
+        Serialize the full attributes of a loaded row.
+        
+        Args:
+            sample_id: Sample ID of a row in the window
+            
+        Returns:
+            str: Attribute JSON, or "" if the row has none or is not loaded
+        """
+        row = self._rows.get(sample_id)
+        if row is None or not row[3]:
+            return ""
+        return json_codec.dumps(row[3])
+    
+    def _append(self, rows):
+        """Append rows to the bottom of the window."""
+        for row in rows:
+            self._items[row[0]] = self.tree.insert('', tk.END, values=self._format_row(row))
+            self._rows[row[0]] = row
+        self._keys.extend(row[0] for row in rows)
+    
+    def _forget(self, keys):
+        """Delete the Treeview items for the given Sample IDs, and their model rows while paging."""
+        self.tree.delete(*[self._items.pop(key) for key in keys])
+        for key in keys:
+            del self._rows[key]
+        if not self.local:
+            self._change_model(removed=keys)
+    
+    @staticmethod
+    def _format_row(row):
+        """
+        Convert a database row into Treeview display values.
+        
+        Args:
+            row (tuple): (sample_id, researcher_id, location_id, sample_attributes)
+            
+        Returns:
+            list: Display values with the attributes as a JSON preview of at
+            most TABLE_ATTR_DISPLAY_CHARS characters
+        """
+        display_row = list(row)
+        if display_row[3]:
+            display_row[3] = json_codec.display(display_row[3], TABLE_ATTR_DISPLAY_CHARS)
+        return display_row
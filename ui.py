@@ -1,283 +1,494 @@
-"""
-User interface module for Plant Sample CRUD Application.
-
-Provides PlantSampleUI class that creates and manages the Tkinter GUI
-for the plant sample database management system.
-"""
-
-import tkinter as tk
-from tkinter import ttk, messagebox
-import json
-from config import APP_TITLE, APP_WIDTH, APP_HEIGHT, FONT_TITLE, PADDING
-
-
-class PlantSampleUI:
-    """
-    Manages the user interface for the Plant Sample CRUD application.
-    
-    Provides GUI components for:
-    - Adding new plant samples
-    - Querying existing samples by ID
-    - Updating sample information
-    - Deleting samples
-    - Displaying all samples in a table
-    """
-    
-    def __init__(self, root, db_manager):
-        """
-        Initialize the UI with main window and database manager.
-        
-        Args:
-            root: Tkinter root window
-            db_manager: DatabaseManager instance for database operations
-        """
-        self.root = root
-        self.db_manager = db_manager
-        self.root.title(APP_TITLE)
-        self.root.geometry(f"{APP_WIDTH}x{APP_HEIGHT}")
-        
-        self.query_id = None
-        self.sample_id = None
-        self.researcher_id = None
-        self.location_id = None
-        self.sample_attr = None
-        self.tree = None
-        
-        self.create_widgets()
-        self.refresh_table()
-    
-    def create_widgets(self):
-        """Initialize and layout all UI widgets."""
-        main_frame = ttk.Frame(self.root, padding=PADDING)
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        
-        title = ttk.Label(main_frame, text=APP_TITLE, font=FONT_TITLE)
-        title.grid(row=0, column=0, columnspan=4, pady=10)
-        
-        self._create_query_section(main_frame)
-        self._create_form_section(main_frame)
-        self._create_buttons(main_frame)
-        self._create_table_section(main_frame)
-        
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(4, weight=1)
-    
-    def _create_query_section(self, parent):
-        """Create the query sample section."""
-        query_frame = ttk.LabelFrame(parent, text="Query Sample", padding=PADDING)
-        query_frame.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
-        
-        ttk.Label(query_frame, text="Sample ID:").grid(row=0, column=0, padx=5)
-        self.query_id = ttk.Entry(query_frame, width=20)
-        self.query_id.grid(row=0, column=1, padx=5)
-        ttk.Button(query_frame, text="Query", command=self.query_sample).grid(row=0, column=2, padx=5)
-    
-    def _create_form_section(self, parent):
-        """Create the add/update form section."""
-        form_frame = ttk.LabelFrame(parent, text="Add/Update Sample", padding=PADDING)
-        form_frame.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
-        
-        ttk.Label(form_frame, text="Sample ID:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
-        self.sample_id = ttk.Entry(form_frame, width=30)
-        self.sample_id.grid(row=0, column=1, padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Researcher ID:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
-        self.researcher_id = ttk.Entry(form_frame, width=30)
-        self.researcher_id.grid(row=1, column=1, padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Location ID:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
-        self.location_id = ttk.Entry(form_frame, width=30)
-        self.location_id.grid(row=0, column=3, padx=5, pady=5)
-        
-        ttk.Label(form_frame, text="Sample Attributes (JSON):").grid(row=1, column=2, sticky=tk.W, padx=5, pady=5)
-        self.sample_attr = ttk.Entry(form_frame, width=30)
-        self.sample_attr.grid(row=1, column=3, padx=5, pady=5)
-    
-    def _create_buttons(self, parent):
-        """Create action buttons (Add, Update, Delete, Clear)."""
-        button_frame = ttk.Frame(parent)
-        button_frame.grid(row=3, column=0, columnspan=4, pady=10)
-        
-        ttk.Button(button_frame, text="Add", command=self.add_sample).grid(row=0, column=0, padx=5)
-        ttk.Button(button_frame, text="Update", command=self.update_sample).grid(row=0, column=1, padx=5)
-        ttk.Button(button_frame, text="Delete", command=self.delete_sample).grid(row=0, column=2, padx=5)
-        ttk.Button(button_frame, text="Clear", command=self.clear_form).grid(row=0, column=3, padx=5)
-    
-    def _create_table_section(self, parent):
-        """Create the table display section for all samples."""
-        table_frame = ttk.Frame(parent)
-        table_frame.grid(row=4, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
-        
-        scrollbar = ttk.Scrollbar(table_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.tree = ttk.Treeview(table_frame, 
-                                 columns=('Sample ID', 'Researcher ID', 'Location ID', 'Sample Attributes'),
-                                 show='headings', yscrollcommand=scrollbar.set)
-        scrollbar.config(command=self.tree.yview)
-        
-        self.tree.heading('Sample ID', text='Sample ID')
-        self.tree.heading('Researcher ID', text='Researcher ID')
-        self.tree.heading('Location ID', text='Location ID')
-        self.tree.heading('Sample Attributes', text='Sample Attributes')
-        
-        self.tree.column('Sample ID', width=100)
-        self.tree.column('Researcher ID', width=120)
-        self.tree.column('Location ID', width=100)
-        self.tree.column('Sample Attributes', width=300)
-        
-        self.tree.pack(fill=tk.BOTH, expand=True)
-        self.tree.bind('<ButtonRelease-1>', self.on_select)
-    
-    def add_sample(self):
-        """Handle add sample button click - insert new sample into database."""
-        sample_id = self.sample_id.get()
-        researcher_id = self.researcher_id.get() or None
-        location_id = self.location_id.get() or None
-        sample_attr = self.sample_attr.get() or "{}"
-        
-        if not sample_id:
-            messagebox.showerror("Error", "Sample ID is required")
-            return
-        
-        if not self._validate_json(sample_attr):
-            return
-        
-        success, message = self.db_manager.add_sample(sample_id, researcher_id, location_id, sample_attr)
-        
-        if success:
-            messagebox.showinfo("Success", message)
-            self.clear_form()
-            self.refresh_table()
-        else:
-            messagebox.showerror("Error", message)
-    
-    def update_sample(self):
-        """Handle update sample button click - modify existing sample."""
-        sample_id = self.sample_id.get()
-        researcher_id = self.researcher_id.get() or None
-        location_id = self.location_id.get() or None
-        sample_attr = self.sample_attr.get() or "{}"
-        
-        if not sample_id:
-            messagebox.showerror("Error", "Sample ID is required")
-            return
-        
-        if not self._validate_json(sample_attr):
-            return
-        
-        success, message = self.db_manager.update_sample(sample_id, researcher_id, location_id, sample_attr)
-        
-        if success:
-            messagebox.showinfo("Success", message)
-            self.clear_form()
-            self.refresh_table()
-        else:
-            messagebox.showerror("Error", message)
-    
-    def delete_sample(self):
-        """Handle delete sample button click - remove sample from database."""
-        sample_id = self.sample_id.get()
-        
-        if not sample_id:
-            messagebox.showerror("Error", "Sample ID is required")
-            return
-        
-        if messagebox.askyesno("Confirm", "Are you sure you want to delete this sample?"):
-            success, message = self.db_manager.delete_sample(sample_id)
-            
-            if success:
-                messagebox.showinfo("Success", message)
-                self.clear_form()
-                self.refresh_table()
-            else:
-                messagebox.showerror("Error", message)
-    
-    def query_sample(self):
-        """Query a specific sample and display results in JSON format."""
-        sample_id = self.query_id.get()
-        
-        if not sample_id:
-            messagebox.showerror("Error", "Sample ID is required")
-            return
-        
-        try:
-            result = self.db_manager.query_sample(sample_id)
-            
-            if result:
-                result_dict = {
-                    "Sample ID": result[0],
-                    "Sample Attributes": result[1] if result[1] else {},
-                    "Researcher ID": result[2],
-                    "Location ID": result[3]
-                }
-                json_result = json.dumps(result_dict, indent=2)
-                messagebox.showinfo("Query Result", json_result)
-            else:
-                messagebox.showinfo("Query Result", "Sample not found")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-    
-    def refresh_table(self):
-        """Refresh the table display with all samples from the database."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        try:
-            rows = self.db_manager.get_all_samples()
-            
-            for row in rows:
-                display_row = list(row)
-                if display_row[3]:
-                    display_row[3] = json.dumps(display_row[3])
-                self.tree.insert('', tk.END, values=display_row)
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-    
-    def on_select(self, event):
-        """Handle table row selection - populate form fields with selected row data."""
-        selected = self.tree.selection()
-        if selected:
-            values = self.tree.item(selected[0])['values']
-            self.sample_id.delete(0, tk.END)
-            self.sample_id.insert(0, values[0])
-            
-            self.researcher_id.delete(0, tk.END)
-            if values[1]:
-                self.researcher_id.insert(0, values[1])
-            
-            self.location_id.delete(0, tk.END)
-            if values[2]:
-                self.location_id.insert(0, values[2])
-            
-            self.sample_attr.delete(0, tk.END)
-            if values[3]:
-                self.sample_attr.insert(0, values[3])
-    
-    def clear_form(self):
-        """Clear all form input fields."""
-        self.sample_id.delete(0, tk.END)
-        self.researcher_id.delete(0, tk.END)
-        self.location_id.delete(0, tk.END)
-        self.sample_attr.delete(0, tk.END)
-        self.query_id.delete(0, tk.END)
-    
-    @staticmethod
-    def _validate_json(json_string):
-        """
-        Validate if a string is valid JSON format.
-        
-        Args:
-            json_string (str): String to validate
-            
-        Returns:
-            bool: True if valid JSON, False otherwise. Shows error message on invalid JSON.
-        """
-        try:
-            json.loads(json_string)
-            return True
-        except json.JSONDecodeError:
-            messagebox.showerror("Error", "Invalid JSON format for Sample Attributes")
-            return False
+"""
+User interface module for Plant Sample CRUD Application.
+
+Provides PlantSampleUI class that creates and manages the Tkinter GUI
+for the plant sample database management system.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+import json
+import queue
+from config import APP_TITLE, APP_WIDTH, APP_HEIGHT, FONT_TITLE, PADDING, SYNC_POLL_MS, CHANGE_FEED_ENABLED, CHANGE_FEED_POLL_MS, TABLE_SEARCH_DELAY_MS
+from table import SampleTable
+from summary_panel import SummaryPanel
+from executor import UIExecutor
+import json_codec
+
+
+class PlantSampleUI:
+    """
+    Manages the user interface for the Plant Sample CRUD application.
+    
+    Provides GUI components for:
+    - Adding new plant samples
+    - Querying existing samples by ID
+    - Updating sample information
+    - Deleting samples
+    - Displaying all samples in a table
+    - Sorting and searching the loaded samples without database queries
+    - A summary window of statistics computed by the database
+    
+    With CHANGE_FEED_ENABLED on PostgreSQL, writes committed by other
+    clients are applied to the table row by row as they arrive.
+    """
+    
+    def __init__(self, root, db_manager):
+        """
+        Initialize the UI with main window and database manager.
+        
+        Args:
+            root: Tkinter root window
+            db_manager: DatabaseManager instance for database operations
+        """
+        self.root = root
+        self.db_manager = db_manager
+        self.executor = UIExecutor(root, on_busy=self._set_busy)
+        self.root.title(APP_TITLE)
+        self.root.geometry(f"{APP_WIDTH}x{APP_HEIGHT}")
+        
+        self.query_id = None
+        self.attr_filter = None
+        self.search_text = None
+        self.sample_id = None
+        self.researcher_id = None
+        self.location_id = None
+        self.sample_attr = None
+        self.table = None
+        self.tree = None
+        self.progress = None
+        self.sync_status = None
+        self.summary_window = None
+        self.summary = None
+        self.changes = queue.Queue()
+        self._search_after = None
+        
+        self.create_widgets()
+        self.refresh_table()
+        if self.db_manager.write_queue is not None:
+            self.root.after(SYNC_POLL_MS, self._poll_sync)
+        if CHANGE_FEED_ENABLED and self.db_manager.backend == "postgresql":
+            self.root.after_idle(self._start_change_feed)
+    
+    def create_widgets(self):
+        """Initialize and layout all UI widgets."""
+        main_frame = ttk.Frame(self.root, padding=PADDING)
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        title = ttk.Label(main_frame, text=APP_TITLE, font=FONT_TITLE)
+        title.grid(row=0, column=0, columnspan=4, pady=10)
+        
+        self._create_query_section(main_frame)
+        self._create_form_section(main_frame)
+        self._create_buttons(main_frame)
+        self._create_table_section(main_frame)
+        
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(4, weight=1)
+    
+    def _create_query_section(self, parent):
+        """Create the query sample section."""
+        query_frame = ttk.LabelFrame(parent, text="Query Sample", padding=PADDING)
+        query_frame.grid(row=1, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+        
+        ttk.Label(query_frame, text="Sample ID:").grid(row=0, column=0, padx=5)
+        self.query_id = ttk.Entry(query_frame, width=20)
+        self.query_id.grid(row=0, column=1, padx=5)
+        ttk.Button(query_frame, text="Query", command=self.query_sample).grid(row=0, column=2, padx=5)
+        
+        ttk.Label(query_frame, text="Attribute filter:").grid(row=0, column=3, padx=5)
+        self.attr_filter = ttk.Entry(query_frame, width=30)
+        self.attr_filter.grid(row=0, column=4, padx=5)
+        self.attr_filter.bind('<Return>', lambda event: self.filter_samples())
+        ttk.Button(query_frame, text="Filter", command=self.filter_samples).grid(row=0, column=5, padx=5)
+        ttk.Button(query_frame, text="Show All", command=self.clear_filter).grid(row=0, column=6, padx=5)
+        
+        ttk.Label(query_frame, text="Search loaded:").grid(row=1, column=3, padx=5, pady=(5, 0))
+        self.search_text = ttk.Entry(query_frame, width=30)
+        self.search_text.grid(row=1, column=4, padx=5, pady=(5, 0))
+        self.search_text.bind('<KeyRelease>', lambda event: self._schedule_search())
+        ttk.Button(query_frame, text="Load All", command=self.load_all).grid(row=1, column=5, padx=5, pady=(5, 0))
+        ttk.Button(query_frame, text="Summary", command=self.show_summary).grid(row=1, column=6, padx=5, pady=(5, 0))
+    
+    def _create_form_section(self, parent):
+        """Create the add/update form section."""
+        form_frame = ttk.LabelFrame(parent, text="Add/Update Sample", padding=PADDING)
+        form_frame.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=5)
+        
+        ttk.Label(form_frame, text="Sample ID:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=5)
+        self.sample_id = ttk.Entry(form_frame, width=30)
+        self.sample_id.grid(row=0, column=1, padx=5, pady=5)
+        
+        ttk.Label(form_frame, text="Researcher ID:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
+        self.researcher_id = ttk.Entry(form_frame, width=30)
+        self.researcher_id.grid(row=1, column=1, padx=5, pady=5)
+        
+        ttk.Label(form_frame, text="Location ID:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
+        self.location_id = ttk.Entry(form_frame, width=30)
+        self.location_id.grid(row=0, column=3, padx=5, pady=5)
+        
+        ttk.Label(form_frame, text="Sample Attributes (JSON):").grid(row=1, column=2, sticky=tk.W, padx=5, pady=5)
+        self.sample_attr = ttk.Entry(form_frame, width=30)
+        self.sample_attr.grid(row=1, column=3, padx=5, pady=5)
+    
+    def _create_buttons(self, parent):
+        """Create action buttons (Add, Update, Delete, Clear)."""
+        button_frame = ttk.Frame(parent)
+        button_frame.grid(row=3, column=0, columnspan=4, pady=10)
+        
+        ttk.Button(button_frame, text="Add", command=self.add_sample).grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text="Update", command=self.update_sample).grid(row=0, column=1, padx=5)
+        ttk.Button(button_frame, text="Delete", command=self.delete_sample).grid(row=0, column=2, padx=5)
+        ttk.Button(button_frame, text="Clear", command=self.clear_form).grid(row=0, column=3, padx=5)
+        
+        self.progress = ttk.Progressbar(button_frame, mode='indeterminate', length=80)
+        self.progress.grid(row=0, column=4, padx=5)
+        
+        self.sync_status = ttk.Label(button_frame, text="")
+        self.sync_status.grid(row=0, column=5, padx=5)
+    
+    def _create_table_section(self, parent):
+        """Create the virtualized table display section for all samples."""
+        table_frame = ttk.Frame(parent)
+        table_frame.grid(row=4, column=0, columnspan=4, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        
+        self.table = SampleTable(table_frame, self.db_manager, self.executor, self._show_error)
+        self.tree = self.table.tree
+        self.tree.bind('<ButtonRelease-1>', self.on_select)
+    
+    def add_sample(self):
+        """Handle add sample button click - insert new sample into database."""
+        sample_id = self.sample_id.get()
+        researcher_id = self.researcher_id.get() or None
+        location_id = self.location_id.get() or None
+        sample_attr = self.sample_attr.get() or "{}"
+        
+        if not sample_id:
+            messagebox.showerror("Error", "Sample ID is required")
+            return
+        
+        if not self._validate_json(sample_attr):
+            return
+        
+        self.executor.submit(self.db_manager.add_sample, sample_id, researcher_id, location_id, sample_attr,
+                             on_done=self._on_row_written, on_error=self._show_error)
+    
+    def update_sample(self):
+        """Handle update sample button click - modify existing sample(s)."""
+        if len(self.table.selected_ids()) > 1:
+            self._update_selected()
+            return
+        
+        sample_id = self.sample_id.get()
+        researcher_id = self.researcher_id.get() or None
+        location_id = self.location_id.get() or None
+        sample_attr = self.sample_attr.get() or "{}"
+        
+        if not sample_id:
+            messagebox.showerror("Error", "Sample ID is required")
+            return
+        
+        if not self._validate_json(sample_attr):
+            return
+        
+        self.executor.submit(self.db_manager.update_sample, sample_id, researcher_id, location_id, sample_attr,
+                             on_done=self._on_row_written, on_error=self._show_error)
+    
+    def delete_sample(self):
+        """Handle delete sample button click - remove sample(s) from database."""
+        if len(self.table.selected_ids()) > 1:
+            self._delete_selected()
+            return
+        
+        sample_id = self.sample_id.get()
+        
+        if not sample_id:
+            messagebox.showerror("Error", "Sample ID is required")
+            return
+        
+        if messagebox.askyesno("Confirm", "Are you sure you want to delete this sample?"):
+            self.executor.submit(self.db_manager.delete_sample, sample_id,
+                                 on_done=self._on_row_deleted, on_error=self._show_error)
+    
+    def _on_row_written(self, result):
+        """Apply an add or update result to the table."""
+        success, message, row = result
+        
+        if success:
+            messagebox.showinfo("Success", message)
+            self.clear_form()
+            self.table.upsert_row(row)
+        else:
+            messagebox.showerror("Error", message)
+    
+    def _on_row_deleted(self, result):
+        """Apply a delete result to the table."""
+        success, message, row = result
+        
+        if success:
+            messagebox.showinfo("Success", message)
+            self.clear_form()
+            self.table.remove_row(row[0])
+        else:
+            messagebox.showerror("Error", message)
+    
+    def _update_selected(self):
+        """Apply the form's researcher, location and attributes to every selected row."""
+        sample_ids = self.table.selected_ids()
+        researcher_id = self.researcher_id.get() or None
+        location_id = self.location_id.get() or None
+        sample_attr = self.sample_attr.get() or "{}"
+        
+        if not self._validate_json(sample_attr):
+            return
+        
+        if messagebox.askyesno("Confirm", f"Apply the form values to {len(sample_ids)} selected samples?"):
+            batch = [(sample_id, researcher_id, location_id, sample_attr) for sample_id in sample_ids]
+            self.executor.submit(self.db_manager.update_samples, batch,
+                                 on_done=lambda results: self._on_batch_done("updated", sample_ids, results),
+                                 on_error=self._show_error)
+    
+    def _delete_selected(self):
+        """Delete every selected row."""
+        sample_ids = self.table.selected_ids()
+        
+        if messagebox.askyesno("Confirm", f"Are you sure you want to delete {len(sample_ids)} selected samples?"):
+            self.executor.submit(self.db_manager.delete_samples, sample_ids,
+                                 on_done=lambda results: self._on_batch_done("deleted", sample_ids, results),
+                                 on_error=self._show_error)
+    
+    def _on_batch_done(self, action, sample_ids, results):
+        """
+        Apply batch outcomes to the table and summarize them in a message box.
+        
+        Args:
+            action (str): Past-tense verb for the summary, e.g. "deleted"
+            sample_ids (list): Sample IDs in the same order as results
+            results (list): (success, message, row) tuples
+        """
+        for success, message, row in results:
+            if success:
+                if action == "deleted":
+                    self.table.remove_row(row[0])
+                else:
+                    self.table.upsert_row(row)
+        
+        failures = [f"{sample_id}: {message}" for sample_id, (success, message, _) in zip(sample_ids, results)
+                    if not success]
+        summary = f"{len(results) - len(failures)} samples {action}"
+        
+        if failures:
+            messagebox.showerror("Error", summary + f", {len(failures)} failed:\n" + "\n".join(failures[:10]))
+        else:
+            self.clear_form()
+            messagebox.showinfo("Success", summary)
+    
+    def query_sample(self):
+        """Query a specific sample and display results in JSON format."""
+        sample_id = self.query_id.get()
+        
+        if not sample_id:
+            messagebox.showerror("Error", "Sample ID is required")
+            return
+        
+        self.executor.submit(self.db_manager.query_sample_detail, sample_id,
+                             on_done=self._show_query_result, on_error=self._show_error, key="query")
+    
+    def _show_query_result(self, result):
+        """Display a sample detail document in JSON format."""
+        if result:
+            json_result = json.dumps(result, indent=2)
+            messagebox.showinfo("Query Result", json_result)
+        else:
+            messagebox.showinfo("Query Result", "Sample not found")
+    
+    def filter_samples(self):
+        """
+        Filter the table by sample attributes.
+        
+        A JSON object is matched by containment, e.g. {"species": "Quercus robur"};
+        any other text is used as a JSON path predicate, e.g. $.height_cm > 100.
+        """
+        text = self.attr_filter.get().strip()
+        
+        if not text:
+            self.clear_filter()
+            return
+        
+        try:
+            attr_filter = json_codec.loads(text)
+        except ValueError:
+            attr_filter = text
+        if not isinstance(attr_filter, dict):
+            attr_filter = text
+        
+        self.search_text.delete(0, tk.END)
+        self.table.set_filter(attr_filter)
+    
+    def clear_filter(self):
+        """Remove the attribute filter and show all samples."""
+        self.attr_filter.delete(0, tk.END)
+        self.search_text.delete(0, tk.END)
+        self.table.set_filter(None)
+    
+    def refresh_table(self):
+        """Reload the table display starting from the first page of samples."""
+        self.search_text.delete(0, tk.END)
+        self.table.reload()
+    
+    def load_all(self):
+        """Load every sample matching the filter, so sorting and search cover them all."""
+        self.table.load_all()
+    
+    def _schedule_search(self):
+        """Search the loaded rows once typing has paused for TABLE_SEARCH_DELAY_MS."""
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(TABLE_SEARCH_DELAY_MS, self._search)
+    
+    def _search(self):
+        """Search the loaded rows for the search box text if it changed."""
+        self._search_after = None
+        text = self.search_text.get()
+        if text.strip() != self.table.search_text:
+            self.table.search(text)
+    
+    def show_summary(self):
+        """Open the statistics summary window, or refresh it if already open."""
+        if self.summary_window is not None:
+            self.summary_window.lift()
+            self.summary.refresh()
+            return
+        
+        self.summary_window = tk.Toplevel(self.root)
+        self.summary_window.title(f"{APP_TITLE} - Summary")
+        self.summary_window.geometry(f"{APP_WIDTH * 3 // 4}x{APP_HEIGHT * 3 // 4}")
+        frame = ttk.Frame(self.summary_window, padding=PADDING)
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.summary = SummaryPanel(frame, self.db_manager, self.executor, self._show_error)
+        self.summary_window.protocol("WM_DELETE_WINDOW", self._close_summary)
+    
+    def _close_summary(self):
+        """Close the summary window."""
+        self.summary.close()
+        self.summary_window.destroy()
+        self.summary_window = None
+        self.summary = None
+    
+    def _set_busy(self, busy):
+        """Show or hide the busy indicator while background work is pending."""
+        if busy:
+            self.progress.start(15)
+            self.root.config(cursor="watch")
+        else:
+            self.progress.stop()
+            self.root.config(cursor="")
+    
+    def _poll_sync(self):
+        """
+        Show the write queue's backlog and report writes rejected during sync.
+        
+        Rejected writes were acknowledged locally, so the table is reloaded
+        to show the rows as the server has them.
+        """
+        write_queue = self.db_manager.write_queue
+        if write_queue is None:
+            return
+        
+        pending = write_queue.pending()
+        if pending:
+            state = "offline" if write_queue.last_error is not None else "syncing"
+            self.sync_status.config(text=f"{pending} writes waiting to sync ({state})")
+        else:
+            self.sync_status.config(text="")
+        
+        conflicts = write_queue.take_conflicts()
+        if conflicts:
+            lines = [f"{write.operation} {write.sample_id}: {write.message}" for write in conflicts]
+            messagebox.showwarning("Sync Conflicts",
+                                   f"{len(conflicts)} queued writes were rejected by the server:\n"
+                                   + "\n".join(lines[:10]))
+            self.refresh_table()
+        
+        self.root.after(SYNC_POLL_MS, self._poll_sync)
+    
+    def _start_change_feed(self):
+        """Listen for other clients' changes once the window has painted."""
+        self.db_manager.listen(self.changes.put)
+        self.root.after(CHANGE_FEED_POLL_MS, self._apply_changes)
+    
+    def _apply_changes(self):
+        """
+        Apply change events queued by the listener thread to the table.
+        
+        A reload event (a bulk statement, or a reconnect that may have
+        missed changes) replaces the per-row events queued with it.
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.changes.get_nowait())
+            except queue.Empty:
+                break
+        
+        if any(event.operation == "reload" for event in events):
+            self.refresh_table()
+        else:
+            for event in events:
+                if event.operation == "delete":
+                    self.table.remove_row(event.sample_id)
+                else:
+                    self.table.upsert_row(event.row)
+        
+        self.root.after(CHANGE_FEED_POLL_MS, self._apply_changes)
+    
+    def _show_error(self, error):
+        """Report an exception raised by a background database call."""
+        messagebox.showerror("Error", str(error))
+    
+    def on_select(self, event):
+        """Handle table row selection - populate form fields with selected row data."""
+        selected = self.tree.selection()
+        if selected:
+            values = self.tree.item(selected[0])['values']
+            self.sample_id.delete(0, tk.END)
+            self.sample_id.insert(0, values[0])
+            
+            self.researcher_id.delete(0, tk.END)
+            if values[1]:
+                self.researcher_id.insert(0, values[1])
+            
+            self.location_id.delete(0, tk.END)
+            if values[2]:
+                self.location_id.insert(0, values[2])
+            
+            self.sample_attr.delete(0, tk.END)
+            self.sample_attr.insert(0, self.table.attributes_json(values[0]))
+    
+    def clear_form(self):
+        """Clear all form input fields."""
+        self.sample_id.delete(0, tk.END)
+        self.researcher_id.delete(0, tk.END)
+        self.location_id.delete(0, tk.END)
+        self.sample_attr.delete(0, tk.END)
+        self.query_id.delete(0, tk.END)
+    
+    @staticmethod
+    def _validate_json(json_string):
+        """
+        Validate if a string is valid JSON format.
+        
+        Args:
+            json_string (str): String to validate
+            
+        Returns:
+            bool: True if valid JSON, False otherwise. Shows error message on invalid JSON.
+        """
+        try:
+            json_codec.loads(json_string)
+            return True
+        except ValueError:
+            messagebox.showerror("Error", "Invalid JSON format for Sample Attributes")
+            return False
@@ -1,42 +1,98 @@
-"""
-Update operation module for Plant Sample CRUD Application.
-
-Handles UPDATE operations for modifying existing plant samples in the database.
-"""
-
-from config import TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID
-
-
-def update_sample(cursor, conn, sample_id, researcher_id, location_id, sample_attr):
-    """
-    Update an existing plant sample in the database.
-    
-    Args:
-        cursor: Database cursor
-        conn: Database connection
-        sample_id (str): Unique identifier for the sample
-        researcher_id (str): ID of the researcher
-        location_id (str): ID of the sampling location
-        sample_attr (str): JSON string containing sample attributes
-        
-    Returns:
-        tuple: (success: bool, message: str)
-        - (True, "Sample updated successfully") on success
-        - (False, "Sample ID not found") if sample doesn't exist
-        - (False, error_message) on other database errors
-    """
-    try:
-        cursor.execute(f'''
-            UPDATE "{TABLE_PLANT_SAMPLE}" 
-            SET "{COL_SAMPLE_ATTRIBUTES}" = %s::json, "{COL_RESEARCHER_ID}" = %s, "{COL_LOCATION_ID}" = %s
-            WHERE "{COL_SAMPLE_ID}" = %s
-        ''', (sample_attr, researcher_id, location_id, sample_id))
-        conn.commit()
-        
-        if cursor.rowcount > 0:
-            return True, "Sample updated successfully"
-        else:
-            return False, "Sample ID not found"
-    except Exception as e:
-        conn.rollback()
-        return False, str(e)
+"""
+Update operation module for Plant Sample CRUD Application.
+
+Handles UPDATE operations for modifying existing plant samples in the database.
+"""
+
+from psycopg2.extras import execute_values
+from config import TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, ID_SQL_TYPE, BATCH_PAGE_SIZE
+from prepared import PreparedStatement
+
+UPDATE_SAMPLE = PreparedStatement("plant_sample_update", f'''
+    UPDATE "{TABLE_PLANT_SAMPLE}"
+    SET "{COL_SAMPLE_ATTRIBUTES}" = %s::jsonb, "{COL_RESEARCHER_ID}" = %s, "{COL_LOCATION_ID}" = %s
+    WHERE "{COL_SAMPLE_ID}" = %s
+    RETURNING "{COL_SAMPLE_ID}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+''')
+
+UPDATE_SAMPLES_SQL = f'''
+    UPDATE "{TABLE_PLANT_SAMPLE}" AS s
+    SET "{COL_SAMPLE_ATTRIBUTES}" = v.sample_attr, "{COL_RESEARCHER_ID}" = v.researcher_id, "{COL_LOCATION_ID}" = v.location_id
+    FROM (VALUES %s) AS v (sample_id, researcher_id, location_id, sample_attr)
+    WHERE s."{COL_SAMPLE_ID}" = v.sample_id
+    RETURNING s."{COL_SAMPLE_ID}", s."{COL_RESEARCHER_ID}", s."{COL_LOCATION_ID}", s."{COL_SAMPLE_ATTRIBUTES}"
+'''
+UPDATE_SAMPLES_TEMPLATE = f'(%s::{ID_SQL_TYPE}, %s::{ID_SQL_TYPE}, %s::{ID_SQL_TYPE}, %s::jsonb)'
+
+
+def update_sample(cursor, conn, sample_id, researcher_id, location_id, sample_attr):
+    """
+    Update an existing plant sample in the database.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        sample_id (str): Unique identifier for the sample
+        researcher_id (str): ID of the researcher
+        location_id (str): ID of the sampling location
+        sample_attr (str): JSON string containing sample attributes
+        
+    Returns:
+        tuple: (success: bool, message: str, row: tuple or None)
+        - (True, "Sample updated successfully", row) on success
+        - (False, "Sample ID not found", None) if sample doesn't exist
+        - (False, error_message, None) on other database errors
+        
+        row is (sample_id, researcher_id, location_id, sample_attributes) after the update.
+    """
+    try:
+        UPDATE_SAMPLE.execute(cursor, conn, (sample_attr, researcher_id, location_id, sample_id))
+        row = cursor.fetchone()
+        conn.commit()
+        
+        if row is not None:
+            return True, "Sample updated successfully", row
+        else:
+            return False, "Sample ID not found", None
+    except Exception as e:
+        conn.rollback()
+        return False, str(e), None
+
+
+def update_samples(cursor, conn, batch):
+    """
+    Update many plant samples in a single transaction.
+    
+    Rows are sent as multi-row UPDATE ... FROM (VALUES ...) statements of
+    up to BATCH_PAGE_SIZE entries each and committed once.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        batch (list): Tuples of (sample_id, researcher_id, location_id, sample_attr)
+        
+    Returns:
+        list: One (success: bool, message: str, row: tuple or None) per batch entry,
+        in input order, with the same meaning as update_sample's result.
+        On a database error nothing is updated and every entry carries the error.
+    """
+    if not batch:
+        return []
+    
+    try:
+        rows = execute_values(cursor, UPDATE_SAMPLES_SQL, batch, template=UPDATE_SAMPLES_TEMPLATE,
+                              page_size=BATCH_PAGE_SIZE, fetch=True)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        return [(False, str(e), None)] * len(batch)
+    
+    updated = {str(row[0]): row for row in rows}
+    results = []
+    for entry in batch:
+        row = updated.get(str(entry[0]))
+        if row is not None:
+            results.append((True, "Sample updated successfully", row))
+        else:
+            results.append((False, "Sample ID not found", None))
+    return results
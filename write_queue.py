@@ -0,0 +1,434 @@
+"""
+Write queue module for Plant Sample CRUD Application.
+
+Provides WriteQueue, a durable local queue of sample writes. With
+WRITE_QUEUE_ENABLED, DatabaseManager acknowledges add, update and delete
+calls once they are stored in the local queue file, and a background
+thread sends them to PostgreSQL in batches, one transaction per batch.
+Writes that conflict on Sample ID are taken off the queue, logged to the
+conflicts table and handed to the UI.
+"""
+
+import sqlite3
+import threading
+import time
+from config import (TABLE_PLANT_SAMPLE, COL_SAMPLE_ID, COL_SAMPLE_ATTRIBUTES, COL_RESEARCHER_ID, COL_LOCATION_ID, ID_SQL_TYPE,
+                    WRITE_QUEUE_PATH, WRITE_QUEUE_BATCH_SIZE, WRITE_QUEUE_FLUSH_INTERVAL, WRITE_QUEUE_RETRY_INTERVAL)
+import json_codec
+
+QUEUE_SCHEMA_SQL = '''
+    CREATE TABLE IF NOT EXISTS pending_writes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        operation TEXT NOT NULL,
+        sample_id TEXT NOT NULL,
+        researcher_id TEXT,
+        location_id TEXT,
+        sample_attr TEXT,
+        queued_at REAL NOT NULL
+    );
+    
+    CREATE TABLE IF NOT EXISTS sync_conflicts (
+        seq INTEGER PRIMARY KEY,
+        operation TEXT NOT NULL,
+        sample_id TEXT NOT NULL,
+        researcher_id TEXT,
+        location_id TEXT,
+        sample_attr TEXT,
+        queued_at REAL NOT NULL,
+        message TEXT NOT NULL,
+        detected_at REAL NOT NULL
+    );
+'''
+
+SYNC_INSERT_SQL = f'''
+    INSERT INTO "{TABLE_PLANT_SAMPLE}" ("{COL_SAMPLE_ID}", "{COL_SAMPLE_ATTRIBUTES}", "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}")
+    VALUES (%s, %s::jsonb, %s, %s)
+    ON CONFLICT ("{COL_SAMPLE_ID}") DO NOTHING
+    RETURNING "{COL_SAMPLE_ID}"
+'''
+
+SYNC_UPDATE_SQL = f'''
+    UPDATE "{TABLE_PLANT_SAMPLE}"
+    SET "{COL_SAMPLE_ATTRIBUTES}" = %s::jsonb, "{COL_RESEARCHER_ID}" = %s, "{COL_LOCATION_ID}" = %s
+    WHERE "{COL_SAMPLE_ID}" = %s
+    RETURNING "{COL_SAMPLE_ID}"
+'''
+
+SYNC_DELETE_SQL = f'''
+    DELETE FROM "{TABLE_PLANT_SAMPLE}" WHERE "{COL_SAMPLE_ID}" = %s
+'''
+
+SYNC_SELECT_SQL = f'''
+    SELECT "{COL_RESEARCHER_ID}", "{COL_LOCATION_ID}", "{COL_SAMPLE_ATTRIBUTES}"
+    FROM "{TABLE_PLANT_SAMPLE}"
+    WHERE "{COL_SAMPLE_ID}" = %s
+'''
+
+
+class QueuedWrite:
+    """One write waiting in the queue, or a conflict taken off it."""
+    
+    __slots__ = ("seq", "operation", "sample_id", "researcher_id", "location_id", "sample_attr", "queued_at", "message")
+    
+    def __init__(self, seq, operation, sample_id, researcher_id, location_id, sample_attr, queued_at, message=None):
+        self.seq = seq
+        self.operation = operation
+        self.sample_id = sample_id
+        self.researcher_id = researcher_id
+        self.location_id = location_id
+        self.sample_attr = sample_attr
+        self.queued_at = queued_at
+        self.message = message
+
+
+def local_row(sample_id, researcher_id, location_id, sample_attr):
+    """
+    Build the row a write will store, checking the values the server would reject.
+    
+    Args:
+        sample_id (str): Unique identifier for the sample
+        researcher_id (str): ID of the researcher, or None
+        location_id (str): ID of the sampling location, or None
+        sample_attr (str): JSON string containing sample attributes, or None
+        
+    Returns:
+        tuple: (row: tuple or None, error: str or None)
+        row is (sample_id, researcher_id, location_id, sample_attributes).
+    """
+    ids = []
+    for name, value in ((COL_SAMPLE_ID, sample_id), (COL_RESEARCHER_ID, researcher_id), (COL_LOCATION_ID, location_id)):
+        if value in (None, ""):
+            ids.append(None)
+        elif ID_SQL_TYPE in ("integer", "bigint", "smallint"):
+            try:
+                ids.append(int(value))
+            except ValueError:
+                return None, f"{name} must be an integer"
+        else:
+            ids.append(value)
+    if ids[0] is None:
+        return None, "Sample ID is required"
+    
+    attributes = None
+    if sample_attr is not None:
+        try:
+            attributes = json_codec.loads(sample_attr)
+        except ValueError:
+            return None, "Invalid JSON format for Sample Attributes"
+    return (ids[0], ids[1], ids[2], attributes), None
+
+
+def apply_writes(cursor, conn, writes):
+    """
+    Apply queued writes to PostgreSQL in one transaction.
+    
+    Writes run in queue order. An add whose Sample ID exists with
+    different values, and an update of a missing Sample ID, are conflicts.
+    A batch whose commit was not recorded locally is replayed, so writes
+    that find the state the batch itself leaves behind count as applied:
+    an add that finds its own values or those of a later write to the same
+    Sample ID in the batch, an update of a row that a later write in the
+    batch deletes, and a delete of a missing row. If a write fails outright
+    (for example an unknown Researcher ID) the batch is retried with a
+    savepoint around each write, so only that write is rejected.
+    
+    Args:
+        cursor: Database cursor
+        conn: Database connection
+        writes (list): QueuedWrite entries in queue order
+        
+    Returns:
+        tuple: (applied: int, conflicts: dict of conflict message per rejected write's seq)
+        
+    Raises:
+        psycopg2.OperationalError: If the server cannot be reached; nothing is applied
+    """
+    import psycopg2
+    
+    try:
+        conflicts = _apply(cursor, writes, savepoints=False)
+        conn.commit()
+        return len(writes) - len(conflicts), conflicts
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        if not conn.closed:
+            conn.rollback()
+        raise
+    except psycopg2.Error:
+        conn.rollback()
+    
+    try:
+        conflicts = _apply(cursor, writes, savepoints=True)
+        conn.commit()
+        return len(writes) - len(conflicts), conflicts
+    except Exception:
+        if not conn.closed:
+            conn.rollback()
+        raise
+
+
+def _apply(cursor, writes, savepoints):
+    """Run each write's statement; see apply_writes."""
+    import psycopg2
+    
+    conflicts = {}
+    for index, write in enumerate(writes):
+        if savepoints:
+            cursor.execute("SAVEPOINT queued_write")
+        try:
+            message = _apply_one(cursor, write, writes[index + 1:])
+        except psycopg2.Error as e:
+            if not savepoints or isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                raise
+            cursor.execute("ROLLBACK TO SAVEPOINT queued_write")
+            message = str(e).strip()
+        if message is not None:
+            conflicts[write.seq] = message
+        if savepoints:
+            cursor.execute("RELEASE SAVEPOINT queued_write")
+    return conflicts
+
+
+def _apply_one(cursor, write, later):
+    """Run one write; return a conflict message, or None if it applied. later holds the rest of the batch."""
+    if write.operation == "delete":
+        cursor.execute(SYNC_DELETE_SQL, (write.sample_id,))
+        return None
+    
+    if write.operation == "update":
+        cursor.execute(SYNC_UPDATE_SQL, (write.sample_attr, write.researcher_id, write.location_id, write.sample_id))
+        if cursor.fetchone() or _batch_outcome(write, later) == "delete":
+            return None
+        return "Sample ID not found"
+    
+    cursor.execute(SYNC_INSERT_SQL, (write.sample_id, write.sample_attr, write.researcher_id, write.location_id))
+    if cursor.fetchone():
+        return None
+    cursor.execute(SYNC_SELECT_SQL, (write.sample_id,))
+    existing = cursor.fetchone()
+    if existing is not None:
+        for expected in (write, _batch_outcome(write, later)):
+            if isinstance(expected, QueuedWrite):
+                row, _ = local_row(expected.sample_id, expected.researcher_id, expected.location_id, expected.sample_attr)
+                if row is not None and tuple(existing) == row[1:]:
+                    return None
+    return "Sample ID already exists"
+
+
+def _batch_outcome(write, later):
+    """
+    Return how the rest of a batch leaves a write's Sample ID.
+    
+    Args:
+        write: QueuedWrite being applied
+        later (list): QueuedWrite entries after it in the batch
+        
+    Returns:
+        The last later add or update of the same Sample ID, "delete" if the
+        last such write is a delete, or None if there is none
+    """
+    outcome = None
+    for other in later:
+        if other.sample_id == write.sample_id:
+            outcome = "delete" if other.operation == "delete" else other
+    return outcome
+
+
+class WriteQueue:
+    """
+    Durable queue of sample writes, flushed to the database in the background.
+    
+    Writes are stored in a local SQLite file with synchronous=FULL, so an
+    acknowledged write survives a crash or power loss and is sent on the
+    next start. A daemon thread flushes up to ``batch_size`` writes per
+    transaction through DatabaseManager._run; while the server cannot be
+    reached, it waits ``retry_interval`` seconds between attempts and the
+    queue keeps growing. A batch whose commit succeeded but was not
+    removed locally is sent again; see apply_writes for how replays are
+    recognized.
+    
+    Conflicts are removed from the queue, stored in sync_conflicts, and
+    collected for take_conflicts(), which the UI polls from its own thread.
+    """
+    
+    def __init__(self, db_manager, path=WRITE_QUEUE_PATH, batch_size=WRITE_QUEUE_BATCH_SIZE,
+                 flush_interval=WRITE_QUEUE_FLUSH_INTERVAL, retry_interval=WRITE_QUEUE_RETRY_INTERVAL):
+        """
+        Open the queue file without starting the sync thread.
+        
+        Args:
+            db_manager: DatabaseManager the writes are flushed through
+            path (str): Queue file path
+            batch_size (int): Maximum writes per remote transaction
+            flush_interval (float): Seconds the sync thread waits for new writes
+            retry_interval (float): Seconds to wait after the server could not be reached
+            
+        Raises:
+            Exception: If the queue file cannot be opened
+        """
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._conflicts = []
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = FULL")
+            self._conn.executescript(QUEUE_SCHEMA_SQL)
+            self._pending = self._conn.execute("SELECT count(*) FROM pending_writes").fetchone()[0]
+        except sqlite3.Error as e:
+            raise Exception(f"Failed to open write queue {path}:\n{str(e)}")
+    
+    def enqueue(self, writes):
+        """
+        Store writes durably and wake the sync thread.
+        
+        Args:
+            writes (list): Tuples of (operation, sample_id, researcher_id, location_id, sample_attr),
+                operation being "add", "update" or "delete"
+        """
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany('''
+                    INSERT INTO pending_writes (operation, sample_id, researcher_id, location_id, sample_attr, queued_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(*write, now) for write in writes])
+            self._pending += len(writes)
+        self._wake.set()
+    
+    def pending(self):
+        """Return the number of writes not yet sent."""
+        return self._pending
+    
+    def take_conflicts(self):
+        """
+        Return and forget the conflicts found since the last call.
+        
+        Returns:
+            list: QueuedWrite entries with message set
+        """
+        with self._lock:
+            conflicts, self._conflicts = self._conflicts, []
+        return conflicts
+    
+    def conflicts(self):
+        """
+        Return every logged conflict, oldest first.
+        
+        Returns:
+            list: QueuedWrite entries with message set
+        """
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT seq, operation, sample_id, researcher_id, location_id, sample_attr, queued_at, message
+                FROM sync_conflicts ORDER BY seq
+            ''').fetchall()
+        return [QueuedWrite(*row) for row in rows]
+    
+    def clear_conflicts(self):
+        """Delete the conflict log."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM sync_conflicts")
+    
+    def flush(self):
+        """
+        Send queued writes until the queue is empty.
+        
+        Returns:
+            int: Number of writes applied
+            
+        Raises:
+            Exception: If the server cannot be reached; unsent writes stay queued
+        """
+        applied = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute('''
+                    SELECT seq, operation, sample_id, researcher_id, location_id, sample_attr, queued_at
+                    FROM pending_writes ORDER BY seq LIMIT ?
+                ''', (self.batch_size,)).fetchall()
+            if not rows:
+                return applied
+            
+            writes = [QueuedWrite(*row) for row in rows]
+            count, conflicts = self.db_manager._run(apply_writes, writes)
+            self._dequeue(writes, conflicts)
+            applied += count
+    
+    def _dequeue(self, writes, conflicts):
+        """Remove a flushed batch from the queue and log its conflicts."""
+        now = time.time()
+        rejected = [write for write in writes if write.seq in conflicts]
+        for write in rejected:
+            write.message = conflicts[write.seq]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM pending_writes WHERE seq <= ?", (writes[-1].seq,))
+                self._conn.executemany('''
+                    INSERT INTO sync_conflicts
+                    (seq, operation, sample_id, researcher_id, location_id, sample_attr, queued_at, message, detected_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(write.seq, write.operation, write.sample_id, write.researcher_id, write.location_id,
+                       write.sample_attr, write.queued_at, write.message, now) for write in rejected])
+            self._pending -= len(writes)
+            self._conflicts.extend(rejected)
+        for write in rejected:
+            self.db_manager._invalidate_cached(write.sample_id)
+    
+    def start(self):
+        """Start the background sync thread."""
+        if self._thread is None:
+            if self._pending:
+                self._wake.set()
+            self._thread = threading.Thread(target=self._sync_loop, name="write-queue-sync", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout=None):
+        """
+        Stop the sync thread after a final flush attempt, and close the queue file.
+        
+        If the final flush outlasts the timeout, the thread is left to finish
+        it and closes the queue file itself.
+        
+        Args:
+            timeout (float): Seconds to wait for the final flush, or None to wait until it ends
+        """
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                # Still flushing: the thread closes the queue file when it ends.
+                return
+            self._thread = None
+        self._close()
+    
+    def _close(self):
+        """Close the queue file unless already closed."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _sync_loop(self):
+        """Flush whenever writes arrive or the flush interval passes; back off while offline."""
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                if not self._stopping.is_set():
+                    self._stopping.wait(self.retry_interval)
+            if self._stopping.is_set():
+                self._close()
+                return